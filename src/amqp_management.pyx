@@ -29,7 +29,8 @@ cdef class cManagementOperation(StructBase):
         pass
 
     def __dealloc__(self):
-        _logger.debug("Deallocating {}".format(self.__class__.__name__))
+        if _trace_enabled:
+            _logger.debug("Deallocating {}".format(self.__class__.__name__))
         self.destroy()
 
     cdef _validate(self):
@@ -38,7 +39,8 @@ cdef class cManagementOperation(StructBase):
 
     cpdef destroy(self):
         if <void*>self._c_value is not NULL:
-            _logger.debug("Destroying {}".format(self.__class__.__name__))
+            if _trace_enabled:
+                _logger.debug("Destroying {}".format(self.__class__.__name__))
             c_amqp_management.amqp_management_destroy(self._c_value)
             self._c_value = <c_amqp_management.AMQP_MANAGEMENT_HANDLE>NULL
 
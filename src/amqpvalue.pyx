@@ -5,6 +5,8 @@
 #--------------------------------------------------------------------------
 
 # Python imports
+import array
+import collections
 from enum import Enum
 import logging
 import uuid
@@ -13,6 +15,9 @@ import uuid
 from libc cimport stdint
 from libc.stdlib cimport malloc, realloc, free
 from libc.string cimport memcpy
+from cpython.bytes cimport PyBytes_FromStringAndSize, PyBytes_AS_STRING
+from cpython.buffer cimport PyObject_GetBuffer, PyBuffer_Release, PyBUF_FORMAT, PyBUF_ANY_CONTIGUOUS
+cimport cpython.array
 
 cimport cython
 cimport c_amqpvalue
@@ -28,6 +33,43 @@ cdef int batch_encode_callback(void* context, const unsigned char* encoded_bytes
     return 0
 
 
+cdef struct _EncodeBuffer:
+    unsigned char* data
+    size_t length
+    size_t capacity
+
+
+cdef int buffer_encode_callback(void* context, const unsigned char* encoded_bytes, size_t length):
+    cdef _EncodeBuffer* buffer = <_EncodeBuffer*>context
+    if buffer.length + length > buffer.capacity:
+        return 1
+    memcpy(buffer.data + buffer.length, encoded_bytes, length)
+    buffer.length += length
+    return 0
+
+
+cdef bytes encode_amqp_value(c_amqpvalue.AMQP_VALUE value):
+    cdef size_t size
+    cdef _EncodeBuffer buffer
+    if c_amqpvalue.amqpvalue_get_encoded_size(value, &size) != 0:
+        raise ValueError("Failed to get encoded size.")
+    encoded = PyBytes_FromStringAndSize(NULL, size)
+    buffer.data = <unsigned char*>PyBytes_AS_STRING(encoded)
+    buffer.length = 0
+    buffer.capacity = size
+    if c_amqpvalue.amqpvalue_encode(value,
+                                    <c_amqpvalue.AMQPVALUE_ENCODER_OUTPUT>buffer_encode_callback,
+                                    <void*>&buffer) != 0 or buffer.length != size:
+        raise ValueError("Failed to encode value.")
+    return encoded
+
+
+cdef decode_amqp_value(c_amqpvalue.AMQP_VALUE value):
+    # Compound values are encoded into a single buffer and decoded
+    # in one pass rather than wrapping each item.
+    return decode_value(encode_amqp_value(value), 0, False)[0]
+
+
 cdef get_amqp_value_type(c_amqpvalue.AMQP_VALUE value):
     type_val = c_amqpvalue.amqpvalue_get_type(value)
     try:
@@ -72,7 +114,8 @@ class AMQPType(Enum):
 
 cdef value_factory(c_amqpvalue.AMQP_VALUE value):
     type_val = get_amqp_value_type(value)
-    _logger.debug("Wrapping value type: {}".format(type_val))
+    if _trace_enabled:
+        _logger.debug("Wrapping value type: {}".format(type_val))
     if type_val == AMQPType.NullValue or type_val == AMQPType.UnknownType:
         new_obj = AMQPValue()
     elif type_val == AMQPType.BoolValue:
@@ -236,6 +279,31 @@ cpdef symbol_value(char* value):
     return new_obj
 
 
+# Symbols are mostly annotation and filter keys drawn from a small set,
+# so the most recently used are shared rather than created for each message.
+DEF _INTERNED_SYMBOLS_MAX = 256
+_interned_symbols = collections.OrderedDict()
+
+
+cpdef interned_symbol_value(bytes value):
+    """Get a shared symbol value. The returned value is cached and
+    must not be modified.
+
+    :param value: The symbol.
+    :type value: bytes
+    :returns: ~uamqp.c_uamqp.SymbolValue
+    """
+    try:
+        new_obj = _interned_symbols[value]
+        _interned_symbols.move_to_end(value)
+    except KeyError:
+        new_obj = symbol_value(value)
+        _interned_symbols[value] = new_obj
+        if len(_interned_symbols) > _INTERNED_SYMBOLS_MAX:
+            _interned_symbols.popitem(last=False)
+    return new_obj
+
+
 cpdef list_value():
     new_obj = ListValue()
     new_obj.create()
@@ -254,12 +322,304 @@ cpdef array_value():
     return new_obj
 
 
+DEF _ARRAY_INT = 0
+DEF _ARRAY_LONG = 1
+DEF _ARRAY_DOUBLE = 2
+DEF _ARRAY_TIMESTAMP = 3
+
+
+cdef int _get_buffer_array_type(const char* item_format, Py_ssize_t itemsize, bint timestamps) except -1:
+    # Only single items in native byte order are supported.
+    if item_format[0] == b'@':
+        item_format += 1
+    if item_format[0] == 0 or item_format[1] != 0:
+        raise TypeError("Unsupported buffer format for an AMQP array: {}".format(item_format))
+    cdef char code = item_format[0]
+    cdef bint signed = code in b'bhilq'
+    if code == b'f' or code == b'd':
+        if timestamps:
+            raise TypeError("Timestamps must be built from a buffer of integers.")
+        return _ARRAY_DOUBLE
+    if not signed and code not in b'BHILQ':
+        raise TypeError("Unsupported buffer format for an AMQP array: {}".format(item_format))
+    if not signed and itemsize == 8:
+        raise TypeError("Unsigned 64 bit integers cannot be stored in an AMQP long array.")
+    if timestamps:
+        return _ARRAY_TIMESTAMP
+    if itemsize < 4 or (signed and itemsize == 4):
+        return _ARRAY_INT
+    return _ARRAY_LONG
+
+
+cdef inline stdint.int64_t _read_buffer_int(const char* item, char code, Py_ssize_t itemsize):
+    if code in b'bhilq':
+        if itemsize == 1:
+            return (<const stdint.int8_t*>item)[0]
+        elif itemsize == 2:
+            return (<const stdint.int16_t*>item)[0]
+        elif itemsize == 4:
+            return (<const stdint.int32_t*>item)[0]
+        return (<const stdint.int64_t*>item)[0]
+    if itemsize == 1:
+        return (<const stdint.uint8_t*>item)[0]
+    elif itemsize == 2:
+        return (<const stdint.uint16_t*>item)[0]
+    return (<const stdint.uint32_t*>item)[0]
+
+
+cpdef array_value_from_buffer(data, bint timestamps=False):
+    """Create an AMQP array from a buffer of numbers, such as an array.array, in
+    a single pass. Integers of up to 32 bits are stored as AMQP ints, larger integers
+    as AMQP longs and floating point numbers as AMQP doubles.
+
+    :param data: The numbers to store in the array.
+    :type data: array.array or any object supporting the buffer protocol.
+    :param timestamps: Whether the integers are timestamps in milliseconds, in which
+     case they are stored as AMQP timestamps.
+    :type timestamps: bool
+    :returns: ~uamqp.c_uamqp.ArrayValue
+    """
+    cdef Py_buffer view
+    cdef Py_ssize_t count
+    cdef Py_ssize_t i
+    cdef const char* item
+    cdef const char* item_format
+    cdef char code
+    cdef int array_type
+    cdef int add_result
+    cdef c_amqpvalue.AMQP_VALUE c_array
+    cdef c_amqpvalue.AMQP_VALUE c_item
+    PyObject_GetBuffer(data, &view, PyBUF_FORMAT | PyBUF_ANY_CONTIGUOUS)
+    try:
+        item_format = view.format
+        if item_format == NULL:
+            item_format = b'B'
+        array_type = _get_buffer_array_type(item_format, view.itemsize, timestamps)
+        code = item_format[1] if item_format[0] == b'@' else item_format[0]
+        count = view.len // view.itemsize
+        c_array = c_amqpvalue.amqpvalue_create_array()
+        if <void*>c_array == NULL:
+            raise MemoryError("Failed to create AMQP array.")
+        try:
+            for i in range(count):
+                item = <const char*>view.buf + i * view.itemsize
+                if array_type == _ARRAY_DOUBLE:
+                    if view.itemsize == 4:
+                        c_item = c_amqpvalue.amqpvalue_create_double((<const float*>item)[0])
+                    else:
+                        c_item = c_amqpvalue.amqpvalue_create_double((<const double*>item)[0])
+                elif array_type == _ARRAY_INT:
+                    c_item = c_amqpvalue.amqpvalue_create_int(<stdint.int32_t>_read_buffer_int(item, code, view.itemsize))
+                elif array_type == _ARRAY_LONG:
+                    c_item = c_amqpvalue.amqpvalue_create_long(_read_buffer_int(item, code, view.itemsize))
+                else:
+                    c_item = c_amqpvalue.amqpvalue_create_timestamp(_read_buffer_int(item, code, view.itemsize))
+                if <void*>c_item == NULL:
+                    raise MemoryError("Failed to create AMQP value.")
+                # The array takes its own reference to the item.
+                add_result = c_amqpvalue.amqpvalue_add_array_item(c_array, c_item)
+                c_amqpvalue.amqpvalue_destroy(c_item)
+                if add_result != 0:
+                    raise ValueError("Failed to add AMQP array item.")
+        except:
+            c_amqpvalue.amqpvalue_destroy(c_array)
+            raise
+    finally:
+        PyBuffer_Release(&view)
+    return value_factory(c_array)
+
+
 cpdef described_value(AMQPValue descriptor, AMQPValue value):
     new_obj = DescribedValue()
     new_obj.create(descriptor, value)
     return new_obj
 
 
+# Exact Python types that can be converted directly to C AMQP values.
+# Subclasses and wrapped types are resolved by _get_value_type.
+DEF _NULL = 0
+DEF _BOOL = 1
+DEF _STR = 2
+DEF _BYTES = 3
+DEF _BYTEARRAY = 4
+DEF _INT = 5
+DEF _FLOAT = 6
+DEF _UUID = 7
+DEF _DICT = 8
+DEF _LIST = 9
+DEF _AMQP_VALUE = 10
+DEF _AMQP_TYPE = 11
+
+_VALUE_TYPES = {
+    type(None): _NULL,
+    bool: _BOOL,
+    str: _STR,
+    bytes: _BYTES,
+    bytearray: _BYTEARRAY,
+    int: _INT,
+    float: _FLOAT,
+    uuid.UUID: _UUID,
+    dict: _DICT,
+    list: _LIST,
+    tuple: _LIST,
+    set: _LIST,
+}
+
+
+cpdef data_factory(value, encoding='UTF-8'):
+    """Convert a Python value to the equivalent C AMQP value. Nested
+    dicts and lists are built in C without wrapping each item.
+
+    :param value: The value to convert.
+    :param encoding: The encoding to use for str values.
+    :type encoding: str
+    :returns: ~uamqp.c_uamqp.AMQPValue
+    """
+    if isinstance(value, AMQPValue):
+        return value
+    c_data = getattr(value, 'c_data', None)
+    if isinstance(c_data, AMQPValue):
+        return c_data
+    return value_factory(_create_value(value, encoding))
+
+
+cdef int _get_value_type(value) except -1:
+    if isinstance(value, AMQPValue):
+        return _AMQP_VALUE
+    elif isinstance(getattr(value, 'c_data', None), AMQPValue):
+        return _AMQP_TYPE
+    elif isinstance(value, bool):
+        return _BOOL
+    elif isinstance(value, str):
+        return _STR
+    elif isinstance(value, bytes):
+        return _BYTES
+    elif isinstance(value, uuid.UUID):
+        return _UUID
+    elif isinstance(value, bytearray):
+        return _BYTEARRAY
+    elif isinstance(value, float):
+        return _FLOAT
+    elif isinstance(value, int):
+        return _INT
+    elif isinstance(value, dict):
+        return _DICT
+    elif isinstance(value, (list, set, tuple)):
+        return _LIST
+    raise TypeError("Unable to convert value of type {} to an AMQP value.".format(type(value)))
+
+
+cdef c_amqpvalue.AMQP_VALUE _create_value(value, encoding) except *:
+    cdef c_amqpvalue.AMQP_VALUE result
+    cdef c_amqpvalue.amqp_binary _binary
+    cdef bytes encoded
+    cdef int value_type = _VALUE_TYPES.get(type(value), -1)
+    if value_type == -1:
+        value_type = _get_value_type(value)
+
+    if value_type == _DICT:
+        return _create_map(value, encoding)
+    elif value_type == _LIST:
+        return _create_list(value, encoding)
+    elif value_type == _NULL:
+        result = c_amqpvalue.amqpvalue_create_null()
+    elif value_type == _BOOL:
+        result = c_amqpvalue.amqpvalue_create_boolean(value)
+    elif value_type == _STR:
+        if len(value) == 1:
+            result = c_amqpvalue.amqpvalue_create_char(ord(value))
+        else:
+            encoded = value.encode(encoding)
+            result = c_amqpvalue.amqpvalue_create_string(encoded)
+    elif value_type == _BYTES:
+        result = c_amqpvalue.amqpvalue_create_string(value)
+    elif value_type == _BYTEARRAY:
+        _binary.length = len(value)
+        _binary.bytes = <char*>value
+        result = c_amqpvalue.amqpvalue_create_binary(_binary)
+    elif value_type == _INT:
+        result = c_amqpvalue.amqpvalue_create_int(value)
+    elif value_type == _FLOAT:
+        result = c_amqpvalue.amqpvalue_create_double(value)
+    elif value_type == _UUID:
+        encoded = value.bytes
+        result = c_amqpvalue.amqpvalue_create_uuid(encoded)
+    elif value_type == _AMQP_VALUE:
+        result = c_amqpvalue.amqpvalue_clone((<AMQPValue>value)._c_value)
+    else:
+        result = c_amqpvalue.amqpvalue_clone((<AMQPValue>value.c_data)._c_value)
+    if <void*>result == NULL:
+        raise MemoryError("Failed to create AMQP value.")
+    return result
+
+
+cdef c_amqpvalue.AMQP_VALUE _create_map(value, encoding) except *:
+    cdef c_amqpvalue.AMQP_VALUE result
+    cdef c_amqpvalue.AMQP_VALUE c_key
+    cdef c_amqpvalue.AMQP_VALUE c_item
+    cdef int set_result
+    cdef int key_type
+    cdef bint has_str_keys = False
+    cdef bint has_bytes_keys = False
+    result = c_amqpvalue.amqpvalue_create_map()
+    if <void*>result == NULL:
+        raise MemoryError("Failed to create AMQP map.")
+    try:
+        for key, item in value.items():
+            c_key = _create_value(key, encoding)
+            try:
+                c_item = _create_value(item, encoding)
+            except:
+                c_amqpvalue.amqpvalue_destroy(c_key)
+                raise
+            # Distinct keys of these exact types convert to distinct AMQP values, so
+            # they can be appended without a lookup. The exception is str and bytes
+            # keys, which both convert to AMQP strings.
+            key_type = _VALUE_TYPES.get(type(key), -1)
+            if key_type == _STR:
+                has_str_keys = True
+            elif key_type == _BYTES:
+                has_bytes_keys = True
+            # The map takes its own reference to the key and item.
+            if _NULL <= key_type <= _UUID and not (has_str_keys and has_bytes_keys):
+                set_result = c_amqpvalue.amqpvalue_append_map_pair(result, c_key, c_item)
+            else:
+                set_result = c_amqpvalue.amqpvalue_set_map_value(result, c_key, c_item)
+            c_amqpvalue.amqpvalue_destroy(c_key)
+            c_amqpvalue.amqpvalue_destroy(c_item)
+            if set_result != 0:
+                raise ValueError("Failed to set AMQP map value.")
+    except:
+        c_amqpvalue.amqpvalue_destroy(result)
+        raise
+    return result
+
+
+cdef c_amqpvalue.AMQP_VALUE _create_list(value, encoding) except *:
+    cdef c_amqpvalue.AMQP_VALUE result
+    cdef c_amqpvalue.AMQP_VALUE c_item
+    cdef stdint.uint32_t index = 0
+    cdef int set_result
+    result = c_amqpvalue.amqpvalue_create_list()
+    if <void*>result == NULL:
+        raise MemoryError("Failed to create AMQP list.")
+    try:
+        if c_amqpvalue.amqpvalue_set_list_item_count(result, len(value)) != 0:
+            raise ValueError("Failed to set AMQP list size.")
+        for item in value:
+            c_item = _create_value(item, encoding)
+            # The list takes its own reference to the item.
+            set_result = c_amqpvalue.amqpvalue_set_list_item(result, index, c_item)
+            c_amqpvalue.amqpvalue_destroy(c_item)
+            if set_result != 0:
+                raise ValueError("Failed to set AMQP list item.")
+            index += 1
+    except:
+        c_amqpvalue.amqpvalue_destroy(result)
+        raise
+    return result
+
+
 cdef class AMQPValue(StructBase):
 
     _type = AMQPType.NullValue
@@ -269,7 +629,7 @@ cdef class AMQPValue(StructBase):
         pass
 
     def __dealloc__(self):
-        if _logger:
+        if _trace_enabled and _logger:
             _logger.debug("Deallocating {}".format(self.__class__.__name__))
         self.destroy()
 
@@ -294,7 +654,7 @@ cdef class AMQPValue(StructBase):
 
     cpdef destroy(self):
         if <void*>self._c_value is not NULL:
-            if _logger:
+            if _trace_enabled and _logger:
                 _logger.debug("Destroying {}".format(self.__class__.__name__))
             c_amqpvalue.amqpvalue_destroy(self._c_value)
             self._c_value = <c_amqpvalue.AMQP_VALUE>NULL
@@ -711,10 +1071,7 @@ cdef class ListValue(AMQPValue):
     @property
     def value(self):
         assert self.type
-        value = []
-        for i in range(self.size):
-            value.append(self[i].value)
-        return value
+        return decode_amqp_value(self._c_value)
 
 
 cdef class DictValue(AMQPValue):
@@ -739,6 +1096,12 @@ cdef class DictValue(AMQPValue):
         if c_amqpvalue.amqpvalue_set_map_value(self._c_value, key._c_value, value._c_value) != 0:
             self._value_error()
 
+    def append(self, AMQPValue key, AMQPValue value):
+        """Add a pair without checking for an existing key.
+        The caller must ensure the key is not already in the map."""
+        if c_amqpvalue.amqpvalue_append_map_pair(self._c_value, key._c_value, value._c_value) != 0:
+            self._value_error()
+
     def get(self, stdint.uint32_t index):
         if index >= self.size:
             raise IndexError("Index is out of range.")
@@ -760,11 +1123,7 @@ cdef class DictValue(AMQPValue):
     @property
     def value(self):
         assert self.type
-        value = {}
-        for i in range(self.size):
-            key, item = self.get(i)
-            value[key.value] = item.value
-        return value
+        return decode_amqp_value(self._c_value)
 
 
 cdef class ArrayValue(AMQPValue):
@@ -803,13 +1162,55 @@ cdef class ArrayValue(AMQPValue):
         if c_amqpvalue.amqpvalue_add_array_item(self._c_value, <c_amqpvalue.AMQP_VALUE>value._c_value) != 0:
             self._value_error()
 
+    def to_array(self):
+        """Get the values of an array of ints, longs, doubles or timestamps
+        as an array.array in a single pass. Timestamps are returned as integer
+        milliseconds. An empty AMQP array is returned as an empty array of longs.
+
+        :returns: array.array
+        """
+        assert self.type
+        cdef stdint.uint32_t count = self.size
+        cdef stdint.uint32_t i
+        cdef c_amqpvalue.AMQP_VALUE c_item
+        cdef c_amqpvalue.AMQP_TYPE_TAG item_type = c_amqpvalue.AMQP_TYPE_LONG
+        cdef cpython.array.array result
+        cdef int get_result
+        if count > 0:
+            c_item = c_amqpvalue.amqpvalue_get_array_item(self._c_value, 0)
+            if <void*>c_item == NULL:
+                self._value_error()
+            item_type = c_amqpvalue.amqpvalue_get_type(c_item)
+            c_amqpvalue.amqpvalue_destroy(c_item)
+        if item_type == c_amqpvalue.AMQP_TYPE_INT:
+            result = cpython.array.clone(array.array('i'), count, False)
+        elif item_type == c_amqpvalue.AMQP_TYPE_DOUBLE:
+            result = cpython.array.clone(array.array('d'), count, False)
+        elif item_type == c_amqpvalue.AMQP_TYPE_LONG or item_type == c_amqpvalue.AMQP_TYPE_TIMESTAMP:
+            result = cpython.array.clone(array.array('q'), count, False)
+        else:
+            raise TypeError("Only arrays of ints, longs, doubles or timestamps can be returned as array.array.")
+        for i in range(count):
+            c_item = c_amqpvalue.amqpvalue_get_array_item(self._c_value, i)
+            if <void*>c_item == NULL:
+                self._value_error()
+            if item_type == c_amqpvalue.AMQP_TYPE_INT:
+                get_result = c_amqpvalue.amqpvalue_get_int(c_item, <stdint.int32_t*>result.data.as_ints + i)
+            elif item_type == c_amqpvalue.AMQP_TYPE_DOUBLE:
+                get_result = c_amqpvalue.amqpvalue_get_double(c_item, result.data.as_doubles + i)
+            elif item_type == c_amqpvalue.AMQP_TYPE_LONG:
+                get_result = c_amqpvalue.amqpvalue_get_long(c_item, <stdint.int64_t*>result.data.as_longlongs + i)
+            else:
+                get_result = c_amqpvalue.amqpvalue_get_timestamp(c_item, <stdint.int64_t*>result.data.as_longlongs + i)
+            c_amqpvalue.amqpvalue_destroy(c_item)
+            if get_result != 0:
+                self._value_error()
+        return result
+
     @property
     def value(self):
         assert self.type
-        value = []
-        for i in range(self.size):
-            value.append(self[i].value)
-        return value
+        return decode_amqp_value(self._c_value)
 
 
 cdef class CompositeValue(AMQPValue):
@@ -897,6 +1298,4 @@ cdef class DescribedValue(AMQPValue):
     @property
     def value(self):
         assert self.type
-        #descriptor = self.description
-        described = self.data
-        return described.value
+        return decode_amqp_value(self._c_value)
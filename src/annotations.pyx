@@ -75,7 +75,8 @@ cdef class cAnnotations(StructBase):
         pass
 
     def __dealloc__(self):
-        _logger.debug("Deallocating {}".format(self.__class__.__name__))
+        if _trace_enabled:
+            _logger.debug("Deallocating {}".format(self.__class__.__name__))
         #self.destroy()
 
     cdef _validate(self):
@@ -84,7 +85,8 @@ cdef class cAnnotations(StructBase):
 
     cpdef destroy(self):
         if <void*>self._c_value is not NULL:
-            _logger.debug("Destroying {}".format(self.__class__.__name__))
+            if _trace_enabled:
+                _logger.debug("Destroying {}".format(self.__class__.__name__))
             c_amqpvalue.amqpvalue_destroy(<c_amqpvalue.AMQP_VALUE>self._c_value)
             self._c_value = <c_amqpvalue.AMQP_VALUE>NULL
 
@@ -27,7 +27,8 @@ cdef class AsyncOperation(StructBase):
 
     cpdef destroy(self):
         if <void*>self._c_value is not NULL:
-            _logger.debug("Destroying {}".format(self.__class__.__name__))
+            if _trace_enabled:
+                _logger.debug("Destroying {}".format(self.__class__.__name__))
             c_async_operation.async_operation_destroy(self._c_value)
             self._c_value = <c_async_operation.ASYNC_OPERATION_HANDLE>NULL
 
@@ -14,6 +14,20 @@ cimport c_utils
 
 _logger = logging.getLogger(__name__)
 
+# Debug logs on hot paths, such as wrapping and deallocating C structs, are
+# only formatted when this flag is set. It is checked in C, so when tracing
+# is off these logs cost nothing, regardless of the logging level.
+cdef bint _trace_enabled = False
+
+
+cpdef set_trace_enabled(bint value):
+    global _trace_enabled
+    _trace_enabled = value
+
+
+cpdef bint get_trace_enabled():
+    return _trace_enabled
+
 
 cdef class StructBase:
     """Base class for wrapped C structs."""
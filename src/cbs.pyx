@@ -73,7 +73,8 @@ cdef class CBSTokenAuth:
 
     cpdef destroy(self):
         if <void*>self._cbs_handle is not NULL:
-            _logger.debug("Destroying {}".format(self.__class__.__name__))
+            if _trace_enabled:
+                _logger.debug("Destroying {}".format(self.__class__.__name__))
             c_cbs.cbs_destroy(self._cbs_handle)
             self._cbs_handle = <c_cbs.CBS_HANDLE>NULL
 
@@ -50,7 +50,8 @@ cdef class Connection(StructBase):
         pass
 
     def __dealloc__(self):
-        _logger.debug("Deallocating {}".format(self.__class__.__name__))
+        if _trace_enabled:
+            _logger.debug("Deallocating {}".format(self.__class__.__name__))
         self.destroy()
 
     def __enter__(self):
@@ -65,7 +66,8 @@ cdef class Connection(StructBase):
 
     cpdef destroy(self):
         if <void*>self._c_value is not NULL:
-            _logger.debug("Destroying {}".format(self.__class__.__name__))
+            if _trace_enabled:
+                _logger.debug("Destroying {}".format(self.__class__.__name__))
             c_connection.connection_destroy(self._c_value)
             self._c_value = <c_connection.CONNECTION_HANDLE>NULL
 
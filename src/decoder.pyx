@@ -0,0 +1,348 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+# Python imports
+import datetime
+import uuid
+
+# C imports
+from libc cimport stdint
+from libc.string cimport memcpy, memcmp
+from cpython.bytes cimport PyBytes_AS_STRING, PyBytes_GET_SIZE
+
+cimport cython
+
+
+_DECODE_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+# Decoded symbols are mostly annotation keys such as b"x-opt-offset", so short
+# symbols are interned in a two-way set associative cache. A miss replaces the
+# least recently used entry of its set.
+DEF _SYMBOL_CACHE_SETS = 256
+DEF _SYMBOL_CACHE_MAX_LENGTH = 64
+# Compound and described values are decoded recursively, so nesting is
+# limited to keep malformed data from exhausting the C stack.
+DEF _MAX_DECODE_DEPTH = 100
+# Every list and map element, and every element of an array of a type with a
+# payload, takes at least one byte, so larger counts are malformed. Arrays of
+# zero width types such as null take no bytes per element, and are limited here.
+DEF _MAX_ZERO_WIDTH_ARRAY_COUNT = 65536
+cdef list _symbol_cache = [None] * (_SYMBOL_CACHE_SETS * 2)
+cdef unsigned char _symbol_cache_lru[_SYMBOL_CACHE_SETS]
+
+
+cdef inline int _decode_check(size_t pos, size_t count, size_t length) except -1:
+    if count > length or pos > length - count:
+        raise ValueError("Encoded AMQP data is truncated.")
+    return 0
+
+
+cdef inline stdint.uint64_t _decode_uint(const unsigned char* data, size_t pos, int width):
+    cdef stdint.uint64_t result = 0
+    cdef int i
+    for i in range(width):
+        result = (result << 8) | data[pos + i]
+    return result
+
+
+cdef bytes _decode_symbol(const unsigned char* data, size_t start, size_t size):
+    cdef stdint.uint32_t hash = 2166136261U
+    cdef size_t i
+    cdef size_t cache_set
+    cdef int way
+    cdef bytes symbol
+    if size > _SYMBOL_CACHE_MAX_LENGTH:
+        return data[start:start + size]
+    for i in range(size):
+        hash = (hash ^ data[start + i]) * 16777619U
+    cache_set = hash % _SYMBOL_CACHE_SETS
+    for way in range(2):
+        symbol = <bytes>_symbol_cache[cache_set * 2 + way]
+        if symbol is not None and <size_t>PyBytes_GET_SIZE(symbol) == size and \
+                memcmp(PyBytes_AS_STRING(symbol), data + start, size) == 0:
+            _symbol_cache_lru[cache_set] = 1 - way
+            return symbol
+    way = _symbol_cache_lru[cache_set]
+    symbol = data[start:start + size]
+    _symbol_cache[cache_set * 2 + way] = symbol
+    _symbol_cache_lru[cache_set] = 1 - way
+    return symbol
+
+
+cdef size_t _decode_size(const unsigned char* data, size_t length, size_t* pos, unsigned char code) except? 0:
+    # Variable width and compound types in the 0xa0, 0xc0 and 0xe0 ranges have a
+    # 1 byte size, and in the 0xb0, 0xd0 and 0xf0 ranges a 4 byte size.
+    cdef int width = 1 if (code >> 4) in (0xa, 0xc, 0xe) else 4
+    _decode_check(pos[0], width, length)
+    result = <size_t>_decode_uint(data, pos[0], width)
+    pos[0] += width
+    return result
+
+
+cdef inline int _count_check(size_t count, size_t available) except -1:
+    if count > available:
+        raise ValueError("Encoded AMQP data has an element count of {} which exceeds its size.".format(count))
+    return 0
+
+
+cdef inline int _depth_check(int depth) except -1:
+    if depth > _MAX_DECODE_DEPTH:
+        raise ValueError("Encoded AMQP data exceeds the maximum nesting depth of {}.".format(_MAX_DECODE_DEPTH))
+    return 0
+
+
+cdef object _decode_payload(
+        unsigned char code, const unsigned char* data, size_t length, size_t* pos, bint native, str encoding,
+        int depth):
+    cdef stdint.uint64_t raw
+    cdef stdint.uint32_t raw32
+    cdef float float_value
+    cdef double double_value
+    cdef size_t size
+    cdef size_t count
+    cdef size_t end
+    cdef size_t start = pos[0]
+    cdef size_t i
+
+    if code == 0x40:
+        return None
+    elif code == 0x41:
+        return True
+    elif code == 0x42:
+        return False
+    elif code == 0x43 or code == 0x44:
+        return 0
+    elif code == 0x45:
+        return []
+
+    elif code == 0x56:
+        _decode_check(start, 1, length)
+        pos[0] += 1
+        return data[start] != 0
+    elif code == 0x50 or code == 0x52 or code == 0x53:
+        _decode_check(start, 1, length)
+        pos[0] += 1
+        return data[start]
+    elif code == 0x51 or code == 0x54 or code == 0x55:
+        _decode_check(start, 1, length)
+        pos[0] += 1
+        return <stdint.int8_t>data[start]
+    elif code == 0x60:
+        _decode_check(start, 2, length)
+        pos[0] += 2
+        return <stdint.uint16_t>_decode_uint(data, start, 2)
+    elif code == 0x61:
+        _decode_check(start, 2, length)
+        pos[0] += 2
+        return <stdint.int16_t>_decode_uint(data, start, 2)
+    elif code == 0x70:
+        _decode_check(start, 4, length)
+        pos[0] += 4
+        return <stdint.uint32_t>_decode_uint(data, start, 4)
+    elif code == 0x71:
+        _decode_check(start, 4, length)
+        pos[0] += 4
+        return <stdint.int32_t>_decode_uint(data, start, 4)
+    elif code == 0x72:
+        _decode_check(start, 4, length)
+        pos[0] += 4
+        raw32 = <stdint.uint32_t>_decode_uint(data, start, 4)
+        memcpy(&float_value, &raw32, 4)
+        return float_value
+    elif code == 0x73:
+        _decode_check(start, 4, length)
+        pos[0] += 4
+        return chr(<stdint.uint32_t>_decode_uint(data, start, 4))
+    elif code == 0x80:
+        _decode_check(start, 8, length)
+        pos[0] += 8
+        return _decode_uint(data, start, 8)
+    elif code == 0x81:
+        _decode_check(start, 8, length)
+        pos[0] += 8
+        return <stdint.int64_t>_decode_uint(data, start, 8)
+    elif code == 0x82:
+        _decode_check(start, 8, length)
+        pos[0] += 8
+        raw = _decode_uint(data, start, 8)
+        memcpy(&double_value, &raw, 8)
+        return double_value
+    elif code == 0x83:
+        _decode_check(start, 8, length)
+        pos[0] += 8
+        if native:
+            return _DECODE_EPOCH + datetime.timedelta(milliseconds=<stdint.int64_t>_decode_uint(data, start, 8))
+        return <stdint.int64_t>_decode_uint(data, start, 8)
+    elif code == 0x98:
+        _decode_check(start, 16, length)
+        pos[0] += 16
+        return uuid.UUID(bytes=data[start:start + 16])
+    elif code == 0x74 or code == 0x84 or code == 0x94:
+        # Decimal values are returned as their raw encoded bytes.
+        size = 4 if code == 0x74 else 8 if code == 0x84 else 16
+        _decode_check(start, size, length)
+        pos[0] += size
+        return data[start:start + size]
+
+    elif code == 0xa0 or code == 0xb0:
+        size = _decode_size(data, length, pos, code)
+        start = pos[0]
+        _decode_check(start, size, length)
+        pos[0] += size
+        return data[start:start + size]
+    elif code == 0xa3 or code == 0xb3:
+        size = _decode_size(data, length, pos, code)
+        start = pos[0]
+        _decode_check(start, size, length)
+        pos[0] += size
+        return _decode_symbol(data, start, size)
+    elif code == 0xa1 or code == 0xb1:
+        size = _decode_size(data, length, pos, code)
+        start = pos[0]
+        _decode_check(start, size, length)
+        pos[0] += size
+        if native:
+            return data[start:start + size].decode(encoding)
+        return data[start:start + size]
+
+    elif code == 0xc0 or code == 0xd0 or code == 0xc1 or code == 0xd1:
+        size = _decode_size(data, length, pos, code)
+        _decode_check(pos[0], size, length)
+        end = pos[0] + size
+        count = _decode_size(data, end, pos, code)
+        _count_check(count, end - pos[0])
+        if code == 0xc0 or code == 0xd0:
+            result = []
+            for i in range(count):
+                result.append(_decode_value(data, end, pos, native, encoding, depth + 1))
+        else:
+            if count % 2:
+                raise ValueError("Encoded AMQP data has a malformed map with an odd element count of {}.".format(count))
+            result = {}
+            for i in range(count // 2):
+                key = _decode_value(data, end, pos, native, encoding, depth + 1)
+                result[key] = _decode_value(data, end, pos, native, encoding, depth + 1)
+        pos[0] = end
+        return result
+
+    elif code == 0xe0 or code == 0xf0:
+        # Arrays of arrays decode their elements here rather than through _decode_value.
+        _depth_check(depth)
+        size = _decode_size(data, length, pos, code)
+        _decode_check(pos[0], size, length)
+        end = pos[0] + size
+        count = _decode_size(data, end, pos, code)
+        if count == 0:
+            # An empty array may omit the element constructor.
+            pos[0] = end
+            return []
+        _decode_check(pos[0], 1, end)
+        code = data[pos[0]]
+        pos[0] += 1
+        if code == 0x00:
+            _skip_value(data, end, pos, depth + 1)
+            _decode_check(pos[0], 1, end)
+            code = data[pos[0]]
+            pos[0] += 1
+        if 0x40 <= code <= 0x45:
+            _count_check(count, _MAX_ZERO_WIDTH_ARRAY_COUNT)
+        else:
+            _count_check(count, end - pos[0])
+        result = []
+        for i in range(count):
+            result.append(_decode_payload(code, data, end, pos, native, encoding, depth + 1))
+        pos[0] = end
+        return result
+
+    raise ValueError("Unrecognized AMQP type constructor: 0x{:02x}".format(code))
+
+
+cdef object _decode_value(
+        const unsigned char* data, size_t length, size_t* pos, bint native, str encoding, int depth):
+    cdef unsigned char code
+    _depth_check(depth)
+    _decode_check(pos[0], 1, length)
+    code = data[pos[0]]
+    pos[0] += 1
+    if code == 0x00:
+        # Described values are returned as the decoded value without the descriptor.
+        _skip_value(data, length, pos, depth + 1)
+        return _decode_value(data, length, pos, native, encoding, depth + 1)
+    return _decode_payload(code, data, length, pos, native, encoding, depth)
+
+
+cdef int _skip_value(const unsigned char* data, size_t length, size_t* pos, int depth) except -1:
+    cdef unsigned char code
+    cdef int category
+    cdef size_t size
+    _depth_check(depth)
+    _decode_check(pos[0], 1, length)
+    code = data[pos[0]]
+    pos[0] += 1
+    if code == 0x00:
+        _skip_value(data, length, pos, depth + 1)
+        return _skip_value(data, length, pos, depth + 1)
+    category = code >> 4
+    if category >= 0xa:
+        size = _decode_size(data, length, pos, code)
+    elif category == 0x4:
+        size = 0
+    elif category == 0x5:
+        size = 1
+    elif category == 0x6:
+        size = 2
+    elif category == 0x7:
+        size = 4
+    elif category == 0x8:
+        size = 8
+    elif category == 0x9:
+        size = 16
+    else:
+        raise ValueError("Unrecognized AMQP type constructor: 0x{:02x}".format(code))
+    _decode_check(pos[0], size, length)
+    pos[0] += size
+    return 0
+
+
+cpdef decode_value(const unsigned char[:] data, size_t offset=0, bint native=True, str encoding='UTF-8'):
+    """Decode a single AMQP encoded value into Python objects in one pass.
+    If `native` is set, strings are decoded to str and timestamps to aware
+    datetimes, otherwise these are returned as bytes and integer milliseconds,
+    matching the `value` of the equivalent ~uamqp.c_uamqp.AMQPValue.
+
+    :param data: The encoded data.
+    :type data: bytes, bytearray or memoryview
+    :param offset: The position in the data at which the value starts.
+    :type offset: int
+    :param native: Whether to decode strings and timestamps to native types.
+    :type native: bool
+    :param encoding: The encoding used to decode strings.
+    :type encoding: str
+    :returns: tuple of the decoded value and the position after the value.
+    """
+    cdef size_t pos = offset
+    cdef size_t length = data.shape[0]
+    if length == 0:
+        raise ValueError("Encoded AMQP data is truncated.")
+    value = _decode_value(&data[0], length, &pos, native, encoding, 0)
+    return value, pos
+
+
+cpdef size_t skip_value(const unsigned char[:] data, size_t offset=0) except? 0:
+    """Find the end of a single AMQP encoded value without decoding it.
+
+    :param data: The encoded data.
+    :type data: bytes, bytearray or memoryview
+    :param offset: The position in the data at which the value starts.
+    :type offset: int
+    :returns: int
+    """
+    cdef size_t pos = offset
+    cdef size_t length = data.shape[0]
+    if length == 0:
+        raise ValueError("Encoded AMQP data is truncated.")
+    _skip_value(&data[0], length, &pos, 0)
+    return pos
@@ -33,7 +33,8 @@ cdef class cLink(StructBase):
         pass
 
     def __dealloc__(self):
-        _logger.debug("Deallocating {}".format(self.__class__.__name__))
+        if _trace_enabled:
+            _logger.debug("Deallocating {}".format(self.__class__.__name__))
         self.destroy()
 
     def __enter__(self):
@@ -48,7 +49,8 @@ cdef class cLink(StructBase):
 
     cpdef destroy(self):
         if <void*>self._c_value is not NULL:
-            _logger.debug("Destroying {}".format(self.__class__.__name__))
+            if _trace_enabled:
+                _logger.debug("Destroying {}".format(self.__class__.__name__))
             c_link.link_destroy(self._c_value)
             self._c_value = <c_link.LINK_HANDLE>NULL
 
@@ -46,7 +46,8 @@ cdef class cMessage(StructBase):
         pass
 
     def __dealloc__(self):
-        _logger.debug("Deallocating {}".format(self.__class__.__name__))
+        if _trace_enabled:
+            _logger.debug("Deallocating {}".format(self.__class__.__name__))
         self.destroy()
 
     cdef _create(self):
@@ -55,7 +56,8 @@ cdef class cMessage(StructBase):
 
     cpdef destroy(self):
         if <void*>self._c_value is not NULL:
-            _logger.debug("Destorying {}".format(self.__class__.__name__))
+            if _trace_enabled:
+                _logger.debug("Destorying {}".format(self.__class__.__name__))
             c_message.message_destroy(self._c_value)
             self._c_value = <c_message.MESSAGE_HANDLE>NULL
 
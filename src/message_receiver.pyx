@@ -9,6 +9,8 @@ import logging
 import functools
 
 # C imports
+from libc cimport stdint
+
 cimport c_message_receiver
 cimport c_message
 
@@ -30,7 +32,8 @@ cdef class cMessageReceiver(StructBase):
         pass
 
     def __dealloc__(self):
-        _logger.debug("Deallocating {}".format(self.__class__.__name__))
+        if _trace_enabled:
+            _logger.debug("Deallocating {}".format(self.__class__.__name__))
         self.destroy()
 
     cdef _validate(self):
@@ -42,8 +45,13 @@ cdef class cMessageReceiver(StructBase):
         self._c_value = c_message_receiver.messagereceiver_create(link, on_message_sender_state_changed, context)
         self._validate()
 
-    cpdef open(self, callback_context):
-        if c_message_receiver.messagereceiver_open(self._c_value, <c_message_receiver.ON_MESSAGE_RECEIVED>on_message_received, <void*>callback_context) != 0:
+    cpdef open(self, callback_context, bint raw_bodies=False):
+        cdef c_message_receiver.ON_MESSAGE_RECEIVED callback
+        if raw_bodies:
+            callback = <c_message_receiver.ON_MESSAGE_RECEIVED>on_raw_message_received
+        else:
+            callback = <c_message_receiver.ON_MESSAGE_RECEIVED>on_message_received
+        if c_message_receiver.messagereceiver_open(self._c_value, callback, <void*>callback_context) != 0:
             self._value_error()
 
     cpdef close(self):
@@ -52,7 +60,8 @@ cdef class cMessageReceiver(StructBase):
 
     cpdef destroy(self):
         if <void*>self._c_value is not NULL:
-            _logger.debug("Destroying {}".format(self.__class__.__name__))
+            if _trace_enabled:
+                _logger.debug("Destroying {}".format(self.__class__.__name__))
             c_message_receiver.messagereceiver_destroy(self._c_value)
             self._c_value = <c_message_receiver.MESSAGE_RECEIVER_HANDLE>NULL
 
@@ -73,38 +82,92 @@ cdef void on_message_receiver_state_changed(void* context, c_message_receiver.ME
         context_obj._state_changed(previous_state, new_state)
 
 
+cdef c_amqpvalue.AMQP_VALUE get_delivery_state_from_error(error):
+    if hasattr(error, 'rejection_description'):
+        _logger.debug("Rejecting message")
+        error_condition = b"amqp:internal-error"
+        return c_message.messaging_delivery_rejected(error_condition, error.rejection_description)
+
+    elif hasattr(error, 'abandoned'):
+        if error.annotations is not None:
+            _logger.debug("abandoning message with annotations")
+            _ann = create_fields(<AMQPValue>error.annotations)
+            return c_message.messaging_delivery_modified(True, True,  <c_amqp_definitions.fields>_ann)
+        _logger.debug("abandoning message")
+        return c_message.messaging_delivery_modified(True, False, <c_amqp_definitions.fields>NULL)
+
+    elif hasattr(error, 'deferred'):
+        if error.annotations is not None:
+            _logger.debug("deferring message with annotations")
+            _ann = create_fields(<AMQPValue>error.annotations)
+            return c_message.messaging_delivery_modified(True, True, <c_amqp_definitions.fields>_ann)
+        _logger.debug("deferring message")
+        return c_message.messaging_delivery_modified(True, True, <c_amqp_definitions.fields>NULL)
+    return <c_amqpvalue.AMQP_VALUE>NULL
+
+
 cdef c_amqpvalue.AMQP_VALUE on_message_received(void* context, c_message.MESSAGE_HANDLE message):
     if context == NULL:
         return c_message.messaging_delivery_accepted()
 
     context_obj = <object>context
     cdef c_message.MESSAGE_HANDLE cloned
+    cdef c_amqpvalue.AMQP_VALUE delivery_state
     cloned = c_message.message_clone(message)
     wrapped_message = message_factory(cloned)
     try:
         context_obj._message_received(wrapped_message)
 
     except Exception as e:
-        if hasattr(e, 'rejection_description'):
-            _logger.debug("Rejecting message")
-            error_condition = b"amqp:internal-error"
-            return c_message.messaging_delivery_rejected(error_condition, e.rejection_description)
-
-        elif hasattr(e, 'abandoned'):
-            if e.annotations is not None:
-                _logger.debug("abandoning message with annotations")
-                _ann = create_fields(<AMQPValue>e.annotations)
-                return c_message.messaging_delivery_modified(True, True,  <c_amqp_definitions.fields>_ann)
-            _logger.debug("abandoning message")
-            return c_message.messaging_delivery_modified(True, False, <c_amqp_definitions.fields>NULL)
-
-        elif hasattr(e, 'deferred'):
-            if e.annotations is not None:
-                _logger.debug("deferring message with annotations")
-                _ann = create_fields(<AMQPValue>e.annotations)
-                return c_message.messaging_delivery_modified(True, True, <c_amqp_definitions.fields>_ann)
-            _logger.debug("deferring message")
-            return c_message.messaging_delivery_modified(True, True, <c_amqp_definitions.fields>NULL)
-        else:
+        delivery_state = get_delivery_state_from_error(e)
+        if <void*>delivery_state == NULL:
+            raise
+        return delivery_state
+    return c_message.messaging_delivery_accepted()
+
+
+cdef c_amqpvalue.AMQP_VALUE on_raw_message_received(void* context, c_message.MESSAGE_HANDLE message):
+    if context == NULL:
+        return c_message.messaging_delivery_accepted()
+
+    cdef c_message.MESSAGE_BODY_TYPE_TAG body_type
+    cdef c_message.BINARY_DATA section
+    cdef size_t section_count
+    cdef size_t index
+    cdef c_amqpvalue.AMQP_VALUE delivery_state
+    cdef stdint.uint32_t message_format
+    if c_message.message_get_body_type(message, &body_type) != 0:
+        return on_message_received(context, message)
+    if c_message.message_get_message_format(message, &message_format) == 0 and \
+            message_format == AMQP_BATCH_MESSAGE_FORMAT:
+        # Batched messages must be unpacked from the full message.
+        return on_message_received(context, message)
+    if body_type == c_message.MESSAGE_BODY_TYPE_NONE:
+        body = b""
+    elif body_type != c_message.MESSAGE_BODY_TYPE_DATA:
+        # Sequence and Value bodies cannot be represented as raw bytes.
+        return on_message_received(context, message)
+    elif c_message.message_get_body_amqp_data_count(message, &section_count) != 0:
+        return on_message_received(context, message)
+    elif section_count == 1:
+        if c_message.message_get_body_amqp_data_in_place(message, 0, &section) != 0:
+            return on_message_received(context, message)
+        body = section.bytes[:section.length]
+    else:
+        sections = []
+        for index in range(section_count):
+            if c_message.message_get_body_amqp_data_in_place(message, index, &section) != 0:
+                return on_message_received(context, message)
+            sections.append(section.bytes[:section.length])
+        body = b"".join(sections)
+
+    context_obj = <object>context
+    try:
+        context_obj._raw_message_received(body)
+
+    except Exception as e:
+        delivery_state = get_delivery_state_from_error(e)
+        if <void*>delivery_state == NULL:
             raise
+        return delivery_state
     return c_message.messaging_delivery_accepted()
@@ -32,7 +32,8 @@ cdef class cMessageSender(StructBase):
         pass
 
     def __dealloc__(self):
-        _logger.debug("Deallocating {}".format(self.__class__.__name__))
+        if _trace_enabled:
+            _logger.debug("Deallocating {}".format(self.__class__.__name__))
         self.destroy()
 
     def __enter__(self):
@@ -56,7 +57,8 @@ cdef class cMessageSender(StructBase):
 
     cpdef destroy(self):
         if <void*>self._c_value is not NULL:
-            _logger.debug("Destroying {}".format(self.__class__.__name__))
+            if _trace_enabled:
+                _logger.debug("Destroying {}".format(self.__class__.__name__))
             c_message_sender.messagesender_destroy(self._c_value)
             self._c_value = <c_message_sender.MESSAGE_SENDER_HANDLE>NULL
 
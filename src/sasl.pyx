@@ -71,7 +71,8 @@ cdef class SASLMechanism(StructBase):
         pass
 
     def __dealloc__(self):
-        _logger.debug("Deallocating {}".format(self.__class__.__name__))
+        if _trace_enabled:
+            _logger.debug("Deallocating {}".format(self.__class__.__name__))
         self.destroy()
 
     cdef _create(self):
@@ -80,7 +81,8 @@ cdef class SASLMechanism(StructBase):
 
     cpdef destroy(self):
         if <void*>self._c_value is not NULL:
-            _logger.debug("Destroying {}".format(self.__class__.__name__))
+            if _trace_enabled:
+                _logger.debug("Destroying {}".format(self.__class__.__name__))
             c_sasl_mechanism.saslmechanism_destroy(self._c_value)
             self._c_value = <c_sasl_mechanism.SASL_MECHANISM_HANDLE>NULL
 
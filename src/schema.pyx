@@ -0,0 +1,316 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+# Python imports
+import datetime
+import uuid
+
+# C imports
+from libc cimport stdint
+
+cimport c_amqpvalue
+
+
+cpdef create_schema(keys, list c_keys, list field_types, bint as_list=False,
+                    AMQPValue descriptor=None, str encoding='UTF-8'):
+    new_schema = cSchema()
+    new_schema.create(keys, c_keys, field_types, as_list, descriptor, encoding)
+    return new_schema
+
+
+cdef class cSchema(StructBase):
+
+    cdef list _keys
+    cdef list _c_keys
+    cdef list _field_types
+    cdef bint _as_list
+    cdef AMQPValue _descriptor
+    cdef str _encoding
+
+    cdef create(self, keys, list c_keys, list field_types, bint as_list,
+                AMQPValue descriptor, str encoding):
+        if not (len(keys) == len(c_keys) == len(field_types)):
+            raise ValueError("Schema keys and field types must be the same length.")
+        self._keys = list(keys)
+        self._c_keys = c_keys
+        self._field_types = [int(t) for t in field_types]
+        self._as_list = as_list
+        self._descriptor = descriptor
+        self._encoding = encoding
+
+    cpdef encode(self, value):
+        cdef c_amqpvalue.AMQP_VALUE result
+        cdef c_amqpvalue.AMQP_VALUE c_described
+        cdef c_amqpvalue.AMQP_VALUE c_descriptor
+        if self._as_list:
+            result = self._create_list(value)
+        else:
+            result = self._create_map(value)
+        if self._descriptor is not None:
+            # The described value takes ownership of both the descriptor and the value.
+            c_descriptor = c_amqpvalue.amqpvalue_clone(self._descriptor._c_value)
+            if <void*>c_descriptor == NULL:
+                c_amqpvalue.amqpvalue_destroy(result)
+                raise MemoryError("Failed to create AMQP descriptor.")
+            c_described = c_amqpvalue.amqpvalue_create_described(c_descriptor, result)
+            if <void*>c_described == NULL:
+                c_amqpvalue.amqpvalue_destroy(c_descriptor)
+                c_amqpvalue.amqpvalue_destroy(result)
+                raise MemoryError("Failed to create AMQP described value.")
+            result = c_described
+        return value_factory(result)
+
+    cdef c_amqpvalue.AMQP_VALUE _create_map(self, value) except *:
+        cdef c_amqpvalue.AMQP_VALUE result
+        cdef c_amqpvalue.AMQP_VALUE c_item
+        cdef int set_result
+        cdef Py_ssize_t i
+        result = c_amqpvalue.amqpvalue_create_map()
+        if <void*>result == NULL:
+            raise MemoryError("Failed to create AMQP map.")
+        try:
+            for i in range(len(self._keys)):
+                c_item = self._create_field(i, value)
+                # Schema keys are distinct, so pairs can be appended without a lookup.
+                set_result = c_amqpvalue.amqpvalue_append_map_pair(
+                    result, (<AMQPValue>self._c_keys[i])._c_value, c_item)
+                c_amqpvalue.amqpvalue_destroy(c_item)
+                if set_result != 0:
+                    raise ValueError("Failed to set AMQP map value.")
+        except:
+            c_amqpvalue.amqpvalue_destroy(result)
+            raise
+        return result
+
+    cdef c_amqpvalue.AMQP_VALUE _create_list(self, value) except *:
+        cdef c_amqpvalue.AMQP_VALUE result
+        cdef c_amqpvalue.AMQP_VALUE c_item
+        cdef int set_result
+        cdef Py_ssize_t i
+        result = c_amqpvalue.amqpvalue_create_list()
+        if <void*>result == NULL:
+            raise MemoryError("Failed to create AMQP list.")
+        try:
+            if c_amqpvalue.amqpvalue_set_list_item_count(result, len(self._keys)) != 0:
+                raise ValueError("Failed to set AMQP list size.")
+            for i in range(len(self._keys)):
+                c_item = self._create_field(i, value)
+                set_result = c_amqpvalue.amqpvalue_set_list_item(result, i, c_item)
+                c_amqpvalue.amqpvalue_destroy(c_item)
+                if set_result != 0:
+                    raise ValueError("Failed to set AMQP list item.")
+        except:
+            c_amqpvalue.amqpvalue_destroy(result)
+            raise
+        return result
+
+    cdef c_amqpvalue.AMQP_VALUE _create_field(self, Py_ssize_t index, value) except *:
+        key = self._keys[index]
+        try:
+            item = value[key]
+        except KeyError:
+            raise ValueError("Value is missing schema field {!r}.".format(key))
+        try:
+            return _create_schema_field(<int>self._field_types[index], item, self._encoding)
+        except (TypeError, OverflowError) as e:
+            raise type(e)("Invalid value for schema field {!r}: {}".format(key, e))
+
+    cpdef decode(self, AMQPValue value):
+        cdef c_amqpvalue.AMQP_VALUE c_value = value._c_value
+        cdef c_amqpvalue.AMQP_VALUE c_item
+        cdef stdint.uint32_t count
+        cdef Py_ssize_t i
+        if self._descriptor is not None:
+            if c_amqpvalue.amqpvalue_get_type(c_value) != c_amqpvalue.AMQP_TYPE_DESCRIBED or \
+                    not c_amqpvalue.amqpvalue_are_equal(
+                        c_amqpvalue.amqpvalue_get_inplace_descriptor(c_value), self._descriptor._c_value):
+                raise ValueError("Value does not have the schema descriptor.")
+            c_value = c_amqpvalue.amqpvalue_get_inplace_described_value(c_value)
+        result = {}
+        if self._as_list:
+            if c_amqpvalue.amqpvalue_get_type(c_value) != c_amqpvalue.AMQP_TYPE_LIST or \
+                    c_amqpvalue.amqpvalue_get_list_item_count(c_value, &count) != 0 or \
+                    count < <stdint.uint32_t>len(self._keys):
+                raise ValueError("Value is not a list of {} schema fields.".format(len(self._keys)))
+            for i in range(len(self._keys)):
+                c_item = c_amqpvalue.amqpvalue_get_list_item_in_place(c_value, i)
+                result[self._keys[i]] = self._read_field(i, c_item)
+        else:
+            if c_amqpvalue.amqpvalue_get_type(c_value) != c_amqpvalue.AMQP_TYPE_MAP:
+                raise ValueError("Value is not a map of schema fields.")
+            for i in range(len(self._keys)):
+                # The map returns a clone of the stored value.
+                c_item = c_amqpvalue.amqpvalue_get_map_value(c_value, (<AMQPValue>self._c_keys[i])._c_value)
+                if <void*>c_item == NULL:
+                    raise ValueError("Value is missing schema field {!r}.".format(self._keys[i]))
+                try:
+                    result[self._keys[i]] = self._read_field(i, c_item)
+                finally:
+                    c_amqpvalue.amqpvalue_destroy(c_item)
+        return result
+
+    cdef _read_field(self, Py_ssize_t index, c_amqpvalue.AMQP_VALUE c_item):
+        try:
+            return _read_schema_field(<int>self._field_types[index], c_item, self._encoding)
+        except TypeError as e:
+            raise TypeError("Invalid value for schema field {!r}: {}".format(self._keys[index], e))
+
+
+cdef inline bint _is_schema_integer(int field_type):
+    return c_amqpvalue.AMQP_TYPE_UBYTE <= field_type <= c_amqpvalue.AMQP_TYPE_LONG
+
+
+cdef c_amqpvalue.AMQP_VALUE _create_schema_field(int field_type, value, str encoding) except *:
+    cdef c_amqpvalue.AMQP_VALUE result
+    cdef c_amqpvalue.amqp_binary _binary
+    cdef bytes encoded
+    cdef object delta
+
+    # Each branch both validates and converts the value, so the Python type
+    # is never inspected beyond what the declared AMQP type requires.
+    if _is_schema_integer(field_type) and (isinstance(value, bool) or not isinstance(value, int)):
+        raise TypeError("Expected int, got {}.".format(type(value).__name__))
+    if field_type == c_amqpvalue.AMQP_TYPE_LONG:
+        result = c_amqpvalue.amqpvalue_create_long(<stdint.int64_t>value)
+    elif field_type == c_amqpvalue.AMQP_TYPE_INT:
+        result = c_amqpvalue.amqpvalue_create_int(<stdint.int32_t>value)
+    elif field_type == c_amqpvalue.AMQP_TYPE_ULONG:
+        result = c_amqpvalue.amqpvalue_create_ulong(<stdint.uint64_t>value)
+    elif field_type == c_amqpvalue.AMQP_TYPE_UINT:
+        result = c_amqpvalue.amqpvalue_create_uint(<stdint.uint32_t>value)
+    elif field_type == c_amqpvalue.AMQP_TYPE_SHORT:
+        result = c_amqpvalue.amqpvalue_create_short(<stdint.int16_t>value)
+    elif field_type == c_amqpvalue.AMQP_TYPE_USHORT:
+        result = c_amqpvalue.amqpvalue_create_ushort(<stdint.uint16_t>value)
+    elif field_type == c_amqpvalue.AMQP_TYPE_BYTE:
+        result = c_amqpvalue.amqpvalue_create_byte(<stdint.int8_t>value)
+    elif field_type == c_amqpvalue.AMQP_TYPE_UBYTE:
+        result = c_amqpvalue.amqpvalue_create_ubyte(<stdint.uint8_t>value)
+    elif field_type == c_amqpvalue.AMQP_TYPE_STRING:
+        if isinstance(value, str):
+            encoded = value.encode(encoding)
+        elif isinstance(value, bytes):
+            encoded = value
+        else:
+            raise TypeError("Expected str, got {}.".format(type(value).__name__))
+        result = c_amqpvalue.amqpvalue_create_string(encoded)
+    elif field_type == c_amqpvalue.AMQP_TYPE_SYMBOL:
+        if isinstance(value, str):
+            encoded = value.encode(encoding)
+        elif isinstance(value, bytes):
+            encoded = value
+        else:
+            raise TypeError("Expected str or bytes, got {}.".format(type(value).__name__))
+        result = c_amqpvalue.amqpvalue_create_symbol(encoded)
+    elif field_type == c_amqpvalue.AMQP_TYPE_BINARY:
+        if not isinstance(value, (bytes, bytearray)):
+            raise TypeError("Expected bytes, got {}.".format(type(value).__name__))
+        _binary.length = len(value)
+        _binary.bytes = <char*>value
+        result = c_amqpvalue.amqpvalue_create_binary(_binary)
+    elif field_type == c_amqpvalue.AMQP_TYPE_DOUBLE or field_type == c_amqpvalue.AMQP_TYPE_FLOAT:
+        if isinstance(value, bool) or not isinstance(value, (float, int)):
+            raise TypeError("Expected float, got {}.".format(type(value).__name__))
+        if field_type == c_amqpvalue.AMQP_TYPE_DOUBLE:
+            result = c_amqpvalue.amqpvalue_create_double(<double>value)
+        else:
+            result = c_amqpvalue.amqpvalue_create_float(<float>value)
+    elif field_type == c_amqpvalue.AMQP_TYPE_BOOL:
+        if not isinstance(value, bool):
+            raise TypeError("Expected bool, got {}.".format(type(value).__name__))
+        result = c_amqpvalue.amqpvalue_create_boolean(value)
+    elif field_type == c_amqpvalue.AMQP_TYPE_TIMESTAMP:
+        if isinstance(value, datetime.datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=datetime.timezone.utc)
+            delta = value - _DECODE_EPOCH
+            value = (delta.days * 86400 + delta.seconds) * 1000 + delta.microseconds // 1000
+        elif isinstance(value, bool) or not isinstance(value, int):
+            raise TypeError("Expected datetime, got {}.".format(type(value).__name__))
+        result = c_amqpvalue.amqpvalue_create_timestamp(<stdint.int64_t>value)
+    elif field_type == c_amqpvalue.AMQP_TYPE_UUID:
+        if not isinstance(value, uuid.UUID):
+            raise TypeError("Expected UUID, got {}.".format(type(value).__name__))
+        encoded = value.bytes
+        result = c_amqpvalue.amqpvalue_create_uuid(encoded)
+    elif field_type == c_amqpvalue.AMQP_TYPE_CHAR:
+        if not isinstance(value, str) or len(value) != 1:
+            raise TypeError("Expected a single character.")
+        result = c_amqpvalue.amqpvalue_create_char(ord(value))
+    else:
+        raise TypeError("Unsupported schema field type {}.".format(field_type))
+    if <void*>result == NULL:
+        raise MemoryError("Failed to create AMQP value.")
+    return result
+
+
+cdef object _read_schema_field(int field_type, c_amqpvalue.AMQP_VALUE value, str encoding):
+    cdef int value_type = c_amqpvalue.amqpvalue_get_type(value)
+    cdef c_amqpvalue.amqp_binary _binary
+    cdef const char* _string
+    cdef stdint.int64_t _timestamp
+    cdef stdint.uint32_t _char
+    cdef c_amqpvalue.uuid _uuid
+    cdef bint _bool
+    cdef double _double
+    cdef float _float
+    cdef stdint.int64_t _long
+    cdef stdint.uint64_t _ulong
+
+    # Integer and floating point fields will also accept the other widths of
+    # their type, as these are interchangeable when sent by a generic encoder.
+    if value_type != field_type and not (
+            _is_schema_integer(field_type) and _is_schema_integer(value_type)) and not (
+            field_type in (c_amqpvalue.AMQP_TYPE_FLOAT, c_amqpvalue.AMQP_TYPE_DOUBLE) and
+            value_type in (c_amqpvalue.AMQP_TYPE_FLOAT, c_amqpvalue.AMQP_TYPE_DOUBLE)):
+        raise TypeError("Expected AMQP type {}, got {}.".format(
+            AMQPType(field_type).name, get_amqp_value_type(value).name))
+    if value_type == c_amqpvalue.AMQP_TYPE_STRING:
+        if c_amqpvalue.amqpvalue_get_string(value, &_string) != 0:
+            raise ValueError("Failed to read AMQP string.")
+        return (<bytes>_string).decode(encoding)
+    elif value_type == c_amqpvalue.AMQP_TYPE_SYMBOL:
+        if c_amqpvalue.amqpvalue_get_symbol(value, &_string) != 0:
+            raise ValueError("Failed to read AMQP symbol.")
+        return <bytes>_string
+    elif value_type == c_amqpvalue.AMQP_TYPE_BINARY:
+        if c_amqpvalue.amqpvalue_get_binary(value, &_binary) != 0:
+            raise ValueError("Failed to read AMQP binary.")
+        return (<char*>_binary.bytes)[:_binary.length]
+    elif value_type == c_amqpvalue.AMQP_TYPE_TIMESTAMP:
+        if c_amqpvalue.amqpvalue_get_timestamp(value, &_timestamp) != 0:
+            raise ValueError("Failed to read AMQP timestamp.")
+        return _DECODE_EPOCH + datetime.timedelta(milliseconds=_timestamp)
+    elif value_type == c_amqpvalue.AMQP_TYPE_UUID:
+        if c_amqpvalue.amqpvalue_get_uuid(value, &_uuid) != 0:
+            raise ValueError("Failed to read AMQP uuid.")
+        return uuid.UUID(bytes=(<char*>_uuid)[:16])
+    elif value_type == c_amqpvalue.AMQP_TYPE_CHAR:
+        if c_amqpvalue.amqpvalue_get_char(value, &_char) != 0:
+            raise ValueError("Failed to read AMQP char.")
+        return chr(_char)
+    elif value_type == c_amqpvalue.AMQP_TYPE_BOOL:
+        if c_amqpvalue.amqpvalue_get_boolean(value, &_bool) != 0:
+            raise ValueError("Failed to read AMQP boolean.")
+        return _bool
+    elif value_type == c_amqpvalue.AMQP_TYPE_DOUBLE:
+        if c_amqpvalue.amqpvalue_get_double(value, &_double) != 0:
+            raise ValueError("Failed to read AMQP double.")
+        return _double
+    elif value_type == c_amqpvalue.AMQP_TYPE_FLOAT:
+        if c_amqpvalue.amqpvalue_get_float(value, &_float) != 0:
+            raise ValueError("Failed to read AMQP float.")
+        return _float
+    elif value_type == c_amqpvalue.AMQP_TYPE_LONG:
+        if c_amqpvalue.amqpvalue_get_long(value, &_long) != 0:
+            raise ValueError("Failed to read AMQP long.")
+        return _long
+    elif value_type == c_amqpvalue.AMQP_TYPE_ULONG:
+        if c_amqpvalue.amqpvalue_get_ulong(value, &_ulong) != 0:
+            raise ValueError("Failed to read AMQP ulong.")
+        return _ulong
+    # The narrower integer types are read through their value wrappers.
+    return value_factory(c_amqpvalue.amqpvalue_clone(value)).value
@@ -31,7 +31,8 @@ cdef class cSession(StructBase):
         pass
 
     def __dealloc__(self):
-        _logger.debug("Deallocating {}".format(self.__class__.__name__))
+        if _trace_enabled:
+            _logger.debug("Deallocating {}".format(self.__class__.__name__))
         self.destroy()
 
     def __enter__(self):
@@ -82,7 +83,8 @@ cdef class cSession(StructBase):
 
     cpdef destroy(self):
         if <void*>self._c_value is not NULL:
-            _logger.debug("Destroying {}".format(self.__class__.__name__))
+            if _trace_enabled:
+                _logger.debug("Destroying {}".format(self.__class__.__name__))
             c_session.session_destroy(self._c_value)
             self._c_value = <c_session.SESSION_HANDLE>NULL
 
@@ -39,7 +39,8 @@ cdef class XIO(StructBase):
         pass
 
     def __dealloc__(self):
-        _logger.debug("Deallocating {}".format(self.__class__.__name__))
+        if _trace_enabled:
+            _logger.debug("Deallocating {}".format(self.__class__.__name__))
         self.destroy()
 
     cdef _create(self):
@@ -48,7 +49,8 @@ cdef class XIO(StructBase):
 
     cpdef destroy(self):
         if <void*>self._c_value is not NULL:
-            _logger.debug("Destroying {}".format(self.__class__.__name__))
+            if _trace_enabled:
+                _logger.debug("Destroying {}".format(self.__class__.__name__))
             c_xio.xio_destroy(self._c_value)
             self._c_value = <c_xio.XIO_HANDLE>NULL
 
@@ -73,6 +75,11 @@ cdef class XIO(StructBase):
         if c_xio.xio_setoption(self._c_value, b'TrustedCerts', <void*>certificate) != 0:
             raise self._value_error("Failed to set certificates")
 
+    cpdef set_session_resumption(self, bint value):
+        cdef int resumption = value
+        if c_xio.xio_setoption(self._c_value, b'tls_session_resumption', <void*>&resumption) != 0:
+            raise self._value_error("Failed to set TLS session resumption")
+
 
 cdef class IOInterfaceDescription:
 
@@ -11,6 +11,7 @@ import io
 
 # C imports
 from libc.stdlib cimport malloc, free
+from libc.string cimport memcpy
 cimport c_xlogging
 
 
@@ -23,46 +24,130 @@ class LogCategory(Enum):
     Debug = c_xlogging.LOG_CATEGORY_TAG.AZ_LOG_TRACE
 
 
-cdef char* vprintf_alloc(const char* format, c_xlogging.va_list va):
-    cdef char* result
-    cdef int neededSize
-    neededSize = c_xlogging.vsnprintf(NULL, 0, format, va)
-    if neededSize < 0:
-        result = NULL
+cdef extern from *:
+    """
+    #if defined(_MSC_VER)
+    #define UAMQP_THREAD_LOCAL __declspec(thread)
+    #else
+    #define UAMQP_THREAD_LOCAL __thread
+    #endif
+    #define UAMQP_LOG_INLINE_SIZE 1024
+
+    typedef struct UAMQP_LOG_BUFFER_TAG
+    {
+        char inline_data[UAMQP_LOG_INLINE_SIZE];
+        char* data;
+        size_t length;
+        size_t capacity;
+    } UAMQP_LOG_BUFFER;
+
+    static UAMQP_THREAD_LOCAL UAMQP_LOG_BUFFER uamqp_log_buffer;
+
+    static UAMQP_LOG_BUFFER* uamqp_get_log_buffer(void)
+    {
+        if (uamqp_log_buffer.data == NULL)
+        {
+            uamqp_log_buffer.data = uamqp_log_buffer.inline_data;
+            uamqp_log_buffer.capacity = UAMQP_LOG_INLINE_SIZE;
+        }
+        return &uamqp_log_buffer;
+    }
+    """
+    ctypedef struct _LogBuffer "UAMQP_LOG_BUFFER":
+        char* inline_data
+        char* data
+        size_t length
+        size_t capacity
+    size_t _LOG_INLINE_SIZE "UAMQP_LOG_INLINE_SIZE"
+    _LogBuffer* _get_log_buffer "uamqp_get_log_buffer"()
+
+
+DEF _LOG_LINE = 0x01
+DEF _LOG_LEVEL_INFO = 20
+DEF _LOG_LEVEL_ERROR = 40
+
+# The effective level of the C logger. Lines below this level are dropped
+# before they are formatted, without calling into Python.
+cdef int _log_level = _LOG_LEVEL_INFO
+
+
+cpdef update_log_level():
+    """Refresh the cached level of the 'uamqp.c_uamqp' logger. This is done
+    when the logger is installed and whenever a Connection is created, and should
+    be called if the logging configuration changes while connections are open.
+    """
+    global _log_level
+    if _logger.disabled:
+        _log_level = logging.CRITICAL + 1
     else:
-        result = <char*>malloc(neededSize + 1)
-        if <void*>result != NULL:
-            if c_xlogging.vsnprintf(result, neededSize + 1, format, va) != neededSize:
-                free(result)
-                result = NULL
-    return result;
+        _log_level = max(_logger.getEffectiveLevel(), _logger.manager.disable + 1)
+
+
+cdef void _log_buffer_reset(_LogBuffer* buffer):
+    if buffer.data != buffer.inline_data:
+        free(buffer.data)
+        buffer.data = buffer.inline_data
+        buffer.capacity = _LOG_INLINE_SIZE
+    buffer.length = 0
+
+
+cdef int _log_buffer_append(_LogBuffer* buffer, const char* format, c_xlogging.va_list args):
+    cdef c_xlogging.va_list copied
+    cdef size_t available = buffer.capacity - buffer.length
+    cdef size_t new_capacity
+    cdef char* new_data
+    cdef int needed
+    # Format straight into the buffer, and only if the text does not fit
+    # grow the buffer and format it a second time.
+    c_xlogging.va_copy(copied, args)
+    needed = c_xlogging.vsnprintf(buffer.data + buffer.length, available, format, copied)
+    c_xlogging.va_end(copied)
+    if needed < 0:
+        return 1
+    if <size_t>needed >= available:
+        new_capacity = max(buffer.capacity * 2, buffer.length + needed + 1)
+        new_data = <char*>malloc(new_capacity)
+        if new_data == NULL:
+            return 1
+        memcpy(new_data, buffer.data, buffer.length)
+        if buffer.data != buffer.inline_data:
+            free(buffer.data)
+        buffer.data = new_data
+        buffer.capacity = new_capacity
+        if c_xlogging.vsnprintf(buffer.data + buffer.length, needed + 1, format, args) != needed:
+            return 1
+    buffer.length += needed
+    return 0
 
 
 cdef void custom_logging_function(c_xlogging.LOG_CATEGORY_TAG log_category, const char* file, const char* func, const int line, unsigned int options, const char* format, ...):
-    log_level = LogCategory(log_category)
     cdef c_xlogging.va_list args
-    cdef char* text
+    cdef _LogBuffer* buffer
+    cdef int level = _LOG_LEVEL_ERROR if log_category == c_xlogging.AZ_LOG_ERROR else _LOG_LEVEL_INFO
+    cdef int result
+    if level < _log_level:
+        return
+    # A log line may be written in several parts, which are assembled in a
+    # buffer local to the logging thread until the line is complete.
+    buffer = _get_log_buffer()
     c_xlogging.va_start(args, format)
-    text = vprintf_alloc(format, args)
-    if <void*>text != NULL:
-        _python_log(log_level, text, bool(options), file=file, func=func, line=line)
+    result = _log_buffer_append(buffer, format, args)
     c_xlogging.va_end(args)
-    free(text)
+    if result != 0:
+        _log_buffer_reset(buffer)
+    elif options & _LOG_LINE:
+        text = buffer.data[:buffer.length]
+        _log_buffer_reset(buffer)
+        _python_log(level, text, file=file, func=func, line=line)
 
 
 cpdef set_python_logger():
+    update_log_level()
     c_xlogging.xlogging_set_log_function(<c_xlogging.LOGGER_LOG>custom_logging_function)
 
 
-def _python_log(category, text, end, text_bldr=[], file=None, func=None, line=None):
-    text_bldr.append(text)
-    if not end:
-        return
-
-    log_line = b''
-    while text_bldr:
-        log_line += text_bldr.pop(0)
-    if category == LogCategory.Debug or category == LogCategory.Info:
+def _python_log(level, log_line, file=None, func=None, line=None):
+    if level < logging.ERROR:
         _logger.info(log_line)
     else:
         _logger.error("{} ({}:{}:{})".format(
@@ -0,0 +1,128 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import os
+import sys
+import pytest
+
+root_path = os.path.realpath('.')
+sys.path.append(root_path)
+
+from uamqp import c_uamqp
+from uamqp import constants
+
+
+class FakeConnection:
+
+    def __init__(self, fakes, hostname, auth, **kwargs):
+        self.fakes = fakes
+        self.hostname = hostname
+        self.auth = auth
+        self.cbs = None
+        self.destroyed = False
+        self.work_count = 0
+        self._state = c_uamqp.ConnectionState.OPENED
+
+    def work(self):
+        self.work_count += 1
+        for sender in self.fakes.senders:
+            if sender.session.connection is self:
+                sender.work()
+
+    def destroy(self):
+        self.destroyed = True
+
+
+class FakeSession:
+
+    def __init__(self, connection, **kwargs):
+        self.connection = connection
+
+    def destroy(self):
+        pass
+
+
+class FakeSender:
+    """A MessageSender that opens after `open_after` iterations of its
+    Connection, and fails to open if `fail` is set. Messages are acknowledged
+    as they are sent if `acknowledge` is set, otherwise they are left waiting
+    for acknowledgement and are failed when the sender is destroyed.
+    """
+
+    def __init__(self, session, source, target, acknowledge=True, fail=False, open_after=1, **kwargs):
+        self.session = session
+        self.target = target
+        self.acknowledge = acknowledge
+        self.fail = fail
+        self.open_after = open_after
+        self.iterations = 0
+        self.sent = []
+        self._state = constants.MessageSenderState.Idle
+
+    def open(self):
+        self._state = constants.MessageSenderState.Opening
+
+    def work(self):
+        if self._state == constants.MessageSenderState.Opening:
+            self.iterations += 1
+            if self.fail:
+                self._state = constants.MessageSenderState.Error
+            elif self.iterations >= self.open_after:
+                self._state = constants.MessageSenderState.Open
+
+    def destroy(self):
+        for message in self.sent:
+            if message.state == constants.MessageState.WaitingForAck:
+                message._on_message_sent(constants.MessageSendResult.Error)
+        self._state = constants.MessageSenderState.Idle
+
+    def send_async(self, message, timeout=0):
+        self.sent.append(message)
+        if self.acknowledge:
+            message._on_message_sent(constants.MessageSendResult.Ok)
+
+
+class FakeAMQP:
+    """Creates the fake Connections, Sessions and MessageSenders of the clients
+    in a test. `sender_options` are the FakeSender settings used for any new senders.
+    """
+
+    def __init__(self):
+        self.connections = []
+        self.senders = []
+        self.sender_options = {}
+
+    def connection(self, hostname, auth, **kwargs):
+        connection = FakeConnection(self, hostname, auth, **kwargs)
+        self.connections.append(connection)
+        return connection
+
+    def sender(self, session, source, target, **kwargs):
+        kwargs.update(self.sender_options)
+        sender = FakeSender(session, source, target, **kwargs)
+        self.senders.append(sender)
+        return sender
+
+    def attach(self, client):
+        """Use the fakes for the Connection, Session and Links of a client.
+
+        :returns: The client.
+        """
+        client.connection_type = self.connection
+        client.session_type = FakeSession
+        client.sender_type = self.sender
+        return client
+
+    def client_type(self, base):
+        """Subclass a client type that is constructed elsewhere, such as by a ClientCache,
+        so that its instances can reach the fakes through `self.fakes`.
+        """
+        return type(base.__name__, (base,), {'fakes': self})
+
+
+@pytest.fixture
+def fake_amqp():
+    return FakeAMQP()
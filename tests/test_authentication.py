@@ -0,0 +1,38 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import os
+import sys
+
+root_path = os.path.realpath('.')
+sys.path.append(root_path)
+
+from uamqp import authentication
+
+
+def test_trusted_certs_cache(tmpdir):
+    bundle = tmpdir.join("bundle.pem")
+    bundle.write_binary(b"first")
+    first = authentication._read_trusted_certs(str(bundle))
+    assert first == b"first"
+    assert authentication._read_trusted_certs(str(bundle)) is first
+
+    bundle.write_binary(b"second bundle")
+    assert authentication._read_trusted_certs(str(bundle)) == b"second bundle"
+
+
+def test_tls_session_resumption_option(monkeypatch):
+    resumption = []
+    monkeypatch.setattr(
+        authentication.AMQPAuth, 'set_tlsio', lambda self, hostname, port: resumption.append(self.tls_session_resumption))
+
+    authentication.SASLAnonymous("host")
+    authentication.SASLAnonymous("host", tls_session_resumption=False)
+    authentication.SASLPlain("host", "user", "password", tls_session_resumption=False)
+    auth = authentication.SASTokenAuth.from_shared_access_key(
+        "amqps://host/path", "key_name", "key", tls_session_resumption=False)
+    assert resumption == [True, False, False, False]
+    assert not auth.tls_session_resumption
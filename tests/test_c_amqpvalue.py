@@ -4,6 +4,8 @@
 # license information.
 #--------------------------------------------------------------------------
 
+import array
+import logging
 import os
 import sys
 import pytest
@@ -239,4 +241,92 @@ def test_equal_values():
     assert value_a == value_b
     assert value_c == value_d
     assert value_a != value_c
-    assert value_d != value_e
\ No newline at end of file
+    assert value_d != value_e
+
+def test_data_factory():
+    value = c_uamqp.data_factory(
+        {"key": [1, 2.5, True, None], b"nested": {"a": "b"}, "uuid": uuid.UUID(int=1)})
+    assert value.type == c_uamqp.AMQPType.DictValue
+    assert value.size == 3
+    assert value.value[b"key"] == [1, 2.5, True, None]
+    assert value.value[b"nested"] == {"a": "b"}
+    assert c_uamqp.data_factory(bytearray(b"data")).value == b"data"
+
+    existing = c_uamqp.int_value(42)
+    assert c_uamqp.data_factory(existing) is existing
+    with pytest.raises(TypeError):
+        c_uamqp.data_factory(object())
+
+
+def test_large_dict_value():
+    value = c_uamqp.data_factory({"key{}".format(i): i for i in range(1000)})
+    assert value.size == 1000
+    assert value[c_uamqp.string_value(b"key999")].value == 999
+    value[c_uamqp.string_value(b"key0")] = c_uamqp.int_value(-1)
+    value.append(c_uamqp.string_value(b"extra"), c_uamqp.int_value(1000))
+    assert value.size == 1001
+    assert value[c_uamqp.string_value(b"key0")].value == -1
+    assert value[c_uamqp.string_value(b"extra")].value == 1000
+
+    mixed = c_uamqp.data_factory({"ab": 1, b"ab": 2})
+    assert mixed.size == 1
+    assert mixed.value == {b"ab": 2}
+
+
+def test_array_value_from_buffer():
+    value = c_uamqp.array_value_from_buffer(array.array('i', [1, 2, 3]))
+    assert value.size == 3
+    assert value[0].type == c_uamqp.AMQPType.IntValue
+    assert value.to_array() == array.array('i', [1, 2, 3])
+
+    value = c_uamqp.array_value_from_buffer(array.array('q', [2**40, -1]))
+    assert value[0].type == c_uamqp.AMQPType.LongValue
+    assert value.to_array() == array.array('q', [2**40, -1])
+
+    value = c_uamqp.array_value_from_buffer(array.array('d', [1.5, 2.5]))
+    assert value[1].type == c_uamqp.AMQPType.DoubleValue
+    assert value.to_array() == array.array('d', [1.5, 2.5])
+
+    value = c_uamqp.array_value_from_buffer(array.array('q', [1000]), timestamps=True)
+    assert value[0].type == c_uamqp.AMQPType.TimestampValue
+    assert value.to_array() == array.array('q', [1000])
+
+    with pytest.raises(TypeError):
+        c_uamqp.array_value_from_buffer(array.array('Q', [1]))
+    with pytest.raises(TypeError):
+        c_uamqp.array_value_from_buffer(array.array('d', [1.0]), timestamps=True)
+
+
+def test_trace_logging(caplog):
+    caplog.set_level(logging.DEBUG)
+    assert not c_uamqp.get_trace_enabled()
+    value = c_uamqp.long_value(1)
+    del value
+    assert not [r for r in caplog.records if "Deallocating" in r.getMessage()]
+    c_uamqp.set_trace_enabled(True)
+    try:
+        value = c_uamqp.long_value(1)
+        del value
+    finally:
+        c_uamqp.set_trace_enabled(False)
+    assert [r for r in caplog.records if "Deallocating" in r.getMessage()]
+
+
+def test_native_log_level(caplog):
+    c_logger = logging.getLogger('uamqp.c_uamqp')
+    value = c_uamqp.long_value(1)
+    caplog.set_level(logging.INFO, logger='uamqp.c_uamqp')
+    c_uamqp.update_log_level()
+    with pytest.raises(ValueError):
+        value.get_map()
+    assert [r for r in caplog.records if "MAP" in r.getMessage()]
+    caplog.clear()
+    c_logger.setLevel(logging.CRITICAL)
+    c_uamqp.update_log_level()
+    try:
+        with pytest.raises(ValueError):
+            value.get_map()
+        assert not caplog.records
+    finally:
+        c_logger.setLevel(logging.NOTSET)
+        c_uamqp.update_log_level()
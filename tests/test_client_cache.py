@@ -0,0 +1,180 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import os
+import sys
+import pytest
+
+root_path = os.path.realpath('.')
+sys.path.append(root_path)
+
+import uamqp
+from uamqp import c_uamqp
+from uamqp import constants
+from uamqp.client import ClientCache, ReceiveClient, SendClient
+
+
+class _TestSendClient:
+
+    def __init__(self, target, auth=None, debug=False, connection_pool=None, **kwargs):
+        self.target = target
+        self.sent = []
+        self.closed = False
+        self.warmed = False
+        self._shutdown = False
+        self._session = True
+        self._connection = self.fakes.connection(target, auth)
+
+    def queue_message(self, message):
+        self.sent.append(message)
+
+    def send_all_messages(self, close_on_done=True):
+        return [constants.MessageState.Complete]
+
+    def stream_messages(self, messages, max_pending=300, close_on_done=True):
+        messages = list(messages)
+        self.sent.extend(messages)
+        return [constants.MessageState.Complete] * len(messages)
+
+    def warm_up(self, timeout=0):
+        self.warmed = True
+
+    def close(self):
+        self.closed = True
+        self._session = None
+
+
+class _TestReceiveClient(ReceiveClient):
+
+    def __init__(self, source, auth=None, debug=False, connection_pool=None, **kwargs):
+        super(_TestReceiveClient, self).__init__(source, auth=object(), debug=debug, **kwargs)
+        self.closed = False
+        self._session = True
+        self._connection = self.fakes.connection(source, auth)
+
+    def receive_message_batch(self, max_batch_size=None, on_message_received=None, timeout=0):
+        return [uamqp.Message(body=b"received")] * max_batch_size
+
+    def close(self):
+        self.closed = True
+        self._session = None
+
+
+class _TestAuth:
+
+    def __init__(self, token):
+        self.token = token
+
+
+class _StreamingSendClient(SendClient):
+
+    def __init__(self, *args, **kwargs):
+        super(_StreamingSendClient, self).__init__(*args, **kwargs)
+        self.max_in_flight = 0
+
+    def open(self, connection=None):
+        pass
+
+    def close(self):
+        self._pending_messages = []
+
+    def do_work(self):
+        self.max_in_flight = max(self.max_in_flight, len(self._pending_messages))
+        message = self._pending_messages.pop(0)
+        message.state = constants.MessageState.Complete
+        return True
+
+
+def test_client_cache_reuse(fake_amqp):
+    cache = ClientCache(idle_timeout=60)
+    cache.send_client_type = fake_amqp.client_type(_TestSendClient)
+    cache.send_message("amqp://host/a", b"one")
+    cache.send_message("amqp://host/a", b"two")
+    cache.send_message("amqp://host/b", b"three")
+    assert len(cache) == 2
+    first = cache._checkout(cache.send_client_type, "amqp://host/a", None, False, {})
+    assert [list(m.get_data()) for m in first.client.sent] == [[b"one"], [b"two"]]
+    first.client._connection._state = c_uamqp.ConnectionState.ERROR
+    cache._checkin(first)
+    assert first.client.closed
+    assert len(cache) == 1
+
+    cache.idle_timeout = 0
+    cache.evict_idle()
+    assert len(cache) == 0
+
+
+def test_client_cache_error_closes_client(fake_amqp):
+    cache = ClientCache()
+    cache.send_client_type = fake_amqp.client_type(_TestSendClient)
+
+    def _fail(client):
+        raise ValueError("Send failed.")
+    with pytest.raises(ValueError):
+        cache._run(cache.send_client_type, "amqp://host/a", None, False, {}, _fail)
+    assert len(cache) == 0
+
+
+def test_stream_messages():
+    client = _StreamingSendClient("amqp://host/a", auth=object())
+    messages = (uamqp.Message(body=str(i)) for i in range(10))
+    results = client.stream_messages(messages, max_pending=3)
+    assert results == [constants.MessageState.Complete] * 10
+    assert client.max_in_flight == 3
+
+
+def test_client_warm_up(fake_amqp):
+    fake_amqp.sender_options['open_after'] = 3
+    client = fake_amqp.attach(SendClient("amqp://host/a", auth=object()))
+    client.warm_up()
+    assert client._message_sender._state == constants.MessageSenderState.Open
+    assert client._message_sender.iterations == 3
+    assert client._warmed_up()
+    client.close()
+    assert not client._ready
+
+    fake_amqp.sender_options['open_after'] = 10 ** 9
+    with pytest.raises(TimeoutError):
+        fake_amqp.attach(SendClient("amqp://host/a", auth=object())).warm_up(timeout=1)
+
+
+def test_client_cache_warm_up(fake_amqp):
+    cache = ClientCache()
+    cache.send_client_type = fake_amqp.client_type(_TestSendClient)
+    cache.warm_up_senders("amqp://host/a", count=2)
+    assert len(cache) == 2
+    warmed = cache._idle[cache._get_key(cache.send_client_type, "amqp://host/a", None, False, {})]
+    assert all(c.client.warmed for c in warmed)
+    clients = [c.client for c in warmed]
+    cache.send_message("amqp://host/a", b"one")
+    assert len(cache) == 2
+    assert sum(len(c.sent) for c in clients) == 1
+
+
+def test_module_helpers_use_cache(fake_amqp):
+    cache = ClientCache()
+    cache.send_client_type = fake_amqp.client_type(_TestSendClient)
+    cache.receive_client_type = fake_amqp.client_type(_TestReceiveClient)
+    uamqp.send_message("amqp://host/a", b"one", client_cache=cache)
+    assert len(cache) == 1
+    assert uamqp.send_messages("amqp://host/a", [b"two", b"three"], client_cache=cache) == \
+        [constants.MessageState.Complete] * 2
+    assert len(cache) == 1
+
+    assert uamqp.receive_message("amqp://host/a", client_cache=cache).get_data()
+    assert len(cache) == 2
+    # Receivers that prefetch more than one message are never cached.
+    assert len(uamqp.receive_messages("amqp://host/a", max_batch_size=5, client_cache=cache)) == 5
+    assert len(cache) == 2
+    with pytest.raises(ValueError):
+        cache.warm_up_receivers("amqp://host/a", max_batch_size=5)
+
+
+def test_client_cache_credentials():
+    first = ClientCache._get_key(_TestSendClient, "amqp://host/a", _TestAuth(b"first"), False, {})
+    second = ClientCache._get_key(_TestSendClient, "amqp://host/a", _TestAuth(b"second"), False, {})
+    assert first != second
+    assert first == ClientCache._get_key(_TestSendClient, "amqp://host/a", _TestAuth(b"first"), False, {})
@@ -0,0 +1,115 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import os
+import sys
+import pytest
+
+root_path = os.path.realpath('.')
+sys.path.append(root_path)
+
+import uamqp
+from uamqp import c_uamqp
+from uamqp import constants
+from uamqp import errors
+from uamqp import utils
+from uamqp.client import SendClient, ReceiveClient
+
+
+def _reconnecting_client(fake_amqp, target, **kwargs):
+    return fake_amqp.attach(SendClient(target, auth=object(), reconnect_backoff=0.001, **kwargs))
+
+
+def test_send_client_reconnect(fake_amqp):
+    client = _reconnecting_client(fake_amqp, "amqp://host/a", auto_reconnect=True)
+    messages = [uamqp.Message(body=str(i)) for i in range(3)]
+    for message in messages:
+        client.queue_message(message)
+    client.open()
+    fake_amqp.sender_options['acknowledge'] = False
+    while not client._message_sender or not client._message_sender.sent:
+        client.do_work()
+    first_sender = client._message_sender
+    assert all(m.state == constants.MessageState.WaitingForAck for m in messages)
+
+    fake_amqp.sender_options['acknowledge'] = True
+    client._connection._state = c_uamqp.ConnectionState.END
+    assert client.do_work()
+    assert client._reconnect_attempts == 1
+    assert fake_amqp.connections[0].destroyed
+    assert all(m.state == constants.MessageState.WaitingToBeSent for m in messages)
+    assert all(m._retries == 0 for m in messages)
+
+    results = client.send_all_messages(close_on_done=False)
+    assert results == [constants.MessageState.Complete] * 3
+    assert client._message_sender is not first_sender
+    assert [str(m) for m in client._message_sender.sent] == ["0", "1", "2"]
+    assert client._reconnect_attempts == 0
+    assert len(fake_amqp.connections) == 2
+
+
+def test_send_client_reconnect_exhausted(fake_amqp):
+    client = _reconnecting_client(fake_amqp, "amqp://host/a", auto_reconnect=True, max_reconnect_attempts=2)
+    client.queue_message(uamqp.Message(body="a"))
+    fake_amqp.sender_options['fail'] = True
+    with pytest.raises(errors.AMQPConnectionError):
+        client.send_all_messages()
+    assert len(fake_amqp.connections) == 3
+
+    client = _reconnecting_client(fake_amqp, "amqp://host/a")
+    client.queue_message(uamqp.Message(body="a"))
+    client.open()
+    client._connection._state = c_uamqp.ConnectionState.END
+    with pytest.raises(errors.AMQPConnectionError):
+        client.send_all_messages()
+    assert len(fake_amqp.connections) == 4
+
+
+def test_send_client_reconnect_last_retry(fake_amqp):
+    client = _reconnecting_client(fake_amqp, "amqp://host/a", auto_reconnect=True)
+    completed = []
+    message = uamqp.Message(body="a")
+    message._retries = constants.MESSAGE_SEND_RETRIES
+    message.on_send_complete = lambda result, error: completed.append(result)
+    client.queue_message(message)
+    client.open()
+    fake_amqp.sender_options['acknowledge'] = False
+    while not client._message_sender or not client._message_sender.sent:
+        client.do_work()
+
+    fake_amqp.sender_options['acknowledge'] = True
+    client._connection._state = c_uamqp.ConnectionState.END
+    assert client.do_work()
+    assert message.state == constants.MessageState.WaitingToBeSent
+    assert message._retries == constants.MESSAGE_SEND_RETRIES
+    assert not completed
+
+    assert client.send_all_messages(close_on_done=False) == [constants.MessageState.Complete]
+    assert completed == [constants.MessageSendResult.Ok]
+
+
+def _received_message(body, annotations=None):
+    # Received messages hold their annotations as a plain map rather than the described
+    # value that an outgoing Message is encoded with.
+    message = uamqp.Message(body=body).get_message()
+    if annotations:
+        received_annotations = c_uamqp.cMessageAnnotations()
+        c_uamqp.cAnnotations.create(received_annotations, utils.data_factory(annotations))
+        message.message_annotations = received_annotations
+    return message
+
+
+def test_receive_client_resume_position():
+    client = ReceiveClient("amqp://host/a", auth=object(), auto_reconnect=True)
+    client._received_messages = client._create_receive_buffer()
+    filters = []
+    client._remote_address.set_filter = filters.append
+    client._message_received(_received_message("a", {b"x-opt-offset": b"100", b"x-opt-sequence-number": 7}))
+    client._message_received(_received_message("b"))
+    assert client._last_position == {'offset': "100", 'sequence_number': 7}
+    assert len(client._received_messages.drain()) == 2
+    client._apply_checkpoint()
+    assert filters == [b"amqp.annotation.x-opt-offset > '100'"]
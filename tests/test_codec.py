@@ -0,0 +1,191 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import datetime
+import os
+import sys
+import pytest
+import uuid
+
+root_path = os.path.realpath('.')
+sys.path.append(root_path)
+
+import uamqp
+from uamqp import c_uamqp
+from uamqp import codec
+from uamqp import types
+from uamqp import utils
+
+
+def test_encode_primitives():
+    assert codec.encode(None) == b'\x40'
+    assert codec.encode(True) == b'\x41'
+    assert codec.encode(False) == b'\x42'
+    assert codec.encode(-1) == b'\x54\xff'
+    assert codec.encode(2**31) == b'\x81\x00\x00\x00\x00\x80\x00\x00\x00'
+    assert codec.encode(2**63) == b'\x80\x80\x00\x00\x00\x00\x00\x00\x00'
+    assert codec.encode(1.5) == b'\x82\x3f\xf8\x00\x00\x00\x00\x00\x00'
+    assert codec.encode("abc") == b'\xa1\x03abc'
+    assert codec.encode("a") == b'\x73\x00\x00\x00a'
+    assert codec.encode(b"abc") == b'\xa1\x03abc'
+    assert codec.encode(bytearray(b"abc")) == b'\xa0\x03abc'
+    assert codec.encode(b"x" * 300)[:5] == b'\xb1\x00\x00\x01\x2c'
+    assert codec.encode(memoryview(b"x" * 300))[:5] == b'\xb0\x00\x00\x01\x2c'
+    assert codec.encode(uuid.UUID(int=1)) == b'\x98' + b'\x00' * 15 + b'\x01'
+    assert codec.encode(datetime.datetime(1970, 1, 1, 0, 0, 1)) == b'\x83' + b'\x00' * 6 + b'\x03\xe8'
+    with pytest.raises(TypeError):
+        codec.encode(object())
+
+
+def test_encode_compound():
+    assert codec.encode([]) == b'\x45'
+    assert codec.encode([1, "ab"]) == b'\xc0\x07\x02\x54\x01\xa1\x02ab'
+    assert codec.encode({"a": 1}) == b'\xc1\x08\x02\x73\x00\x00\x00a\x54\x01'
+    large = codec.encode([0] * 300)
+    assert large[:9] == b'\xd0\x00\x00\x02\x5c\x00\x00\x01\x2c'
+    assert len(large) == 9 + 600
+
+
+def test_encode_amqp_types():
+    assert codec.encode(types.AMQPSymbol("sym")) == b'\xa3\x03sym'
+    assert codec.encode(types.AMQPuLong(1)) == b'\x53\x01'
+    assert codec.encode({types.AMQPSymbol("a"): types.AMQPLong(2)}) == b'\xc1\x06\x02\xa3\x01a\x55\x02'
+
+
+def test_encode_into_buffer():
+    out = bytearray(b'\xff')
+    assert codec.encode_data_section(b"abc", out=out) is out
+    assert out == b'\xff\x00\x53\x75\xa0\x03abc'
+    assert codec.encode_value_section("ab") == b'\x00\x53\x77\xa1\x02ab'
+    assert codec.encode_sequence_section([1]) == b'\x00\x53\x76\xc0\x03\x01\x54\x01'
+
+
+def test_encode_matches_data_factory():
+    values = [None, True, -1, 200, 2**31 - 1, -2**31, 1.5, "abc", "a", "\u00e9", "\u00e9" * 200, "",
+              b"abc", b"x" * 300, bytearray(b"abc"), uuid.UUID(int=1), [], [1, [2, "three"]],
+              {"key": {"nested": [1, 2]}}, {}, list(range(300)), ("a", b"b"), {"c"},
+              types.AMQPSymbol("sym"), types.AMQPuLong(1000), {types.AMQPSymbol("a"): types.AMQPLong(2)}]
+    for value in values:
+        encoded = []
+        c_uamqp.enocde_batch_value(utils.data_factory(value), encoded)
+        assert codec.encode(value) == b"".join(encoded), value
+    for value in [c_uamqp.int_value(1), c_uamqp.int_value(-128), c_uamqp.int_value(128), c_uamqp.int_value(-2**31)]:
+        encoded = []
+        c_uamqp.enocde_batch_value(value, encoded)
+        assert codec.encode(value) == b"".join(encoded), value.value
+
+
+def test_encoded_size():
+    values = [None, True, -1, 200, 2**31, 2**63, 1.5, "abc", "a", "\u00e9", "\u00e9" * 200, b"x" * 300,
+              bytearray(b"x" * 300), memoryview(b"abc"),
+              uuid.UUID(int=1), datetime.datetime(2018, 1, 2), [], [1, [2, "three"]], {"key": {"nested": [1, 2]}},
+              list(range(300)), {}, ["a" * 250], types.AMQPSymbol("sym"), types.AMQPuLong(1000),
+              types.AMQPArray([1, 2, 3]), {types.AMQPSymbol("a"): types.AMQPLong(2)}]
+    for value in values:
+        assert codec.encoded_size(value) == len(codec.encode(value))
+    for value in [1, -128, 127, 128, -129, 2**31 - 1]:
+        c_value = c_uamqp.int_value(value)
+        assert codec.encoded_size(c_value) == c_value.get_encoded_size()
+    with pytest.raises(TypeError):
+        codec.encoded_size(object())
+    with pytest.raises(OverflowError):
+        codec.encoded_size(2**64)
+
+
+def test_encoded_size_matches_message():
+    # Each section is a described value, adding a 3 byte descriptor to the encoded map.
+    properties = {"a": 1, "key": b"value", "nested": {"list": [1, "two", 3.0, bytearray(b"four")]}}
+    message = uamqp.Message(body=b"x", application_properties=properties)
+    message.get_message()
+    assert message.get_message_encoded_size() == codec.encoded_size(properties) + 3
+    annotations = {types.AMQPSymbol("x-opt-a"): "b", types.AMQPSymbol("x-opt-c"): "d" * 300}
+    message = uamqp.Message(body=b"x", annotations=annotations)
+    message.get_message()
+    assert message.get_message_encoded_size() == codec.encoded_size(annotations) + 3
+
+
+def test_decode_roundtrip():
+    values = [None, True, -1, 2**31, 2**63, 1.5, "abc", "a", bytearray(b"abc"), uuid.UUID(int=1),
+              [1, [2, "three"]], {"key": {"nested": [1, 2]}}, list(range(300)), {}]
+    for value in values:
+        assert codec.decode(codec.encode(value)) == value
+    timestamp = datetime.datetime(2018, 1, 2, 3, 4, 5, 6000, tzinfo=datetime.timezone.utc)
+    assert codec.decode(codec.encode(timestamp)) == timestamp
+    assert codec.decode(codec.encode({"ab": "cd"}), native=False) == {b"ab": b"cd"}
+    assert codec.decode(codec.encode(b"abc"), native=False) == b"abc"
+    assert codec.decode(b'\x00\x53\x75\xa0\x03abc') == b"abc"
+    with pytest.raises(ValueError):
+        codec.decode(b'\xa1\x05ab')
+
+
+def test_decode_max_depth():
+    nested = []
+    for _ in range(50):
+        nested = [nested]
+    assert codec.decode(codec.encode(nested)) == nested
+    for _ in range(100):
+        nested = [nested]
+    encoded = bytes(codec.encode(nested))
+    with pytest.raises(ValueError):
+        codec.decode(encoded)
+    with pytest.raises(ValueError):
+        codec.decode(b'\x00' * 10000 + b'\x40')
+    with pytest.raises(ValueError):
+        c_uamqp.skip_value(b'\x00' * 10000 + b'\x40')
+
+
+def test_decode_element_counts():
+    assert codec.decode(b'\xc0\x03\x02\x40\x40') == [None, None]
+    assert codec.decode(b'\xe0\x02\x03\x40') == [None] * 3
+    with pytest.raises(ValueError):
+        codec.decode(b'\xc0\x02\x05\x40')
+    with pytest.raises(ValueError):
+        codec.decode(b'\xd1\x00\x00\x00\x05\x10\x00\x00\x00\x40')
+    with pytest.raises(ValueError):
+        codec.decode(b'\xf0\x00\x00\x00\x06\x10\x00\x00\x00\x54\x01')
+    with pytest.raises(ValueError):
+        codec.decode(b'\xf0\x00\x00\x00\x05\x00\x10\x00\x00\x40')
+    with pytest.raises(ValueError):
+        codec.decode(b'\xf0\x00\x00\x00\x05\x10\x00\x00\x00\x40')
+
+
+def test_decode_malformed_map():
+    assert codec.decode(b'\xc1\x03\x02\x40\x40') == {None: None}
+    with pytest.raises(ValueError):
+        codec.decode(b'\xc1\x04\x03\x40\x40\x40')
+
+
+def test_iter_sections():
+    message = codec.encode_data_section(b"one")
+    codec.encode_value_section({"a": 1}, out=message)
+    sections = list(codec.iter_sections(message))
+    assert [s[0] for s in sections] == [codec.DATA, codec.AMQP_VALUE]
+    assert codec.decode(message, offset=sections[0][1]) == b"one"
+    assert codec.decode(message, offset=sections[1][1]) == {"a": 1}
+
+
+def test_encoded_message():
+    from uamqp.message import EncodedMessage
+    encoded = codec.encode_data_section(b"one")
+    codec.encode_data_section(b"x" * 300, out=encoded)
+    annotated = b'\x00\x53\x72\xc1\x13\x02\xa3\x0cx-opt-offset\xa1\x0210' + encoded
+    message = EncodedMessage(bytes(annotated))
+    assert message.annotations == {b"x-opt-offset": b"10"}
+    assert message.application_properties is None
+    body = list(message.get_data())
+    assert [bytes(b) for b in body] == [b"one", b"x" * 300]
+    assert all(isinstance(b, memoryview) for b in body)
+    value = EncodedMessage(codec.encode_value_section({"ab": 1}))
+    assert value.get_data() == {b"ab": 1}
+
+
+def test_decode_interned_symbols():
+    encoded = b'\xc1\x19\x04\xa3\x0cx-opt-offset\xa1\x0210\xa3\x03abc\x40'
+    first = list(codec.decode(encoded, native=False))
+    second = list(codec.decode(encoded, native=False))
+    assert first == [b"x-opt-offset", b"abc"]
+    assert all(a is b for a, b in zip(first, second))
+    assert types.AMQPSymbol("x-opt-offset").c_data is types.AMQPSymbol(b"x-opt-offset").c_data
@@ -0,0 +1,135 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import os
+import sys
+import pytest
+
+root_path = os.path.realpath('.')
+sys.path.append(root_path)
+
+from uamqp import c_uamqp
+from uamqp import connection
+from uamqp.client import SendClient
+from uamqp.connection import Connection, ConnectionPool
+
+
+class _TestAuth:
+
+    def __init__(self, username=None, password=None, port=5671, token=None):
+        self.username = username
+        self.password = password
+        self.port = port
+        self.token = token
+
+
+class _TestConnection:
+
+    def __init__(self, hostname, auth, **kwargs):
+        self.hostname = hostname
+        self.auth = auth
+        self.cbs = None
+        self.destroyed = False
+        self._state = c_uamqp.ConnectionState.OPENED
+
+    def destroy(self):
+        self.destroyed = True
+
+
+def test_connection_pool_sharing():
+    pool = ConnectionPool(idle_timeout=60)
+    first = pool.acquire("host", _TestAuth("user", "pass"), connection_type=_TestConnection)
+    second = pool.acquire("host", _TestAuth("user", "pass"), connection_type=_TestConnection)
+    other_user = pool.acquire("host", _TestAuth("other", "pass"), connection_type=_TestConnection)
+    other_port = pool.acquire(
+        "host", _TestAuth("user", "pass", port=5672), connection_type=_TestConnection)
+    assert first is second
+    assert first is not other_user
+    assert first is not other_port
+    assert len(pool) == 3
+    pool.release(first)
+    pool.release(second)
+    assert not first.destroyed
+    with pytest.raises(ValueError):
+        pool.release(_TestConnection("host", None))
+    pool.close()
+    assert first.destroyed
+    assert not other_user.destroyed
+    pool.release(other_user)
+    assert other_user.destroyed
+
+
+def test_connection_pool_credentials():
+    pool = ConnectionPool(idle_timeout=60)
+    first = pool.acquire("host", _TestAuth(token=b"first"), connection_type=_TestConnection)
+    second = pool.acquire("host", _TestAuth(token=b"second"), connection_type=_TestConnection)
+    assert first is not second
+    assert first is pool.acquire("host", _TestAuth(token=b"first"), connection_type=_TestConnection)
+    # A token refreshed from the same key does not change the identity.
+    keyed = pool.acquire("host", _TestAuth("user", "key", token=b"first"), connection_type=_TestConnection)
+    refreshed = pool.acquire("host", _TestAuth("user", "key", token=b"second"), connection_type=_TestConnection)
+    assert keyed is refreshed
+    assert keyed is not first
+
+
+class _TestSession:
+
+    def __init__(self, connection, **kwargs):
+        self.connection = connection
+
+
+def test_client_pooled_connection():
+    pool = ConnectionPool(idle_timeout=60)
+    auth = _TestAuth("user", "pass")
+    client = SendClient("amqp://host/a", auth=auth, connection_pool=pool)
+    client.connection_type = _TestConnection
+    client.session_type = _TestSession
+    client.open()
+    assert client._pooled_connection
+    assert client._connection.auth is auth
+    assert len(pool) == 1
+
+    other = SendClient("amqp://host/a", auth=_TestAuth("user", "pass"), connection_pool=pool)
+    other.connection_type = _TestConnection
+    other.session_type = _TestSession
+    other.open()
+    assert other._connection is client._connection
+    assert other._auth is auth
+
+
+def test_connection_pool_eviction():
+    auth = _TestAuth()
+    pool = ConnectionPool(idle_timeout=0)
+    first = pool.acquire("host", auth, connection_type=_TestConnection)
+    pool.release(first)
+    pool.evict_idle()
+    assert first.destroyed
+    assert len(pool) == 0
+
+    pool = ConnectionPool(idle_timeout=60)
+    first = pool.acquire("host", auth, connection_type=_TestConnection)
+    first._state = c_uamqp.ConnectionState.ERROR
+    second = pool.acquire("host", auth, connection_type=_TestConnection)
+    assert second is not first
+    assert not first.destroyed
+    pool.release(first)
+    assert first.destroyed
+    pool.release(second)
+    assert not second.destroyed
+
+
+def test_connection_trace_released():
+    first = Connection.__new__(Connection)
+    second = Connection.__new__(Connection)
+    for debug_connection in (first, second):
+        debug_connection._trace = True
+        connection._acquire_trace()
+    assert c_uamqp.get_trace_enabled()
+    first._stop_trace()
+    first._stop_trace()
+    assert c_uamqp.get_trace_enabled()
+    second._stop_trace()
+    assert not c_uamqp.get_trace_enabled()
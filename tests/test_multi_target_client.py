@@ -0,0 +1,110 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import os
+import sys
+import time
+import pytest
+
+root_path = os.path.realpath('.')
+sys.path.append(root_path)
+
+import uamqp
+from uamqp import constants
+from uamqp.client import MultiTargetSendClient
+from uamqp.routing import PartitionRouter
+
+
+class _TestClient(MultiTargetSendClient):
+
+    def __init__(self, *args, **kwargs):
+        super(_TestClient, self).__init__(*args, auth=object(), **kwargs)
+        self.max_in_flight = 0
+
+    def do_work(self):
+        self.max_in_flight = max(self.max_in_flight, self._pending_count())
+        return super(_TestClient, self).do_work()
+
+
+def test_multi_target_send(fake_amqp):
+    client = fake_amqp.attach(_TestClient("amqp://host/", max_pending=4))
+    targets = ["amqp://host/partitions/{}".format(i) for i in range(3)]
+    for i in range(12):
+        client.queue_message(uamqp.Message(body=str(i)), targets[i % 3])
+    results = client.send_all_messages(close_on_done=False)
+    assert results == [constants.MessageState.Complete] * len(results)
+    assert client.max_in_flight <= 4
+    senders = {t: client._links[t].sender for t in targets}
+    assert all(len(s.sent) == 4 for s in senders.values())
+    assert [str(m) for m in senders[targets[1]].sent] == ["1", "4", "7", "10"]
+    assert client._connection.work_count > 0
+
+    client.send_message(uamqp.Message(body="again"), targets[0])
+    assert client._links[targets[0]].sender is senders[targets[0]]
+    client.close()
+    assert not client.messages_pending()
+
+    with pytest.raises(ValueError):
+        client.queue_message(uamqp.Message(body="other"), "amqp://other/partitions/0")
+
+
+def test_multi_target_link_error(fake_amqp):
+    client = fake_amqp.attach(_TestClient("amqp://host/"))
+    client.queue_message(uamqp.Message(body="a"), "amqp://host/a")
+    client.queue_message(uamqp.Message(body="b"), "amqp://host/b")
+    client.open()
+    client.do_work()
+    client._links["amqp://host/a"].sender._state = constants.MessageSenderState.Error
+    results = client.send_all_messages(close_on_done=False)
+    assert results == [constants.MessageState.Failed, constants.MessageState.Complete]
+    assert client._links["amqp://host/a"].sender is None
+
+
+def test_multi_target_link_retry(fake_amqp):
+    client = fake_amqp.attach(_TestClient("amqp://host/", reconnect_backoff=0.01))
+    client.queue_message(uamqp.Message(body="a"), "amqp://host/a")
+    client.open()
+    client.do_work()
+    link = client._links["amqp://host/a"]
+    link.sender._state = constants.MessageSenderState.Error
+    client.do_work()
+    assert link.failed
+    assert not client._link_available("amqp://host/a")
+    client.do_work()
+    assert link.sender is None
+
+    time.sleep(0.02)
+    client.do_work()
+    assert link.sender is not None
+    client.do_work()
+    assert not link.failed
+    assert link.failures == 0
+    assert client._link_available("amqp://host/a")
+
+
+def test_multi_target_routing():
+    targets = ["amqp://host/partitions/{}".format(i) for i in range(4)]
+    router = PartitionRouter(targets)
+    client = _TestClient("amqp://host/", router=router, max_link_pending=2)
+    message = uamqp.Message(body="a", annotations={b"x-opt-partition-key": b"key"})
+    target = router.route(b"key")
+    client.queue_message(message)
+    assert client._links[target].pending == [message]
+
+    client._links[target].failed = True
+    rerouted = uamqp.Message(body="b", annotations={b"x-opt-partition-key": b"key"})
+    client.queue_message(rerouted)
+    assert rerouted not in client._links[target].pending
+
+    client._links[target].failed = False
+    client.queue_message(uamqp.Message(body="c", annotations={b"x-opt-partition-key": b"key"}))
+    throttled = uamqp.Message(body="d", annotations={b"x-opt-partition-key": b"key"})
+    client.queue_message(throttled)
+    assert len(client._links[target].pending) == 2
+    assert throttled not in client._links[target].pending
+
+    with pytest.raises(ValueError):
+        _TestClient("amqp://host/").queue_message(message)
@@ -0,0 +1,29 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import os
+import sys
+
+root_path = os.path.realpath('.')
+sys.path.append(root_path)
+
+import uamqp
+from uamqp import c_uamqp
+
+
+def test_platform_process_lifetime(monkeypatch):
+    calls = []
+    monkeypatch.setattr(c_uamqp, 'platform_init', lambda: calls.append('init'))
+    monkeypatch.setattr(c_uamqp, 'platform_deinit', lambda: calls.append('deinit'))
+    monkeypatch.setattr(uamqp._Platform, 'initialized', False)
+    for _ in range(3):
+        uamqp._Platform.initialize()
+    assert calls == ['init']
+    uamqp.shutdown_platform()
+    uamqp.shutdown_platform()
+    assert calls == ['init', 'deinit']
+    uamqp._Platform.initialize()
+    assert calls == ['init', 'deinit', 'init']
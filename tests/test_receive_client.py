@@ -0,0 +1,221 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import collections
+import inspect
+import os
+import sys
+import threading
+import time
+import pytest
+
+root_path = os.path.realpath('.')
+sys.path.append(root_path)
+
+import uamqp
+from uamqp import checkpoint
+from uamqp import codec
+from uamqp import constants
+from uamqp.checkpoint import CheckpointStore, FileCheckpointStore
+from uamqp.client import ReceiveClient, _HandlerPool, _ReceiveBuffer
+from uamqp.message import ColumnarBatch, EncodedMessage
+from uamqp.receiver import MessageReceiver
+
+
+def test_receive_buffer_drain():
+    buffer = _ReceiveBuffer()
+    for i in range(5):
+        buffer.put(i)
+    assert buffer.drain(2) == [0, 1]
+    assert buffer.get() == 2
+    assert buffer.drain(10) == [3, 4]
+    assert buffer.drain() == []
+
+
+def test_receive_buffer_concurrent_put():
+    buffer = _ReceiveBuffer(thread_safe=True)
+    count = 100000
+
+    def _produce():
+        for i in range(count):
+            buffer.put(i)
+    producer = threading.Thread(target=_produce)
+    producer.start()
+    received = []
+    while producer.is_alive() or len(buffer):
+        received.extend(buffer.drain())
+    producer.join()
+    received.extend(buffer.drain())
+    assert received == list(range(count))
+
+
+def test_columnar_batch():
+    messages = [
+        uamqp.Message(body=b"first", annotations={b"x-opt-sequence-number": 1}),
+        uamqp.Message(body=b"second"),
+        uamqp.Message(body=b"third", annotations={b"x-opt-sequence-number": 3})]
+    batch = ColumnarBatch.from_messages(messages)
+    assert len(batch) == 3
+    assert bytes(batch.body) == b"firstsecondthird"
+    assert list(batch.offsets) == [0, 5, 11, 16]
+    assert list(batch.annotations[b"x-opt-sequence-number"]) == [1, -1, 3]
+    assert bytes(batch[0]) == b"first"
+    assert bytes(batch[-1]) == b"third"
+    assert bytes(batch[-3]) == b"first"
+    assert [bytes(b) for b in batch[1:]] == [b"second", b"third"]
+    assert [bytes(b) for b in batch[::-2]] == [b"third", b"first"]
+    with pytest.raises(IndexError):
+        batch[3]
+    with pytest.raises(IndexError):
+        batch[-4]
+
+
+def test_raw_body_receive():
+    client = ReceiveClient("amqp://host/a", auth=object(), raw_bodies=True)
+    received = []
+    client._received_messages = client._create_receive_buffer()
+    client._message_received_callback = received.append
+    client._raw_message_received(b"one")
+    client._raw_message_received(b"")
+    assert received == [b"one", b""]
+    assert client._received_messages.drain() == [b"one", b""]
+    assert client._was_message_received
+
+    batch = ColumnarBatch.from_messages([b"one", uamqp.Message(body=b"two")])
+    assert [bytes(b) for b in batch[:]] == [b"one", b"two"]
+    assert list(batch.annotations[b"x-opt-sequence-number"]) == [-1, -1]
+
+    with pytest.raises(ValueError):
+        ReceiveClient("amqp://host/a", auth=object(), raw_bodies=True, checkpoint_store=CheckpointStore())
+
+
+def test_message_receiver_signature():
+    # raw_bodies was added after the existing parameters, which may be passed positionally.
+    assert list(inspect.signature(MessageReceiver).parameters)[-2:] == ['encoding', 'raw_bodies']
+
+
+def test_handler_pool_concurrent_ordered():
+    barrier = threading.Barrier(3, timeout=5)
+    finished = []
+
+    def _handler(message):
+        barrier.wait()
+        if message == 0:
+            time.sleep(0.05)
+        finished.append(message)
+
+    pool = _HandlerPool(_handler, concurrency=3, max_pending=10)
+    for i in range(3):
+        pool.submit(i)
+    pool.close()
+    assert finished[-1] == 0
+    assert pool.collect() == [0, 1, 2]
+    assert not len(pool)
+
+
+def test_handler_pool_ordering_key():
+    running = collections.Counter()
+    overlapped = []
+    lock = threading.Lock()
+
+    def _handler(message):
+        key = message[0]
+        with lock:
+            running[key] += 1
+            overlapped.append(running[key] > 1)
+        time.sleep(0.01)
+        with lock:
+            running[key] -= 1
+
+    pool = _HandlerPool(_handler, concurrency=4, max_pending=10, ordering_key=lambda m: m[0])
+    messages = [("a", i) for i in range(4)] + [("b", i) for i in range(4)]
+    for message in messages:
+        pool.submit(message)
+    pool.close()
+    assert pool.collect() == messages
+    assert not any(overlapped)
+
+
+def test_receive_client_handler_pool():
+    client = ReceiveClient("amqp://host/a", auth=object(), concurrency=2)
+    threads = []
+    client._handler_pool = _HandlerPool(
+        lambda m: threads.append(threading.current_thread()), concurrency=2, max_pending=10)
+    client._handle_message(uamqp.Message(body=b"a"))
+    client._raw_message_received(b"b")
+    executor = client._handler_pool._executor
+    client._close_handler_pool()
+    assert len(threads) == 2
+    assert threading.current_thread() not in threads
+    assert executor._shutdown
+    assert client._handler_pool is None
+
+
+def test_receive_client_checkpoint(tmp_path):
+    path = str(tmp_path / "checkpoints.json")
+    store = FileCheckpointStore(path, write_interval=0)
+    client = ReceiveClient("amqp://host/a", auth=object(), checkpoint_store=store)
+    handled = []
+    client._message_received_callback = handled.append
+    for i in range(3):
+        client._handle_message(uamqp.Message(
+            body=b"a", annotations={b"x-opt-offset": str(i * 10).encode(), b"x-opt-sequence-number": i}))
+    client._handle_message(uamqp.Message(body=b"no position"))
+    assert len(handled) == 4
+    store.close()
+
+    resumed = FileCheckpointStore(path)
+    assert resumed.get("amqp://host/a") == {'offset': "20", 'sequence_number': 2}
+    client = ReceiveClient("amqp://host/a", auth=object(), checkpoint_store=resumed)
+    filters = []
+    client._remote_address.set_filter = filters.append
+    client._apply_checkpoint()
+    assert filters == [b"amqp.annotation.x-opt-offset > '20'"]
+
+    client = ReceiveClient("amqp://host/b", auth=object(), checkpoint_store=resumed)
+    client._remote_address.set_filter = filters.append
+    client._apply_checkpoint()
+    assert len(filters) == 1
+
+    resumed.update("amqp://host/b", sequence_number=5)
+    client._apply_checkpoint()
+    assert filters[-1] == b"amqp.annotation.x-opt-sequence-number > 5"
+
+
+def test_file_checkpoint_store_recovery(tmp_path, monkeypatch):
+    path = tmp_path / "checkpoints.json"
+    path.write_text('{"amqp://host/a": {"offset": "1')
+    store = FileCheckpointStore(str(path), write_interval=0, sync_interval=60)
+    assert store.get("amqp://host/a") is None
+
+    synced = []
+    monkeypatch.setattr(checkpoint.os, 'fsync', synced.append)
+    store.update("amqp://host/a", offset="10")
+    store.flush()
+    assert len(synced) == 1
+    assert FileCheckpointStore(str(path)).get("amqp://host/a") == {'offset': "10", 'sequence_number': None}
+    store.update("amqp://host/a", offset="20")
+    store.close()
+    assert len(synced) == 3
+
+
+def test_receive_columnar_batch_unpacked():
+    client = ReceiveClient("amqp://host/a", auth=object(), unpack_batches=True)
+    client.open = lambda connection=None: None
+    client._received_messages = client._create_receive_buffer()
+    inner = [
+        b'\x00\x53\x72\xc1\x1a\x02\xa3\x15x-opt-sequence-number\x54\x07' + codec.encode_data_section(b"first"),
+        bytes(codec.encode_data_section(b"sec") + codec.encode_data_section(b"ond")),
+        bytes(codec.encode_value_section(b"third"))]
+    batch = uamqp.Message(body=inner, msg_format=constants.BATCH_MESSAGE_FORMAT)
+    client._message_received(batch.get_message())
+    columns = client.receive_columnar_batch(max_batch_size=3)
+    assert [bytes(b) for b in columns[:]] == [b"first", b"second", b"third"]
+    assert list(columns.annotations[b"x-opt-sequence-number"]) == [7, -1, -1]
+
+    sequence = EncodedMessage(codec.encode_sequence_section([1, 2]))
+    with pytest.raises(TypeError):
+        ColumnarBatch.from_messages([sequence])
@@ -0,0 +1,66 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import collections
+import os
+import sys
+import pytest
+
+root_path = os.path.realpath('.')
+sys.path.append(root_path)
+
+import uamqp
+from uamqp.routing import PartitionRouter
+
+
+def _targets(count):
+    return ["amqps://host/partitions/{}".format(i) for i in range(count)]
+
+
+def test_partition_router_consistent():
+    router = PartitionRouter(_targets(8))
+    keys = ["key-{}".format(i) for i in range(2000)]
+    routed = {k: router.route(k) for k in keys}
+    same = PartitionRouter(_targets(8))
+    assert routed == {k: same.route(k) for k in keys}
+    assert router.route(b"key-1") == routed["key-1"]
+    counts = collections.Counter(routed.values())
+    assert len(counts) == 8
+    assert min(counts.values()) > 2000 / 8 / 2
+
+    grown = PartitionRouter(_targets(9))
+    moved = [k for k in keys if grown.route(k) != routed[k]]
+    assert all(grown.route(k) == _targets(9)[8] for k in moved)
+    assert len(moved) < 2000 / 9 * 2
+
+    hot = routed["key-1"]
+    router.set_weight(hot, 0.5)
+    reweighted = {k: router.route(k) for k in keys}
+    assert collections.Counter(reweighted.values())[hot] < counts[hot]
+    assert all(reweighted[k] == routed[k] for k in keys if routed[k] != hot)
+    with pytest.raises(ValueError):
+        router.set_weight("amqps://host/partitions/99", 1)
+
+
+def test_partition_router_availability():
+    targets = _targets(4)
+    router = PartitionRouter(targets)
+    target = router.route("key")
+    other = router.route("key", available=lambda t: t != target)
+    assert other != target
+    assert router.route("key", available=lambda t: False) == target
+    assert [router.route(None) for _ in range(5)] == targets + targets[:1]
+    assert router.route(None, available=lambda t: t == targets[2]) == targets[2]
+
+
+def test_partition_router_message_key():
+    router = PartitionRouter(_targets(4))
+    message = uamqp.Message(body="a", annotations={b"x-opt-partition-key": b"key"})
+    assert router.get_key(message) == b"key"
+    assert router.route_message(message) == router.route(b"key")
+    assert router.get_key(uamqp.Message(body="a")) is None
+    router = PartitionRouter(_targets(4), key=lambda m: "custom")
+    assert router.route_message(message) == router.route("custom")
@@ -0,0 +1,88 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import datetime
+import os
+import sys
+import pytest
+import uuid
+
+root_path = os.path.realpath('.')
+sys.path.append(root_path)
+
+from uamqp import c_uamqp
+from uamqp import codec
+from uamqp import types
+from uamqp.schema import Schema
+
+
+def test_schema_map_roundtrip():
+    schema = Schema([
+        ("id", int),
+        ("name", str),
+        ("kind", types.AMQPSymbol),
+        ("count", c_uamqp.AMQPType.UIntValue),
+        ("score", float),
+        ("payload", bytes),
+        ("enabled", bool),
+        ("created", datetime.datetime),
+        ("trace", uuid.UUID)])
+    value = {
+        "id": -5,
+        "name": "abc",
+        "kind": b"event",
+        "count": 300,
+        "score": 1.5,
+        "payload": b"\x00\x01",
+        "enabled": True,
+        "created": datetime.datetime(2018, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+        "trace": uuid.UUID(int=7)}
+    encoded = schema.encode(value)
+    assert encoded.type == c_uamqp.AMQPType.DictValue
+    assert codec.decode(codec.encode(encoded)) == value
+    assert schema.decode(encoded) == value
+    assert schema.decode(schema.message(value)) == value
+
+
+def test_schema_list_and_described():
+    schema = Schema({"id": types.AMQPuLong, "name": str}, descriptor=types.AMQPSymbol("com.example:row"), as_list=True)
+    encoded = schema.encode({"id": 1, "name": "a"})
+    assert encoded.type == c_uamqp.AMQPType.DescribedType
+    assert codec.encode(encoded) == b'\x00\xa3\x0fcom.example:row\xc0\x06\x02\x53\x01\xa1\x01a'
+    assert schema.decode(encoded) == {"id": 1, "name": "a"}
+    assert schema.decode(schema.message({"id": 1, "name": "a"})) == {"id": 1, "name": "a"}
+    with pytest.raises(ValueError):
+        schema.message({"id": 1, "name": "a"}, sequence=True)
+    other = Schema({"id": types.AMQPuLong, "name": str}, descriptor=types.AMQPSymbol("other"), as_list=True)
+    with pytest.raises(ValueError):
+        other.decode(encoded)
+
+
+def test_schema_sequence_body():
+    schema = Schema({"id": types.AMQPuLong, "name": str}, as_list=True)
+    message = schema.message({"id": 1, "name": "a"}, sequence=True)
+    assert message.get_message().body_type == c_uamqp.MessageBodyType.SequenceType
+    assert schema.decode(message) == {"id": 1, "name": "a"}
+
+
+def test_schema_validation():
+    schema = Schema({"id": c_uamqp.AMQPType.UByteValue, "name": str})
+    with pytest.raises(ValueError):
+        schema.encode({"id": 1})
+    with pytest.raises(TypeError):
+        schema.encode({"id": "1", "name": "a"})
+    with pytest.raises(TypeError):
+        schema.encode({"id": True, "name": "a"})
+    with pytest.raises(OverflowError):
+        schema.encode({"id": 256, "name": "a"})
+    with pytest.raises(TypeError):
+        schema.decode(Schema({"id": str, "name": str}).encode({"id": "1", "name": "a"}))
+    with pytest.raises(TypeError):
+        Schema({"id": list})
+    with pytest.raises(ValueError):
+        Schema([("id", int), ("id", str)])
+    with pytest.raises(ValueError):
+        schema.message({"id": 1, "name": "a"}, sequence=True)
@@ -6,14 +6,15 @@
 
 import logging
 import sys
+import threading
 
 from uamqp import c_uamqp
 from uamqp.message import Message, BatchMessage
 from uamqp.address import Source, Target
 
-from uamqp.connection import Connection
+from uamqp.connection import Connection, ConnectionPool
 from uamqp.session import Session
-from uamqp.client import AMQPClient, SendClient, ReceiveClient
+from uamqp.client import AMQPClient, SendClient, ReceiveClient, ClientCache, MultiTargetSendClient
 from uamqp.sender import MessageSender
 from uamqp.receiver import MessageReceiver
 
@@ -35,7 +36,7 @@ _is_win = sys.platform.startswith('win')
 c_uamqp.set_python_logger()
 
 
-def send_message(target, data, auth=None, debug=False):
+def send_message(target, data, auth=None, debug=False, client_cache=None):
     """Send a single message to AMQP endpoint.
 
     :param target: The target AMQP endpoint.
@@ -53,15 +54,56 @@ def send_message(target, data, auth=None, debug=False):
     :param debug: Whether to turn on network trace logs. If `True`, trace logs
      will be logged at INFO level. Default is `False`.
     :type debug: bool
+    :param client_cache: A cache of open clients to use rather than opening a new
+     client for this call. Default is `None`.
+    :type client_cache: ~uamqp.client.ClientCache
     :returns: None
     """
     message = data if isinstance(data, Message) else Message(body=data)
+    if client_cache is not None:
+        client_cache.send_message(target, message, auth=auth, debug=debug)
+        return
     with SendClient(target, auth=auth, debug=debug) as send_client:
         send_client.queue_message(message)
         send_client.send_all_messages()
 
 
-def receive_message(source, auth=None, timeout=0, debug=False):
+def send_messages(target, messages, auth=None, debug=False, max_pending=300, client_cache=None):
+    """Send the messages from an iterable to an AMQP endpoint over a single Link.
+    Messages are taken from the iterable as they are needed to keep up to `max_pending`
+    messages in flight, so the iterable can be a generator of any length.
+
+    :param target: The target AMQP endpoint.
+    :type target: str, bytes or ~uamqp.Target
+    :param messages: The messages to send. Each item can be a ~uamqp.Message,
+     a ~uamqp.BatchMessage, or the contents of a new message.
+    :type messages: iterable
+    :param auth: The authentication credentials for the endpoint.
+     This should be one of the subclasses of ~uamqp.AMQPAuth. Currently
+     this includes:
+        ~uamqp.authentication.SASLAnonymous
+        ~uamqp.authentication.SASLPlain
+        ~uamqp.authentication.SASTokenAuth
+     If no authentication is supplied, SASLAnnoymous will be used by default.
+    :type auth: ~uamqp.AMQPAuth
+    :param debug: Whether to turn on network trace logs. If `True`, trace logs
+     will be logged at INFO level. Default is `False`.
+    :type debug: bool
+    :param max_pending: The maximum number of messages waiting to be sent or
+     acknowledged at once. Default is 300.
+    :type max_pending: int
+    :param client_cache: A cache of open clients to use rather than opening a new
+     client for this call. Default is `None`.
+    :type client_cache: ~uamqp.client.ClientCache
+    :returns: list[~uamqp.constants.MessageState]
+    """
+    if client_cache is not None:
+        return client_cache.send_messages(target, messages, auth=auth, debug=debug, max_pending=max_pending)
+    with SendClient(target, auth=auth, debug=debug) as send_client:
+        return send_client.stream_messages(messages, max_pending=max_pending)
+
+
+def receive_message(source, auth=None, timeout=0, debug=False, client_cache=None):
     """Receive a single message from an AMQP endpoint.
 
     :param source: The AMQP source endpoint to receive from.
@@ -80,15 +122,19 @@ def receive_message(source, auth=None, timeout=0, debug=False):
     :param debug: Whether to turn on network trace logs. If `True`, trace logs
      will be logged at INFO level. Default is `False`.
     :type debug: bool
+    :param client_cache: A cache of open clients to use rather than opening a new
+     client for this call. Default is `None`.
+    :type client_cache: ~uamqp.client.ClientCache
     :returns: ~uamqp.Message or None
     """
-    received = receive_messages(source, auth=auth, max_batch_size=1, timeout=timeout, debug=debug)
+    received = receive_messages(
+        source, auth=auth, max_batch_size=1, timeout=timeout, debug=debug, client_cache=client_cache)
     if received:
         return received[0]
     return None
 
 
-def receive_messages(source, auth=None, max_batch_size=None, timeout=0, debug=False, **kwargs):
+def receive_messages(source, auth=None, max_batch_size=None, timeout=0, debug=False, client_cache=None, **kwargs):
     """Receive a batch of messages from an AMQP endpoint.
 
     :param source: The AMQP source endpoint to receive from.
@@ -111,8 +157,14 @@ def receive_messages(source, auth=None, max_batch_size=None, timeout=0, debug=Fa
     :param debug: Whether to turn on network trace logs. If `True`, trace logs
      will be logged at INFO level. Default is `False`.
     :type debug: bool
+    :param client_cache: A cache of open clients to use rather than opening a new
+     client for this call. Default is `None`.
+    :type client_cache: ~uamqp.client.ClientCache
     :returns: list[~uamqp.Message]
     """
+    if client_cache is not None:
+        return client_cache.receive_messages(
+            source, auth=auth, max_batch_size=max_batch_size, timeout=timeout, debug=debug, **kwargs)
     if max_batch_size:
         kwargs['prefetch'] = max_batch_size
     with ReceiveClient(source, auth=auth, debug=debug, **kwargs) as receive_client:
@@ -123,12 +175,16 @@ def receive_messages(source, auth=None, max_batch_size=None, timeout=0, debug=Fa
 class _Platform:
     """Runs any platform preparatory steps for the AMQP C
     library. This is primarily used for OpenSSL setup.
+    The platform is initialized by the first Connection and then
+    kept for the lifetime of the process, unless it is explicitly
+    shut down with ~uamqp.shutdown_platform.
 
     :ivar initialized: When the setup has completed.
     :vartype initialized: bool
     """
 
     initialized = False
+    _lock = threading.Lock()
 
     @classmethod
     def initialize(cls):
@@ -136,23 +192,37 @@ class _Platform:
         making AMQP requests. This only needs to happen once.
         """
         if cls.initialized:
-            _logger.debug("Platform already initialized.")
-        else:
-            _logger.debug("Initializing platform.")
-            c_uamqp.platform_init()
-            cls.initialized = True
+            return
+        with cls._lock:
+            if cls.initialized:
+                _logger.debug("Platform already initialized.")
+            else:
+                _logger.debug("Initializing platform.")
+                c_uamqp.platform_init()
+                cls.initialized = True
 
     @classmethod
     def deinitialize(cls):
-        """Deinitialize the TLS/SSL platform to prepare it for
-        making AMQP requests. This only needs to happen once.
+        """Deinitialize the TLS/SSL platform. This should only be
+        done once no Connections remain open.
         """
-        if not cls.initialized:
-            _logger.debug("Platform already deinitialized.")
-        else:
-            cls.initialized = False
-            _logger.debug("Deinitializing platform.")
-            c_uamqp.platform_deinit()
+        with cls._lock:
+            if not cls.initialized:
+                _logger.debug("Platform already deinitialized.")
+            else:
+                cls.initialized = False
+                _logger.debug("Deinitializing platform.")
+                c_uamqp.platform_deinit()
+
+
+def shutdown_platform():
+    """Deinitialize the TLS/SSL platform used by all Connections. The platform
+    is otherwise kept initialized for the lifetime of the process, so that opening
+    and closing Connections does not repeat the platform setup. This should only
+    be called once all Connections have been closed, and the platform will be
+    initialized again by the next Connection.
+    """
+    _Platform.deinitialize()
 
 
 def get_platform_info():
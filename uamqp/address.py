@@ -52,7 +52,7 @@ class Address:
 
     @property
     def address(self):
-        return self._address.address.decode(self._encoding)
+        return self._c_address.value.decode(self._encoding)
 
     @property
     def durable(self):
@@ -163,5 +163,8 @@ class SASTokenAsync(authentication.SASTokenAuth, CBSAsyncAuthMixin):
     :param encoding: The encoding to use if hostname is provided as a str.
      Default is 'UTF-8'.
     :type encoding: str
+    :param tls_session_resumption: Whether the TLS layer will resume a cached TLS session.
+     Default is `True`.
+    :type tls_session_resumption: bool
     """
     pass
@@ -9,10 +9,11 @@
 
 import asyncio
 import collections.abc
+import functools
 import logging
 import uuid
-import queue
 
+import uamqp
 from uamqp import client
 from uamqp import constants
 from uamqp import errors
@@ -63,6 +64,23 @@ class AMQPClientAsync(client.AMQPClient):
     :type outgoing_window: int
     :param handle_max: The maximum number of concurrent link handles.
     :type handle_max: int
+    :param auto_reconnect: Whether to re-establish the Connection, authentication and Links
+     of the client if the Connection is lost or a Link fails. The client waits for an
+     exponential backoff with jitter between attempts. Default is `False`.
+    :type auto_reconnect: bool
+    :param reconnect_backoff: The base delay in seconds between reconnect attempts,
+     which is doubled on each consecutive attempt. Default is 1 second.
+    :type reconnect_backoff: float
+    :param reconnect_backoff_max: The maximum delay in seconds between reconnect
+     attempts. Default is 30 seconds.
+    :type reconnect_backoff_max: float
+    :param max_reconnect_attempts: The number of consecutive reconnect attempts after
+     which the error will be raised. Default is 10.
+    :type max_reconnect_attempts: int
+    :param connection_pool: A pool from which to acquire a shared Connection when the client
+     is opened without an explicit Connection. The Connection will be returned to the pool
+     when the client is closed.
+    :type connection_pool: ~uamqp.connection.ConnectionPool
     :param encoding: The encoding to use for parameters supplied as strings.
      Default is 'UTF-8'
     :type encoding: str
@@ -100,21 +118,29 @@ class AMQPClientAsync(client.AMQPClient):
         # pylint: disable=protected-access
         if self._session:
             return  # already open
+        settings = {
+            'container_id': self._name,
+            'max_frame_size': self._max_frame_size,
+            'channel_max': self._channel_max,
+            'idle_timeout': self._idle_timeout,
+            'properties': self._properties,
+            'remote_idle_timeout_empty_frame_send_ratio': self._remote_idle_timeout_empty_frame_send_ratio,
+            'debug': self._debug_trace,
+            'loop': self.loop}
+        if not connection and self._connection_pool is not None:
+            _logger.debug("Acquiring pooled connection.")
+            connection = self._connection_pool.acquire(
+                self._hostname, self._auth, connection_type=self.connection_type, **settings)
+            self._pooled_connection = True
         if connection:
             _logger.debug("Using existing connection.")
-            self._auth = connection.auth
+            if connection.auth is not self._auth:
+                # The CBS Session belongs to the authentication of the Connection. A pooled
+                # Connection is only shared between clients with the same credentials.
+                _logger.debug("Using the authentication of the existing connection.")
+                self._auth = connection.auth
             self._ext_connection = True
-        self._connection = connection or self.connection_type(
-            self._hostname,
-            self._auth,
-            container_id=self._name,
-            max_frame_size=self._max_frame_size,
-            channel_max=self._channel_max,
-            idle_timeout=self._idle_timeout,
-            properties=self._properties,
-            remote_idle_timeout_empty_frame_send_ratio=self._remote_idle_timeout_empty_frame_send_ratio,
-            debug=self._debug_trace,
-            loop=self.loop)
+        self._connection = connection or self.connection_type(self._hostname, self._auth, **settings)
         if not self._connection.cbs and isinstance(self._auth, CBSAsyncAuthMixin):
             self._connection.cbs = await self._auth.create_authenticator_async(
                 self._connection,
@@ -150,12 +176,39 @@ class AMQPClientAsync(client.AMQPClient):
             else:
                 _logger.debug("Not closing CBS session.")
             self._session = None
-            if not self._ext_connection:
+            if self._pooled_connection:
+                _logger.debug("Releasing pooled connection.")
+                self._connection_pool.release(self._connection)
+                self._pooled_connection = False
+                self._ext_connection = False
+            elif not self._ext_connection:
                 _logger.debug("Closing unshared connection.")
                 await self._connection.destroy_async()
             else:
                 _logger.debug("Shared connection remaining open.")
             self._connection = None
+            self._ready = False
+
+    async def warm_up_async(self, timeout=0):
+        """Open the client asynchronously and run it until the Connection is open,
+        CBS authentication has completed and the Link is attached, so that the first
+        message sent or received does not wait for the handshakes. This function will
+        open the client if it is not already open.
+
+        :param timeout: A timeout in milliseconds within which the client must be ready.
+         If set to 0, the client will wait until it is ready. The default is 0.
+        :type timeout: int
+        :raises: TimeoutError if the client is not ready within the timeout.
+        :raises: ~uamqp.errors.AMQPConnectionError if the client shut down before it was ready.
+        """
+        self._prepare_warm_up()
+        await self.open_async()
+        expires_at = self._counter.get_current_ms() + timeout if timeout else 0
+        while not self._warmed_up():
+            if expires_at and self._counter.get_current_ms() > expires_at:
+                raise TimeoutError("Client was not ready within {}ms.".format(timeout))
+            if not await self.do_work_async():
+                raise errors.AMQPConnectionError("Client shut down before it was ready.")
 
     async def mgmt_request_async(self, message, operation, op_type=None, node=None, **kwargs):
         """Run an asynchronous request/response operation. These are frequently used
@@ -209,14 +262,50 @@ class AMQPClientAsync(client.AMQPClient):
             **kwargs)
         return response
 
+    async def _close_links_async(self):
+        """Destroy the Links of the client asynchronously ahead of reconnecting,
+        keeping any state needed to resume on the new Links.
+        """
+
+    async def _reconnect_async(self, error):
+        """Close the Connection and re-open the client asynchronously after a
+        backoff delay. The Session, CBS authentication and Links will be
+        re-established by the following connection iterations.
+
+        :param error: The error that caused the client to reconnect.
+        :type error: Exception
+        :returns: bool
+        :raises: The error if the client cannot reconnect.
+        """
+        delay = self._reconnect_delay(error)
+        await self._close_links_async()
+        await AMQPClientAsync.close_async(self)
+        await asyncio.sleep(delay)
+        await self.open_async()
+        return True
+
     async def do_work_async(self):
         """Run a single connection iteration asynchronously.
         This will return `True` if the connection is still open
         and ready to be used for further work, or `False` if it needs
-        to be shut down.
+        to be shut down. If `auto_reconnect` is set, a lost Connection
+        or failed Link will be re-established.
 
         :returns: bool
         :raises: TimeoutError if CBS authentication timeout reached.
+        :raises: ~uamqp.errors.AMQPConnectionError if the Connection or a Link failed
+         and could not be re-established.
+        """
+        if self._auto_reconnect and self._connection_lost():
+            return await self._reconnect_async(errors.AMQPConnectionError("Connection lost."))
+        try:
+            return await self._do_work_async()
+        except (errors.AMQPConnectionError, TimeoutError) as exp:
+            return await self._reconnect_async(exp)
+
+    async def _do_work_async(self):
+        """Run a single connection iteration asynchronously.
+        :returns: bool
         """
         timeout = False
         auth_in_progress = False
@@ -234,6 +323,8 @@ class AMQPClientAsync(client.AMQPClient):
             await self._connection.work_async()
             return True
         else:
+            self._reconnect_attempts = 0
+            self._ready = True
             return await self._client_run()
 
 
@@ -289,6 +380,23 @@ class SendClientAsync(client.SendClient, AMQPClientAsync):
     :type outgoing_window: int
     :param handle_max: The maximum number of concurrent link handles.
     :type handle_max: int
+    :param auto_reconnect: Whether to re-establish the Connection, authentication and Links
+     of the client if the Connection is lost or a Link fails. The client waits for an
+     exponential backoff with jitter between attempts. Default is `False`.
+    :type auto_reconnect: bool
+    :param reconnect_backoff: The base delay in seconds between reconnect attempts,
+     which is doubled on each consecutive attempt. Default is 1 second.
+    :type reconnect_backoff: float
+    :param reconnect_backoff_max: The maximum delay in seconds between reconnect
+     attempts. Default is 30 seconds.
+    :type reconnect_backoff_max: float
+    :param max_reconnect_attempts: The number of consecutive reconnect attempts after
+     which the error will be raised. Default is 10.
+    :type max_reconnect_attempts: int
+    :param connection_pool: A pool from which to acquire a shared Connection when the client
+     is opened without an explicit Connection. The Connection will be returned to the pool
+     when the client is closed.
+    :type connection_pool: ~uamqp.connection.ConnectionPool
     :param encoding: The encoding to use for parameters supplied as strings.
      Default is 'UTF-8'
     :type encoding: str
@@ -363,6 +471,17 @@ class SendClientAsync(client.SendClient, AMQPClientAsync):
         await self._connection.work_async()
         return True
 
+    async def _close_links_async(self):
+        """Destroy the MessageSender asynchronously ahead of reconnecting. Messages
+        that were awaiting acknowledgement will be sent again on the new Link.
+        """
+        # pylint: disable=protected-access
+        if self._message_sender:
+            unacked_messages = client._detach_unacked_messages(self._pending_messages)
+            await self._message_sender.destroy_async()
+            self._message_sender = None
+            client._requeue_unacked_messages(unacked_messages)
+
     async def close_async(self):
         """Close down the client asynchronously. No further
         messages can be sent and the client cannot be re-opened.
@@ -474,6 +593,35 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
      messages the Link will attempt to handle per connection iteration.
      The default is 300.
     :type prefetch: int
+    :param raw_bodies: Whether to receive only the body data of each message. If `True`,
+     the Data sections of each received message will be extracted in C and returned
+     (or passed to the `on_message_received` callback) as bytes, without creating a
+     ~uamqp.Message. Messages with a Sequence or Value body
+     will still be returned as ~uamqp.Message. The default is `False`.
+    :type raw_bodies: bool
+    :param concurrency: The number of threads on which to run the `on_message_received`
+     callback when receiving messages continuously. If set, messages will be handed to
+     the callback without waiting for the previous callback to complete, and completion will
+     be tracked in the order in which the messages were received. Messages are accepted on
+     receipt, so the callback cannot reject them in this mode. The default is `None`, in which case
+     the callback is run inline.
+    :type concurrency: int
+    :param ordering_key: A callable that takes a received message and returns a hashable
+     key. Where `concurrency` is set, messages with the same key will be handled one at a time
+     in the order in which they were received. Messages with different keys may be handled in
+     parallel.
+    :type ordering_key: callable[~uamqp.Message]
+    :param checkpoint_store: A store in which to record the offset and sequence number of
+     the last message handed to the application. When the client is opened, if the store
+     holds a checkpoint for the source, a selector filter will be set on the source so that
+     receiving resumes after that message. See ~uamqp.checkpoint.FileCheckpointStore.
+    :type checkpoint_store: ~uamqp.checkpoint.CheckpointStore
+    :param unpack_batches: Whether to unpack messages received with the batch message
+     format. If `True`, each message encoded within a batched message will be returned
+     (or passed to the `on_message_received` callback) as a ~uamqp.message.EncodedMessage,
+     which is decoded lazily from the received data. The default is `False`, in which case
+     the batched message is returned as a single ~uamqp.Message.
+    :type unpack_batches: bool
     :param max_frame_size: Maximum AMQP frame size. Default is 63488 bytes.
     :type max_frame_size: int
     :param channel_max: Maximum number of Session channels in the Connection.
@@ -493,6 +641,23 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
     :type outgoing_window: int
     :param handle_max: The maximum number of concurrent link handles.
     :type handle_max: int
+    :param auto_reconnect: Whether to re-establish the Connection, authentication and Links
+     of the client if the Connection is lost or a Link fails. The client waits for an
+     exponential backoff with jitter between attempts. Default is `False`.
+    :type auto_reconnect: bool
+    :param reconnect_backoff: The base delay in seconds between reconnect attempts,
+     which is doubled on each consecutive attempt. Default is 1 second.
+    :type reconnect_backoff: float
+    :param reconnect_backoff_max: The maximum delay in seconds between reconnect
+     attempts. Default is 30 seconds.
+    :type reconnect_backoff_max: float
+    :param max_reconnect_attempts: The number of consecutive reconnect attempts after
+     which the error will be raised. Default is 10.
+    :type max_reconnect_attempts: int
+    :param connection_pool: A pool from which to acquire a shared Connection when the client
+     is opened without an explicit Connection. The Connection will be returned to the pool
+     when the client is closed.
+    :type connection_pool: ~uamqp.connection.ConnectionPool
     :param encoding: The encoding to use for parameters supplied as strings.
      Default is 'UTF-8'
     :type encoding: str
@@ -506,6 +671,14 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
         # AMQP object settings
         self.receiver_type = MessageReceiverAsync
 
+    def _create_receive_buffer(self):  # pylint: disable=no-self-use
+        """Create the buffer in which received messages will be held
+        until they are returned to the caller. The asynchronous Connection is
+        pumped in an executor thread, so the buffer must be thread-safe.
+        :returns: ~uamqp.client._ReceiveBuffer
+        """
+        return client._ReceiveBuffer(thread_safe=True)  # pylint: disable=protected-access
+
     async def _client_ready(self):
         """Determine whether the client is ready to start receiving messages.
         To be ready, the connection must be open and authentication complete,
@@ -517,6 +690,7 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
         """
         # pylint: disable=protected-access
         if not self._message_receiver:
+            self._apply_checkpoint()
             self._message_receiver = self.receiver_type(
                 self._session, self._remote_address, self._name,
                 on_message_received=self,
@@ -526,6 +700,7 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
                 prefetch=self._prefetch,
                 max_message_size=self._max_message_size,
                 properties=self._link_properties,
+                raw_bodies=self._raw_bodies,
                 encoding=self._encoding,
                 loop=self.loop)
             await self._message_receiver.open_async()
@@ -547,6 +722,8 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
         :returns: bool
         """
         await self._connection.work_async()
+        if self._checkpoint_store:
+            self._checkpoint_store.flush()
         if self._timeout > 0:
             now = self._counter.get_current_ms()
             if self._last_activity_timestamp and not self._was_message_received:
@@ -570,14 +747,21 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
         """
         await self.open_async()
         self._message_received_callback = on_message_received
+        if self._concurrency:
+            self._handler_pool = client._HandlerPool(  # pylint: disable=protected-access
+                on_message_received, self._concurrency, self._prefetch, ordering_key=self._ordering_key)
         receiving = True
         try:
             while receiving:
                 receiving = await self.do_work_async()
+                if self._handler_pool is not None:
+                    self._handler_pool_completed(self._handler_pool.collect())
         except:
             receiving = False
             raise
         finally:
+            await self.loop.run_in_executor(
+                None, functools.partial(self._close_handler_pool, raise_errors=receiving))
             if not receiving:
                 await self.close_async()
 
@@ -612,34 +796,57 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
                 'connection prefetch: {}'.format(max_batch_size, self._prefetch))
         timeout = self._counter.get_current_ms() + int(timeout) if timeout else 0
         expired = False
-        self._received_messages = self._received_messages or queue.Queue()
+        if self._received_messages is None:
+            self._received_messages = self._create_receive_buffer()
         await self.open_async()
         receiving = True
-        batch = []
-        while not self._received_messages.empty() and len(batch) < max_batch_size:
-            batch.append(self._received_messages.get())
-            self._received_messages.task_done()
+        batch = self._received_messages.drain(max_batch_size)
         if len(batch) >= max_batch_size:
             return batch
 
         while receiving and not expired and len(batch) < max_batch_size:
-            while receiving and self._received_messages.qsize() < max_batch_size:
+            while receiving and len(self._received_messages) < max_batch_size:
                 if timeout > 0 and self._counter.get_current_ms() > timeout:
                     expired = True
                     break
-                before = self._received_messages.qsize()
+                before = len(self._received_messages)
                 receiving = await self.do_work_async()
-                received = self._received_messages.qsize() - before
-                if self._received_messages.qsize() > 0 and received == 0:
+                received = len(self._received_messages) - before
+                if self._received_messages and received == 0:
                     # No new messages arrived, but we have some - so return what we have.
                     expired = True
                     break
 
-            while not self._received_messages.empty() and len(batch) < max_batch_size:
-                batch.append(self._received_messages.get())
-                self._received_messages.task_done()
+            batch.extend(self._received_messages.drain(max_batch_size - len(batch)))
+        if batch:
+            self._record_checkpoint(batch[-1])
         return batch
 
+    async def receive_columnar_batch_async(self, max_batch_size=None, annotations=None, timeout=0):
+        """Receive a batch of messages in columnar form asynchronously. The bodies of the
+        messages will be returned in a single contiguous buffer with an array of offsets, and
+        the requested message annotations will be returned as typed arrays. Messages returned
+        in the batch have already been accepted. This method will return as soon as some
+        messages are available rather than waiting to achieve a specific batch size.
+
+        :param max_batch_size: The maximum number of messages that can be returned in
+         one call. This value cannot be larger than the prefetch value, and if not specified,
+         the prefetch value will be used.
+        :type max_batch_size: int
+        :param annotations: The message annotations to extract, mapped to the `array` type
+         code in which they will be stored. The default extracts `x-opt-sequence-number`,
+         `x-opt-offset` and `x-opt-enqueued-time` as signed 64-bit integers.
+        :type annotations: dict[bytes, str]
+        :param timeout: A timeout in milliseconds for which to wait to receive any messages.
+         If no messages are received in this time, an empty batch will be returned. If set to
+         0, the client will continue to wait until at least one message is received. The
+         default is 0.
+        :type timeout: int
+        :returns: ~uamqp.message.ColumnarBatch
+        """
+        batch = await self.receive_message_batch_async(max_batch_size=max_batch_size, timeout=timeout)
+        return uamqp.message.ColumnarBatch.from_messages(batch, annotations=annotations, encoding=self._encoding)
+
     def receive_messages_iter_async(self, on_message_received=None):
         """Receive messages by asynchronous generator. Messages returned in the
         generator have already been accepted - if you wish to add logic to accept
@@ -653,17 +860,30 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
         :type on_message_received: callable[~uamqp.Message]
         """
         self._message_received_callback = on_message_received
-        self._received_messages = queue.Queue()
+        if self._received_messages is None:
+            self._received_messages = self._create_receive_buffer()
         return AsyncMessageIter(self)
 
+    async def _close_links_async(self):
+        """Destroy the MessageReceiver asynchronously ahead of reconnecting. Messages
+        that have been received but not yet returned are kept, and the new Link will
+        resume after the last message received.
+        """
+        if self._message_receiver:
+            await self._message_receiver.destroy_async()
+            self._message_receiver = None
+
     async def close_async(self):
         if self._message_receiver:
             await self._message_receiver.destroy_async()
             self._message_receiver = None
+        if self._checkpoint_store:
+            self._checkpoint_store.flush(force=True)
         await super(ReceiveClientAsync, self).close_async()
         self._shutdown = False
         self._last_activity_timestamp = None
         self._was_message_received = False
+        self._last_position = None
 
 
 class AsyncMessageIter(collections.abc.AsyncIterator):
@@ -680,11 +900,11 @@ class AsyncMessageIter(collections.abc.AsyncIterator):
         # pylint: disable=protected-access
         await self._client.open_async()
         try:
-            while self.receiving and self._client._received_messages.empty():
+            while self.receiving and not self._client._received_messages:
                 self.receiving = await self._client.do_work_async()
-            if not self._client._received_messages.empty():
+            if self._client._received_messages:
                 message = self._client._received_messages.get()
-                self._client._received_messages.task_done()
+                self._client._record_checkpoint(message)
                 return message
             else:
                 raise StopAsyncIteration("Message receive closing.")
@@ -104,3 +104,4 @@ class ConnectionAsync(connection.Connection):
         if self.cbs:
             await self.auth.close_authenticator_async()
         await self.loop.run_in_executor(None, functools.partial(self._conn.destroy))
+        self._stop_trace()
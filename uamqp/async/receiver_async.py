@@ -57,6 +57,12 @@ class MessageReceiverAsync(receiver.MessageReceiver):
     :type encoding: str
     :param loop: A user specified event loop.
     :type loop: ~asycnio.AbstractEventLoop
+    :param raw_bodies: Whether to deliver only the body bytes of received messages
+     rather than a full message. If `True`, the data sections of each message will
+     be extracted in C and passed to `on_message_received._raw_message_received` as bytes.
+     Messages with a Sequence or Value body will still be delivered as messages. Default
+     is `False`.
+    :type raw_bodies: bool
     """
 
     def __init__(self, session, source, target,
@@ -68,7 +74,8 @@ class MessageReceiverAsync(receiver.MessageReceiver):
                  properties=None,
                  debug=False,
                  encoding='UTF-8',
-                 loop=None):
+                 loop=None,
+                 raw_bodies=False):
         self.loop = loop or asyncio.get_event_loop()
         super(MessageReceiverAsync, self).__init__(
             session, source, target,
@@ -79,7 +86,8 @@ class MessageReceiverAsync(receiver.MessageReceiver):
             prefetch=prefetch,
             properties=properties,
             debug=debug,
-            encoding=encoding)
+            encoding=encoding,
+            raw_bodies=raw_bodies)
 
     async def __aenter__(self):
         """Open the MessageReceiver in an async context manager."""
@@ -103,7 +111,8 @@ class MessageReceiverAsync(receiver.MessageReceiver):
          or the credentials are rejected.
         """
         try:
-            await self.loop.run_in_executor(None, functools.partial(self._receiver.open, self.on_message_received))
+            await self.loop.run_in_executor(None, functools.partial(
+                self._receiver.open, self.on_message_received, self.raw_bodies))
         except ValueError:
             raise errors.AMQPConnectionError(
                 "Failed to open Message Receiver. "
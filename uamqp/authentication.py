@@ -7,6 +7,7 @@
 # pylint: disable=super-init-not-called,no-self-use
 
 import logging
+import os
 import time
 import datetime
 import threading
@@ -24,6 +25,29 @@ from uamqp import c_uamqp
 
 
 _logger = logging.getLogger(__name__)
+_trusted_certs = {}
+_trusted_certs_lock = threading.Lock()
+
+
+def _read_trusted_certs(path):
+    """Read a CA certificate bundle, from a process-wide cache keyed by path that
+    is refreshed if the modified time or size of the file changes.
+
+    :param path: The path of the certificate bundle.
+    :type path: str
+    :returns: bytes
+    """
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _trusted_certs_lock:
+        cached = _trusted_certs.get(path)
+    if cached and cached[0] == version:
+        return cached[1]
+    with open(path, 'rb') as cert_handle:
+        cert_data = cert_handle.read()
+    with _trusted_certs_lock:
+        _trusted_certs[path] = (version, cert_data)
+    return cert_data
 
 
 class TokenRetryPolicy:
@@ -56,12 +80,21 @@ class AMQPAuth:
     :param encoding: The encoding to use if hostname is provided as a str.
      Default is 'UTF-8'.
     :type encoding: str
+    :param tls_session_resumption: Whether the TLS layer will resume a session cached from
+     a previous connection to the same host and port with the same certificates, rather
+     than doing a full handshake. This is supported by the OpenSSL TLS layer. Default is `True`.
+    :type tls_session_resumption: bool
     """
 
-    def __init__(self, hostname, port=constants.DEFAULT_AMQPS_PORT, verify=None, encoding='UTF-8'):
+    tls_session_resumption = True
+    _layers_used = False
+
+    def __init__(self, hostname, port=constants.DEFAULT_AMQPS_PORT, verify=None, encoding='UTF-8',
+                 tls_session_resumption=True):
         self._encoding = encoding
         self.hostname = hostname.encode(self._encoding) if isinstance(hostname, str) else hostname
         self.cert_file = verify
+        self.tls_session_resumption = tls_session_resumption
         self.sasl = _SASL()
         self.set_tlsio(self.hostname, port)
 
@@ -74,6 +107,7 @@ class AMQPAuth:
         :param port: The TLS port.
         :type port: int
         """
+        self.port = int(port)
         _default_tlsio = c_uamqp.get_default_tlsio()
         _tlsio_config = c_uamqp.TLSIOConfig()
         _tlsio_config.hostname = hostname
@@ -81,18 +115,32 @@ class AMQPAuth:
         self._underlying_xio = c_uamqp.xio_from_tlsioconfig(_default_tlsio, _tlsio_config)
 
         cert = self.cert_file or certifi.where()
-        with open(cert, 'rb') as cert_handle:
-            cert_data = cert_handle.read()
-            self._underlying_xio.set_certificates(cert_data)
+        self._underlying_xio.set_certificates(_read_trusted_certs(cert))
+        if self.tls_session_resumption:
+            try:
+                self._underlying_xio.set_session_resumption(True)
+            except ValueError:
+                _logger.debug("TLS session resumption is not supported by the TLS layer.")
         self.sasl_client = _SASLClient(self._underlying_xio, self.sasl)
 
+    def _take_layers(self):
+        """Claim the TLS and SASL layers for a new Connection. Each Connection
+        needs its own layers, which are closed with the Connection, so if the current
+        layers have already been claimed new layers will be created.
+
+        :returns: ~uamqp.authentication._SASLClient
+        """
+        if self._layers_used:
+            self.sasl.mechanism = self.sasl._get_mechanism()  # pylint: disable=protected-access
+            self.set_tlsio(self.hostname, self.port)
+        self._layers_used = True
+        return self.sasl_client
+
     def close(self):
         """Close the authentication layer and cleanup
         all the authentication wrapper objects.
         """
-        self.sasl.mechanism.destroy()
-        self.sasl_client.get_client().destroy()
-        self._underlying_xio.destroy()
+        self.sasl_client.close()
 
 
 class SASLPlain(AMQPAuth):
@@ -112,14 +160,19 @@ class SASLPlain(AMQPAuth):
     :param encoding: The encoding to use if hostname and credentials
      are provided as a str. Default is 'UTF-8'.
     :type encoding: str
+    :param tls_session_resumption: Whether the TLS layer will resume a cached TLS session.
+     Default is `True`.
+    :type tls_session_resumption: bool
     """
 
-    def __init__(self, hostname, username, password, port=constants.DEFAULT_AMQPS_PORT, verify=None, encoding='UTF-8'):
+    def __init__(self, hostname, username, password, port=constants.DEFAULT_AMQPS_PORT, verify=None, encoding='UTF-8',
+                 tls_session_resumption=True):
         self._encoding = encoding
         self.hostname = hostname.encode(self._encoding) if isinstance(hostname, str) else hostname
         self.username = username.encode(self._encoding) if isinstance(username, str) else username
         self.password = password.encode(self._encoding) if isinstance(password, str) else password
         self.cert_file = verify
+        self.tls_session_resumption = tls_session_resumption
         self.sasl = _SASLPlain(self.username, self.password, encoding=self._encoding)
         self.set_tlsio(self.hostname, port)
 
@@ -139,12 +192,17 @@ class SASLAnonymous(AMQPAuth):
     :param encoding: The encoding to use if hostname is provided as a str.
      Default is 'UTF-8'.
     :type encoding: str
+    :param tls_session_resumption: Whether the TLS layer will resume a cached TLS session.
+     Default is `True`.
+    :type tls_session_resumption: bool
     """
 
-    def __init__(self, hostname, port=constants.DEFAULT_AMQPS_PORT, verify=None, encoding='UTF-8'):
+    def __init__(self, hostname, port=constants.DEFAULT_AMQPS_PORT, verify=None, encoding='UTF-8',
+                 tls_session_resumption=True):
         self._encoding = encoding
         self.hostname = hostname.encode(self._encoding) if isinstance(hostname, str) else hostname
         self.cert_file = verify
+        self.tls_session_resumption = tls_session_resumption
         self.sasl = _SASLAnonymous()
         self.set_tlsio(self.hostname, port)
 
@@ -173,6 +231,7 @@ class CBSAuthMixin:
         :returns: ~uamqp.c_uamqp.CBSTokenAuth
         """
         self._lock = threading.Lock()
+        self.retries = 0
         self._session = Session(
             connection,
             incoming_window=constants.MAX_FRAME_SIZE_BYTES,
@@ -294,6 +353,9 @@ class SASTokenAuth(AMQPAuth, CBSAuthMixin):
     :param encoding: The encoding to use if hostname is provided as a str.
      Default is 'UTF-8'.
     :type encoding: str
+    :param tls_session_resumption: Whether the TLS layer will resume a cached TLS session.
+     Default is `True`.
+    :type tls_session_resumption: bool
     """
 
     def __init__(self, audience, uri, token,
@@ -306,13 +368,15 @@ class SASTokenAuth(AMQPAuth, CBSAuthMixin):
                  retry_policy=TokenRetryPolicy(),
                  verify=None,
                  token_type=b"servicebus.windows.net:sastoken",
-                 encoding='UTF-8'):  # pylint: disable=no-member
+                 encoding='UTF-8',
+                 tls_session_resumption=True):  # pylint: disable=no-member
         self._retry_policy = retry_policy
         self._encoding = encoding
         self.uri = uri
         parsed = urllib_parse.urlparse(uri)  # pylint: disable=no-member
 
         self.cert_file = verify
+        self.tls_session_resumption = tls_session_resumption
         self.hostname = parsed.hostname.encode(self._encoding)
         self.username = urllib_parse.unquote_plus(parsed.username) if parsed.username else None  # pylint: disable=no-member
         self.password = urllib_parse.unquote_plus(parsed.password) if parsed.password else None  # pylint: disable=no-member
@@ -364,7 +428,8 @@ class SASTokenAuth(AMQPAuth, CBSAuthMixin):
             timeout=10,
             retry_policy=TokenRetryPolicy(),
             verify=None,
-            encoding='UTF-8'):
+            encoding='UTF-8',
+            tls_session_resumption=True):
         """Attempt to create a CBS token session using a Shared Access Key such
         as is used to connect to Azure services.
 
@@ -391,6 +456,9 @@ class SASTokenAuth(AMQPAuth, CBSAuthMixin):
         :param encoding: The encoding to use if hostname is provided as a str.
         Default is 'UTF-8'.
         :type encoding: str
+        :param tls_session_resumption: Whether the TLS layer will resume a cached TLS session.
+        Default is `True`.
+        :type tls_session_resumption: bool
         """
         expires_in = datetime.timedelta(seconds=expiry or constants.AUTH_EXPIRATION_SECS)
         encoded_uri = urllib_parse.quote_plus(uri).encode(encoding)  # pylint: disable=no-member
@@ -411,7 +479,8 @@ class SASTokenAuth(AMQPAuth, CBSAuthMixin):
             timeout=timeout,
             retry_policy=retry_policy,
             verify=verify,
-            encoding=encoding)
+            encoding=encoding,
+            tls_session_resumption=tls_session_resumption)
 
 
 class _SASLClient:
@@ -427,6 +496,11 @@ class _SASLClient:
     def get_client(self):
         return self._xio
 
+    def close(self):
+        self._sasl_mechanism.destroy()
+        self._xio.destroy()
+        self._tls_io.destroy()
+
 
 class _SASL:
 
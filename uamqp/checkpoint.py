@@ -0,0 +1,207 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+
+_logger = logging.getLogger(__name__)
+
+
+def selector_filter(checkpoint):
+    """Build the selector filter expression that will resume receiving
+    after a checkpointed position. The offset is preferred over the sequence
+    number where both are available.
+
+    :param checkpoint: The checkpointed position.
+    :type checkpoint: dict
+    :returns: bytes or None
+    """
+    if checkpoint.get('offset') is not None:
+        return "amqp.annotation.x-opt-offset > '{}'".format(checkpoint['offset']).encode('UTF-8')
+    if checkpoint.get('sequence_number') is not None:
+        return "amqp.annotation.x-opt-sequence-number > {}".format(
+            int(checkpoint['sequence_number'])).encode('UTF-8')
+    return None
+
+
+class CheckpointStore:
+    """Stores the last processed position for each receive source.
+    This base store keeps checkpoints in memory only, and subclasses persist
+    them by implementing `_persist`. Updates are cheap and are only written
+    out when the store is flushed, so many updates between flushes will result
+    in a single write.
+
+    :param write_interval: The minimum time in seconds between writes
+     to storage. Updates within this interval will be coalesced into a single
+     write. The default is 1 second.
+    :type write_interval: float
+    :param sync_interval: The minimum time in seconds between writes that are
+     synced to disk. Writes in between will be left to the OS to flush. Checkpoints
+     are always synced when the store is closed. The default is 10 seconds.
+    :type sync_interval: float
+    """
+
+    def __init__(self, write_interval=1.0, sync_interval=10.0):
+        self.write_interval = write_interval
+        self.sync_interval = sync_interval
+        self._checkpoints = {}
+        self._dirty = False
+        self._last_write = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        """Use the store in a context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Flush and close the store when exiting a context manager."""
+        self.close()
+
+    def _persist(self, checkpoints, sync):
+        """Write all checkpoints to storage.
+
+        :param checkpoints: The checkpoints keyed by source.
+        :type checkpoints: dict[str, dict]
+        :param sync: Whether the write must be synced to disk.
+        :type sync: bool
+        """
+
+    def get(self, source):
+        """Get the checkpointed position for a source.
+
+        :param source: The source address.
+        :type source: str
+        :returns: dict or None
+        """
+        with self._lock:
+            checkpoint = self._checkpoints.get(source)
+            return dict(checkpoint) if checkpoint else None
+
+    def update(self, source, offset=None, sequence_number=None):
+        """Record the position of the last processed message from a source.
+
+        :param source: The source address.
+        :type source: str
+        :param offset: The offset of the message.
+        :type offset: str
+        :param sequence_number: The sequence number of the message.
+        :type sequence_number: int
+        """
+        with self._lock:
+            self._checkpoints[source] = {'offset': offset, 'sequence_number': sequence_number}
+            self._dirty = True
+
+    def flush(self, force=False):
+        """Write any updated checkpoints to storage. Unless forced, this will
+        only write if the write interval has passed since the last write.
+
+        :param force: Whether to write and sync regardless of the configured intervals.
+        :type force: bool
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not self._dirty:
+                return
+            if not force and now - self._last_write < self.write_interval:
+                return
+            sync = force or now - self._last_sync >= self.sync_interval
+            self._persist(dict(self._checkpoints), sync)
+            self._dirty = False
+            self._last_write = now
+            if sync:
+                self._last_sync = now
+
+    def close(self):
+        """Flush and sync any outstanding checkpoints."""
+        self.flush(force=True)
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Persists checkpoints to a local JSON file. Each write is synced to
+    a temporary file which then atomically replaces the checkpoint file, so it
+    will always contain a complete set of checkpoints. A checkpoint file that
+    can not be read is ignored, and receiving will start without checkpoints.
+
+    :param path: The path of the checkpoint file.
+    :type path: str
+    :param write_interval: The minimum time in seconds between writes
+     to storage. The default is 1 second.
+    :type write_interval: float
+    :param sync_interval: The minimum time in seconds between writes whose
+     replacement of the checkpoint file is synced to disk. The default is 10 seconds.
+    :type sync_interval: float
+    """
+
+    def __init__(self, path, write_interval=1.0, sync_interval=10.0):
+        super(FileCheckpointStore, self).__init__(write_interval=write_interval, sync_interval=sync_interval)
+        self.path = path
+        try:
+            with open(path, 'r') as checkpoint_file:
+                self._checkpoints = json.load(checkpoint_file)
+        except FileNotFoundError:
+            _logger.debug("No checkpoint file found at {}.".format(path))
+        except ValueError as exp:
+            _logger.warning("Ignoring unreadable checkpoint file at {}: {}".format(path, exp))
+
+    def _persist(self, checkpoints, sync):
+        # The new file is always synced before it replaces the old one, so that a crash
+        # can not leave a truncated file. A synced write also syncs the directory, which
+        # makes the replacement itself durable.
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as checkpoint_file:
+            json.dump(checkpoints, checkpoint_file)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temp_path, self.path)
+        if sync and os.name != 'nt':
+            directory = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Persists checkpoints to a local SQLite database.
+
+    :param path: The path of the database file.
+    :type path: str
+    :param write_interval: The minimum time in seconds between writes
+     to storage. The default is 1 second.
+    :type write_interval: float
+    :param sync_interval: The minimum time in seconds between writes that are
+     synced to disk. The default is 10 seconds.
+    :type sync_interval: float
+    """
+
+    def __init__(self, path, write_interval=1.0, sync_interval=10.0):
+        super(SQLiteCheckpointStore, self).__init__(write_interval=write_interval, sync_interval=sync_interval)
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints "
+            "(source TEXT PRIMARY KEY, offset TEXT, sequence_number INTEGER)")
+        for source, offset, sequence_number in self._db.execute(
+                "SELECT source, offset, sequence_number FROM checkpoints"):
+            self._checkpoints[source] = {'offset': offset, 'sequence_number': sequence_number}
+
+    def _persist(self, checkpoints, sync):
+        self._db.execute("PRAGMA synchronous = {}".format("FULL" if sync else "OFF"))
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO checkpoints (source, offset, sequence_number) VALUES (?, ?, ?)",
+                [(s, c['offset'], c['sequence_number']) for s, c in checkpoints.items()])
+
+    def close(self):
+        """Flush and sync any outstanding checkpoints and close the database."""
+        super(SQLiteCheckpointStore, self).close()
+        self._db.close()
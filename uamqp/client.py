@@ -4,9 +4,13 @@
 # license information.
 #--------------------------------------------------------------------------
 
+import collections
+import concurrent.futures
 import logging
+import random
+import threading
+import time
 import uuid
-import queue
 try:
     from urllib import unquote_plus
 except ImportError:
@@ -14,6 +18,7 @@ except ImportError:
 
 import uamqp
 from uamqp import authentication
+from uamqp import checkpoint
 from uamqp import constants
 from uamqp import sender
 from uamqp import receiver
@@ -21,12 +26,217 @@ from uamqp import address
 from uamqp import errors
 from uamqp import c_uamqp
 from uamqp import Connection
+from uamqp import ConnectionPool
 from uamqp import Session
 
 
 _logger = logging.getLogger(__name__)
 
 
+class _ReceiveBuffer:
+    """A FIFO buffer of received messages waiting to be handed out
+    to the caller. This is backed by a deque, whose appends and pops are
+    atomic, so messages can be added from one thread while they are taken
+    from another. Draining will only take a lock if the buffer is going to
+    be accessed by more than one thread, for example when the Connection is
+    being pumped from an executor, so that concurrent drains do not interleave.
+
+    :param thread_safe: Whether to guard the buffer with a lock.
+     Default is `False`.
+    :type thread_safe: bool
+    """
+
+    def __init__(self, thread_safe=False):
+        self._messages = collections.deque()
+        self._lock = threading.Lock() if thread_safe else None
+
+    def __len__(self):
+        return len(self._messages)
+
+    def put(self, message):
+        """Add a message to the end of the buffer.
+
+        :param message: The received message.
+        :type message: ~uamqp.Message
+        """
+        self._messages.append(message)
+
+    def get(self):
+        """Remove and return the message at the front of the buffer.
+
+        :returns: ~uamqp.Message
+        :raises: IndexError if the buffer is empty.
+        """
+        return self._messages.popleft()
+
+    def drain(self, max_count=None):
+        """Remove and return up to `max_count` messages from the front
+        of the buffer in a single call. If `max_count` is not specified,
+        all the buffered messages will be returned.
+
+        :param max_count: The maximum number of messages to return.
+        :type max_count: int
+        :returns: list[~uamqp.Message]
+        """
+        if self._lock:
+            with self._lock:
+                return self._drain(max_count)
+        return self._drain(max_count)
+
+    def _drain(self, max_count):
+        # Only the messages counted here are removed, so a message added
+        # by another thread while draining is left in the buffer.
+        messages = self._messages
+        count = len(messages) if max_count is None else min(max_count, len(messages))
+        popleft = messages.popleft
+        return [popleft() for _ in range(count)]
+
+
+class _HandlerPool:
+    """Runs message handlers on a bounded thread pool so that slow handlers
+    do not stall the Connection. Completion of the handlers is tracked in
+    delivery order, and where an ordering key is supplied, handlers for messages
+    with the same key are run one at a time in the order they were received.
+
+    :param handler: The message handler.
+    :type handler: callable[~uamqp.Message]
+    :param concurrency: The maximum number of handlers to run at once.
+    :type concurrency: int
+    :param max_pending: The maximum number of messages that can be waiting
+     for their handler to complete. Once this is reached, submitting a new message
+     will block until the oldest handler has completed.
+    :type max_pending: int
+    :param ordering_key: A callable that returns the ordering key of a message.
+    :type ordering_key: callable[~uamqp.Message]
+    """
+
+    def __init__(self, handler, concurrency, max_pending, ordering_key=None):
+        self._handler = handler
+        self._max_pending = max(max_pending, concurrency)
+        self._ordering_key = ordering_key
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=concurrency)
+        self._pending = collections.deque()
+        self._last_by_key = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _run(self, message, previous):
+        if previous is not None:
+            # Messages that share an ordering key are handled in sequence.
+            concurrent.futures.wait([previous])
+        return self._handler(message)
+
+    def submit(self, message):
+        """Dispatch a received message to the pool.
+
+        :param message: The received message.
+        :type message: ~uamqp.Message
+        """
+        if len(self._pending) >= self._max_pending:
+            concurrent.futures.wait([self._pending[0][2]])
+        key = self._ordering_key(message) if self._ordering_key else None
+        previous = self._last_by_key.get(key) if key is not None else None
+        future = self._executor.submit(self._run, message, previous)
+        if key is not None:
+            self._last_by_key[key] = future
+        self._pending.append((message, key, future))
+
+    def collect(self):
+        """Collect the messages whose handlers have completed, in the order in
+        which they were received. A message is only returned once all the messages
+        received before it have also completed.
+
+        :returns: list[~uamqp.Message]
+        :raises: The exception raised by a handler, in delivery order.
+        """
+        completed = []
+        while self._pending and self._pending[0][2].done():
+            message, key, future = self._pending.popleft()
+            if key is not None and self._last_by_key.get(key) is future:
+                del self._last_by_key[key]
+            future.result()
+            completed.append(message)
+        return completed
+
+    def close(self):
+        """Wait for all running handlers to complete and shut down
+        the pool.
+        """
+        self._executor.shutdown(wait=True)
+
+
+def _send_pending_messages(message_sender, pending_messages, counter, msg_timeout):
+    """Send the messages that are waiting to be sent on an open MessageSender,
+    and remove any messages that have completed from the pending list.
+
+    :param message_sender: The open MessageSender.
+    :type message_sender: ~uamqp.sender.MessageSender
+    :param pending_messages: The pending messages for the MessageSender.
+    :type pending_messages: list[~uamqp.Message]
+    :param counter: The tick counter with which message idle times were recorded.
+    :type counter: ~uamqp.c_uamqp.TickCounter
+    :param msg_timeout: The message send timeout in seconds, or 0.
+    :type msg_timeout: int
+    """
+    # pylint: disable=protected-access
+    for message in pending_messages[:]:
+        if message.state in [constants.MessageState.Complete, constants.MessageState.Failed]:
+            try:
+                pending_messages.remove(message)
+            except ValueError:
+                pass
+        elif message.state == constants.MessageState.WaitingToBeSent:
+            message.state = constants.MessageState.WaitingForAck
+            try:
+                current_time = counter.get_current_ms()
+                elapsed_time = (current_time - message.idle_time)/1000
+                if msg_timeout > 0 and elapsed_time > msg_timeout:
+                    message._on_message_sent(constants.MessageSendResult.Timeout)
+                else:
+                    timeout = msg_timeout - elapsed_time if msg_timeout > 0 else 0
+                    message_sender.send_async(message, timeout=timeout)
+            except Exception as exp:  # pylint: disable=broad-except
+                message._on_message_sent(constants.MessageSendResult.Error, error=exp)
+
+
+def _detach_unacked_messages(pending_messages):
+    """Take a snapshot of the messages that have been sent on a Link
+    but not yet acknowledged, along with their retry counts. The messages
+    will ignore any send results until they are requeued, so that the Link
+    being destroyed can not fail them or run their `on_send_complete` callback.
+
+    :param pending_messages: The pending messages of the Link.
+    :type pending_messages: list[~uamqp.Message]
+    :returns: list[tuple]
+    """
+    # pylint: disable=protected-access
+    unacked_messages = [(m, m._retries) for m in pending_messages if m.state == constants.MessageState.WaitingForAck]
+    for message, _ in unacked_messages:
+        message._link_detaching = True
+    return unacked_messages
+
+
+def _requeue_unacked_messages(unacked_messages):
+    """Return messages that were awaiting acknowledgement when their Link was
+    destroyed to the send queue, so that they will be sent again on the next Link.
+    The failure of the destroyed Link does not count against the message retries.
+
+    :param unacked_messages: The snapshot taken with `_detach_unacked_messages`.
+    :type unacked_messages: list[tuple]
+    """
+    # pylint: disable=protected-access
+    for message, retries in unacked_messages:
+        message._link_detaching = False
+        if message.state not in constants.DONE_STATES:
+            message._retries = retries
+            message.state = constants.MessageState.WaitingToBeSent
+
+
+def _decode_hostname(hostname, encoding):
+    return hostname.decode(encoding) if isinstance(hostname, bytes) else hostname
+
+
 class AMQPClient:
     """An AMQP client.
 
@@ -61,6 +271,23 @@ class AMQPClient:
     :type outgoing_window: int
     :param handle_max: The maximum number of concurrent link handles.
     :type handle_max: int
+    :param auto_reconnect: Whether to re-establish the Connection, authentication and Links
+     of the client if the Connection is lost or a Link fails. The client waits for an
+     exponential backoff with jitter between attempts. Default is `False`.
+    :type auto_reconnect: bool
+    :param reconnect_backoff: The base delay in seconds between reconnect attempts,
+     which is doubled on each consecutive attempt. Default is 1 second.
+    :type reconnect_backoff: float
+    :param reconnect_backoff_max: The maximum delay in seconds between reconnect
+     attempts. Default is 30 seconds.
+    :type reconnect_backoff_max: float
+    :param max_reconnect_attempts: The number of consecutive reconnect attempts after
+     which the error will be raised. Default is 10.
+    :type max_reconnect_attempts: int
+    :param connection_pool: A pool from which to acquire a shared Connection when the client
+     is opened without an explicit Connection. The Connection will be returned to the pool
+     when the client is closed.
+    :type connection_pool: ~uamqp.connection.ConnectionPool
     :param encoding: The encoding to use for parameters supplied as strings.
      Default is 'UTF-8'
     :type encoding: str
@@ -85,9 +312,19 @@ class AMQPClient:
         self._shutdown = False
         self._connection = None
         self._ext_connection = False
+        self._connection_pool = kwargs.pop('connection_pool', None)
+        self._pooled_connection = False
         self._session = None
         self._encoding = kwargs.pop('encoding', None) or 'UTF-8'
 
+        # Reconnect settings
+        self._auto_reconnect = kwargs.pop('auto_reconnect', False)
+        self._reconnect_backoff = kwargs.pop('reconnect_backoff', None) or 1.0
+        self._reconnect_backoff_max = kwargs.pop('reconnect_backoff_max', None) or 30
+        self._max_reconnect_attempts = kwargs.pop('max_reconnect_attempts', None) or 10
+        self._reconnect_attempts = 0
+        self._ready = False
+
         # Connection settings
         self._max_frame_size = kwargs.pop('max_frame_size', None) or constants.MAX_FRAME_SIZE_BYTES
         self._channel_max = kwargs.pop('channel_max', None)
@@ -144,21 +381,29 @@ class AMQPClient:
         if self._session:
             return  # already open.
         _logger.debug("Opening client connection.")
+        settings = {
+            'container_id': self._name,
+            'max_frame_size': self._max_frame_size,
+            'channel_max': self._channel_max,
+            'idle_timeout': self._idle_timeout,
+            'properties': self._properties,
+            'remote_idle_timeout_empty_frame_send_ratio': self._remote_idle_timeout_empty_frame_send_ratio,
+            'debug': self._debug_trace,
+            'encoding': self._encoding}
+        if not connection and self._connection_pool is not None:
+            _logger.debug("Acquiring pooled connection.")
+            connection = self._connection_pool.acquire(
+                self._hostname, self._auth, connection_type=self.connection_type, **settings)
+            self._pooled_connection = True
         if connection:
             _logger.debug("Using existing connection.")
-            self._auth = connection.auth
+            if connection.auth is not self._auth:
+                # The CBS Session belongs to the authentication of the Connection. A pooled
+                # Connection is only shared between clients with the same credentials.
+                _logger.debug("Using the authentication of the existing connection.")
+                self._auth = connection.auth
             self._ext_connection = True
-        self._connection = connection or self.connection_type(
-            self._hostname,
-            self._auth,
-            container_id=self._name,
-            max_frame_size=self._max_frame_size,
-            channel_max=self._channel_max,
-            idle_timeout=self._idle_timeout,
-            properties=self._properties,
-            remote_idle_timeout_empty_frame_send_ratio=self._remote_idle_timeout_empty_frame_send_ratio,
-            debug=self._debug_trace,
-            encoding=self._encoding)
+        self._connection = connection or self.connection_type(self._hostname, self._auth, **settings)
         if not self._connection.cbs and isinstance(self._auth, authentication.CBSAuthMixin):
             self._connection.cbs = self._auth.create_authenticator(
                 self._connection,
@@ -192,12 +437,52 @@ class AMQPClient:
             else:
                 _logger.debug("Not closing CBS session.")
             self._session = None
-            if not self._ext_connection:
+            if self._pooled_connection:
+                _logger.debug("Releasing pooled connection.")
+                self._connection_pool.release(self._connection)
+                self._pooled_connection = False
+                self._ext_connection = False
+            elif not self._ext_connection:
                 _logger.debug("Closing unshared connection.")
                 self._connection.destroy()
             else:
                 _logger.debug("Shared connection remaining open.")
             self._connection = None
+            self._ready = False
+
+    def _prepare_warm_up(self):
+        """Prepare the client to handle any messages that arrive while it
+        is being warmed up, before the application has asked for them.
+        """
+
+    def _warmed_up(self):
+        """Whether the Connection is open, CBS authentication has completed and
+        the client is ready to send or receive messages.
+        :returns: bool
+        """
+        # pylint: disable=protected-access
+        return self._ready and self._connection._state == c_uamqp.ConnectionState.OPENED
+
+    def warm_up(self, timeout=0):
+        """Open the client and run it until the Connection is open, CBS authentication
+        has completed and the Link is attached, so that the first message sent or
+        received does not wait for the handshakes. This function will open the client
+        if it is not already open.
+
+        :param timeout: A timeout in milliseconds within which the client must be ready.
+         If set to 0, the client will wait until it is ready. The default is 0.
+        :type timeout: int
+        :raises: TimeoutError if the client is not ready within the timeout.
+        :raises: ~uamqp.errors.AMQPConnectionError if the client shut down before it was ready.
+        """
+        self._prepare_warm_up()
+        self.open()
+        expires_at = self._counter.get_current_ms() + timeout if timeout else 0
+        while not self._warmed_up():
+            if expires_at and self._counter.get_current_ms() > expires_at:
+                raise TimeoutError("Client was not ready within {}ms.".format(timeout))
+            if not self.do_work():
+                raise errors.AMQPConnectionError("Client shut down before it was ready.")
 
     def mgmt_request(self, message, operation, op_type=None, node=None, **kwargs):
         """Run a request/response operation. These are frequently used for management
@@ -252,14 +537,80 @@ class AMQPClient:
             **kwargs)
         return response
 
+    def _connection_lost(self):
+        """Whether the Connection has been closed or has failed.
+        :returns: bool
+        """
+        return self._connection._state in ConnectionPool._unhealthy_states  # pylint: disable=protected-access
+
+    def _reconnect_delay(self, error):
+        """Count a reconnect attempt and get the delay before it is made. The delay
+        grows exponentially with consecutive attempts, with jitter so that many clients
+        losing the same Connection do not reconnect at once.
+
+        :param error: The error that caused the client to reconnect.
+        :type error: Exception
+        :returns: float
+        :raises: The error if the client cannot reconnect.
+        """
+        if not self._auto_reconnect or self._shutdown:
+            raise error
+        if self._ext_connection and not self._pooled_connection:
+            raise error
+        if self._reconnect_attempts >= self._max_reconnect_attempts:
+            _logger.error("Reconnect attempts exhausted ({}).".format(self._max_reconnect_attempts))
+            raise error
+        self._reconnect_attempts += 1
+        delay = min(self._reconnect_backoff_max, self._reconnect_backoff * 2 ** (self._reconnect_attempts - 1))
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        _logger.info("Connection to {} lost ({}), reconnecting in {:.2f} seconds. Attempt {} of {}.".format(
+            self._hostname, error, delay, self._reconnect_attempts, self._max_reconnect_attempts))
+        return delay
+
+    def _close_links(self):
+        """Destroy the Links of the client ahead of reconnecting, keeping
+        any state needed to resume on the new Links.
+        """
+
+    def _reconnect(self, error):
+        """Close the Connection and re-open the client after a backoff delay.
+        The Session, CBS authentication and Links will be re-established by
+        the following connection iterations.
+
+        :param error: The error that caused the client to reconnect.
+        :type error: Exception
+        :returns: bool
+        :raises: The error if the client cannot reconnect.
+        """
+        delay = self._reconnect_delay(error)
+        self._close_links()
+        AMQPClient.close(self)
+        time.sleep(delay)
+        self.open()
+        return True
+
     def do_work(self):
         """Run a single connection iteration.
         This will return `True` if the connection is still open
         and ready to be used for further work, or `False` if it needs
-        to be shut down.
+        to be shut down. If `auto_reconnect` is set, a lost Connection
+        or failed Link will be re-established.
 
         :returns: bool
         :raises: TimeoutError if CBS authentication timeout reached.
+        :raises: ~uamqp.errors.AMQPConnectionError if the Connection or a Link failed
+         and could not be re-established.
+        """
+        if self._auto_reconnect and self._connection_lost():
+            return self._reconnect(errors.AMQPConnectionError("Connection lost."))
+        try:
+            return self._do_work()
+        except (errors.AMQPConnectionError, TimeoutError) as exp:
+            return self._reconnect(exp)
+
+    def _do_work(self):
+        """Run a single connection iteration.
+        :returns: bool
         """
         timeout = False
         auth_in_progress = False
@@ -276,6 +627,8 @@ class AMQPClient:
             self._connection.work()
             return True
         else:
+            self._reconnect_attempts = 0
+            self._ready = True
             result = self._client_run()
             return result
 
@@ -330,6 +683,23 @@ class SendClient(AMQPClient):
     :type outgoing_window: int
     :param handle_max: The maximum number of concurrent link handles.
     :type handle_max: int
+    :param auto_reconnect: Whether to re-establish the Connection, authentication and Links
+     of the client if the Connection is lost or a Link fails. The client waits for an
+     exponential backoff with jitter between attempts. Default is `False`.
+    :type auto_reconnect: bool
+    :param reconnect_backoff: The base delay in seconds between reconnect attempts,
+     which is doubled on each consecutive attempt. Default is 1 second.
+    :type reconnect_backoff: float
+    :param reconnect_backoff_max: The maximum delay in seconds between reconnect
+     attempts. Default is 30 seconds.
+    :type reconnect_backoff_max: float
+    :param max_reconnect_attempts: The number of consecutive reconnect attempts after
+     which the error will be raised. Default is 10.
+    :type max_reconnect_attempts: int
+    :param connection_pool: A pool from which to acquire a shared Connection when the client
+     is opened without an explicit Connection. The Connection will be returned to the pool
+     when the client is closed.
+    :type connection_pool: ~uamqp.connection.ConnectionPool
     :param encoding: The encoding to use for parameters supplied as strings.
      Default is 'UTF-8'
     :type encoding: str
@@ -391,28 +761,20 @@ class SendClient(AMQPClient):
         further work.
         :returns: bool
         """
-        # pylint: disable=protected-access
-        for message in self._pending_messages[:]:
-            if message.state in [constants.MessageState.Complete, constants.MessageState.Failed]:
-                try:
-                    self._pending_messages.remove(message)
-                except ValueError:
-                    pass
-            elif message.state == constants.MessageState.WaitingToBeSent:
-                message.state = constants.MessageState.WaitingForAck
-                try:
-                    current_time = self._counter.get_current_ms()
-                    elapsed_time = (current_time - message.idle_time)/1000
-                    if self._msg_timeout > 0 and elapsed_time > self._msg_timeout:
-                        message._on_message_sent(constants.MessageSendResult.Timeout)
-                    else:
-                        timeout = self._msg_timeout - elapsed_time if self._msg_timeout > 0 else 0
-                        self._message_sender.send_async(message, timeout=timeout)
-                except Exception as exp:  # pylint: disable=broad-except
-                    message._on_message_sent(constants.MessageSendResult.Error, error=exp)
+        _send_pending_messages(self._message_sender, self._pending_messages, self._counter, self._msg_timeout)
         self._connection.work()
         return True
 
+    def _close_links(self):
+        """Destroy the MessageSender ahead of reconnecting. Messages that were
+        awaiting acknowledgement will be sent again on the new Link.
+        """
+        if self._message_sender:
+            unacked_messages = _detach_unacked_messages(self._pending_messages)
+            self._message_sender.destroy()
+            self._message_sender = None
+            _requeue_unacked_messages(unacked_messages)
+
     def close(self):
         """Close down the client. No further messages
         can be sent and the client cannot be re-opened.
@@ -511,6 +873,400 @@ class SendClient(AMQPClient):
             if close_on_done:
                 self.close()
 
+    def stream_messages(self, messages, max_pending=300, close_on_done=True):
+        """Send the messages from an iterable over the client's single Link. Messages
+        are taken from the iterable as they are needed to keep up to `max_pending`
+        messages in flight, so the iterable can be a generator of any length.
+        This function will open the client if it is not already open.
+
+        :param messages: The messages to send. Each item can be a ~uamqp.Message,
+         a ~uamqp.BatchMessage, or the body data of a new message.
+        :type messages: iterable
+        :param max_pending: The maximum number of messages waiting to be sent or
+         acknowledged at once. Default is 300.
+        :type max_pending: int
+        :param close_on_done: Close the client once the messages are sent.
+         Default is `True`.
+        :type close_on_done: bool
+        :returns: list[~uamqp.constants.MessageState]
+        """
+        self.open()
+        results = []
+        in_flight = collections.deque()
+        try:
+            for data in messages:
+                message = data if isinstance(data, uamqp.Message) else uamqp.Message(body=data)
+                for gathered in message.gather():
+                    gathered.idle_time = self._counter.get_current_ms()
+                    self._pending_messages.append(gathered)
+                    in_flight.append(gathered)
+                while len(self._pending_messages) >= max_pending:
+                    self.do_work()
+                while in_flight and in_flight[0].state in constants.DONE_STATES:
+                    results.append(in_flight.popleft().state)
+            self.wait()
+            results.extend(m.state for m in in_flight)
+            return results
+        finally:
+            if close_on_done:
+                self.close()
+
+
+class _TargetLink:
+    """A sender Link to one target of a ~uamqp.client.MultiTargetSendClient,
+    along with the messages waiting to be sent on it.
+    """
+
+    def __init__(self, target):
+        self.target = target
+        self.sender = None
+        self.pending = []
+        self.failed = False
+        self.failures = 0
+        self.retry_at = 0
+
+
+class MultiTargetSendClient(AMQPClient):
+    """An AMQP client for sending messages to many targets on the same host.
+    The client opens a single Connection and Session, and a sender Link is attached
+    to each target the first time a message is queued for it. All the Links are
+    driven by the same connection loop, and the number of messages waiting to be
+    sent or acknowledged is limited across all targets.
+
+    :param remote_address: The AMQP endpoint of the host. Targets must be on the same host.
+    :type remote_address: str, bytes or ~uamqp.address.Address
+    :param auth: Authentication for the connection. If none is provided SASL Annoymous
+     authentication will be used.
+    :type auth: ~uamqp.authentication.AMQPAuth
+    :param client_name: The name for the client, also known as the Container ID.
+     If no name is provided, a random GUID will be used.
+    :type client_name: str or bytes
+    :param debug: Whether to turn on network trace logs. If `True`, trace logs
+     will be logged at INFO level. Default is `False`.
+    :type debug: bool
+    :param msg_timeout: A timeout in seconds for messages from when they have been
+     added to the send queue to when the message is actually sent. This prevents potentially
+     expired data from being sent. If set to 0, messages will not expire. Default is 0.
+    :type msg_timeout: int
+    :param max_pending: The maximum number of messages, across all targets, that can be
+     waiting to be sent or acknowledged. Once this is reached, queuing a message will open
+     the client and run it until messages complete. Default is 300.
+    :type max_pending: int
+    :param router: A router with which to choose the target of messages that are
+     queued without one, based on their partition key.
+    :type router: ~uamqp.routing.PartitionRouter
+    :param max_link_pending: The number of messages waiting on a single target at
+     which the router will consider its Link throttled and route new messages to
+     another target. By default Links are not considered throttled.
+    :type max_link_pending: int
+    :param send_settle_mode: The mode by which to settle message send
+     operations. If set to `Unsettled`, the client will wait for a confirmation
+     from the service that the message was successfully sent. If set to 'Settled',
+     the client will not wait for confirmation and assume success.
+    :type send_settle_mode: ~uamqp.constants.SenderSettleMode
+    :param max_message_size: The maximum allowed message size negotiated for each Link.
+    :type max_message_size: int
+    :param link_properties: Data to be sent in the ATTACH frame of each Link.
+    :type link_properties: dict
+    :param link_credit: The sender Link credit that determines how many
+     messages each Link will attempt to handle per connection iteration.
+    :type link_credit: int
+    :param max_frame_size: Maximum AMQP frame size. Default is 63488 bytes.
+    :type max_frame_size: int
+    :param channel_max: Maximum number of Session channels in the Connection.
+    :type channel_max: int
+    :param idle_timeout: Timeout in milliseconds after which the Connection will close
+     if there is no further activity.
+    :type idle_timeout: int
+    :param properties: Connection properties.
+    :type properties: dict
+    :param remote_idle_timeout_empty_frame_send_ratio: Ratio of empty frames to
+     idle time for Connections with no activity. Value must be between
+     0.0 and 1.0 inclusive. Default is 0.5.
+    :type remote_idle_timeout_empty_frame_send_ratio: float
+    :param incoming_window: The size of the allowed window for incoming messages.
+    :type incoming_window: int
+    :param outgoing_window: The size of the allowed window for outgoing messages.
+    :type outgoing_window: int
+    :param handle_max: The maximum number of concurrent link handles. This must
+     allow for a Link per target.
+    :type handle_max: int
+    :param auto_reconnect: Whether to re-establish the Connection, authentication and Links
+     of the client if the Connection is lost or a Link fails. The client waits for an
+     exponential backoff with jitter between attempts. Default is `False`.
+    :type auto_reconnect: bool
+    :param reconnect_backoff: The base delay in seconds between reconnect attempts,
+     which is doubled on each consecutive attempt. The Link of a target that failed to
+     open is attached again after the same backoff. Default is 1 second.
+    :type reconnect_backoff: float
+    :param reconnect_backoff_max: The maximum delay in seconds between reconnect
+     attempts. Default is 30 seconds.
+    :type reconnect_backoff_max: float
+    :param max_reconnect_attempts: The number of consecutive reconnect attempts after
+     which the error will be raised. Default is 10.
+    :type max_reconnect_attempts: int
+    :param connection_pool: A pool from which to acquire a shared Connection when the client
+     is opened without an explicit Connection. The Connection will be returned to the pool
+     when the client is closed.
+    :type connection_pool: ~uamqp.connection.ConnectionPool
+    :param encoding: The encoding to use for parameters supplied as strings.
+     Default is 'UTF-8'
+    :type encoding: str
+    """
+
+    def __init__(self, remote_address, auth=None, client_name=None, debug=False, msg_timeout=0, **kwargs):
+        self._msg_timeout = msg_timeout
+        self._max_pending = kwargs.pop('max_pending', None) or 300
+        self._router = kwargs.pop('router', None)
+        self._max_link_pending = kwargs.pop('max_link_pending', None)
+        self._links = {}
+
+        # Sender and Link settings
+        self._send_settle_mode = kwargs.pop('send_settle_mode', None) or constants.SenderSettleMode.Unsettled
+        self._max_message_size = kwargs.pop('max_message_size', None) or constants.MAX_MESSAGE_LENGTH_BYTES
+        self._link_properties = kwargs.pop('link_properties', None)
+        self._link_credit = kwargs.pop('link_credit', None)
+
+        # AMQP object settings
+        self.sender_type = sender.MessageSender
+
+        super(MultiTargetSendClient, self).__init__(
+            remote_address, auth=auth, client_name=client_name, debug=debug, **kwargs)
+
+    def _get_link(self, target):
+        """Get the Link for a target, creating it if this is the first
+        message for the target. The Link will be attached when the client
+        next runs.
+
+        :param target: The target address.
+        :type target: str, bytes or ~uamqp.Target
+        :returns: ~uamqp.client._TargetLink
+        :raises: ValueError if the target is not on the host of the client.
+        """
+        try:
+            return self._links[target]
+        except KeyError:
+            pass
+        target_address = target if isinstance(target, address.Address) else address.Target(target)
+        hostname = target_address.parsed_address.hostname
+        if _decode_hostname(hostname, self._encoding) != _decode_hostname(self._hostname, self._encoding):
+            raise ValueError("Target {} is not on host {}.".format(target_address, self._hostname))
+        link = _TargetLink(target_address)
+        self._links[target] = link
+        return link
+
+    def _open_sender(self, link):
+        """Create and open the MessageSender for a target Link.
+
+        :param link: The target Link.
+        :type link: ~uamqp.client._TargetLink
+        """
+        link.sender = self.sender_type(
+            self._session, self._name, link.target,
+            name='sender-link-{}'.format(uuid.uuid4()),
+            debug=self._debug_trace,
+            send_settle_mode=self._send_settle_mode,
+            max_message_size=self._max_message_size,
+            link_credit=self._link_credit,
+            properties=self._link_properties,
+            encoding=self._encoding)
+        link.sender.open()
+
+    def _fail_link(self, link):
+        """Fail all the pending messages of a target whose Link could not be
+        opened, and destroy the Link. The Link will be attached again for the
+        next message queued to the target, or once the reconnect backoff has passed
+        so that the router can resume sending to the target.
+
+        :param link: The target Link.
+        :type link: ~uamqp.client._TargetLink
+        """
+        # pylint: disable=protected-access
+        error = errors.AMQPConnectionError(
+            "Message Sender for target {} was unable to open. "
+            "Please confirm credentials and access permissions."
+            "\nSee debug trace for more details.".format(link.target))
+        for message in link.pending:
+            if message.state not in constants.DONE_STATES:
+                message._on_message_sent(constants.MessageSendResult.Error, error=error)
+        link.pending = []
+        link.sender.destroy()
+        link.sender = None
+        link.failed = True
+        link.failures += 1
+        delay = min(self._reconnect_backoff_max, self._reconnect_backoff * 2 ** (link.failures - 1))
+        link.retry_at = time.monotonic() + delay / 2 + random.uniform(0, delay / 2)
+
+    def _client_run(self):
+        """Attach a Link for any target with pending messages, and send
+        the pending messages of every open Link in a single connection iteration.
+        :returns: bool
+        """
+        # pylint: disable=protected-access
+        now = time.monotonic()
+        for link in self._links.values():
+            if not link.pending and not (link.failed and now >= link.retry_at):
+                continue
+            if not link.sender:
+                self._open_sender(link)
+            elif link.sender._state == constants.MessageSenderState.Error:
+                self._fail_link(link)
+            elif link.sender._state == constants.MessageSenderState.Open:
+                link.failed = False
+                link.failures = 0
+                _send_pending_messages(link.sender, link.pending, self._counter, self._msg_timeout)
+        self._connection.work()
+        return True
+
+    def _close_links(self):
+        """Destroy the Link of every target ahead of reconnecting. Messages that
+        were awaiting acknowledgement will be sent again on the new Links.
+        """
+        for link in self._links.values():
+            if link.sender:
+                unacked_messages = _detach_unacked_messages(link.pending)
+                link.sender.destroy()
+                link.sender = None
+                _requeue_unacked_messages(unacked_messages)
+
+    def close(self):
+        """Close down the client. All the Links will be closed and
+        any pending, unsent messages will be cleared.
+        """
+        for link in self._links.values():
+            if link.sender:
+                link.sender.destroy()
+                link.sender = None
+            link.pending = []
+        super(MultiTargetSendClient, self).close()
+
+    def _pending_count(self):
+        """The number of messages across all targets that have not completed.
+        :returns: int
+        """
+        return sum(1 for link in self._links.values() for m in link.pending
+                   if m.state not in constants.DONE_STATES)
+
+    def _link_available(self, target):
+        """Whether the router can send new messages to a target. A target is
+        unavailable from a Link error until its Link has been reattached, which
+        is retried with the reconnect backoff, or if it has `max_link_pending`
+        messages waiting.
+
+        :param target: The target address.
+        :type target: str, bytes or ~uamqp.Target
+        :returns: bool
+        """
+        link = self._links.get(target)
+        if not link:
+            return True
+        if link.failed:
+            return False
+        if self._max_link_pending:
+            pending = sum(1 for m in link.pending if m.state not in constants.DONE_STATES)
+            return pending < self._max_link_pending
+        return True
+
+    def queue_message(self, messages, target=None):
+        """Add a message to the send queue of a target. If the number of messages
+        waiting across all targets has reached `max_pending`, the client will be
+        opened and run until there is space in the queue. Otherwise no further
+        action will be taken until `wait` or `send_all_messages` has been called.
+        If no target is given, the target will be chosen by the client router.
+
+        :param messages: A message to send. This can either be a single instance
+         of ~uamqp.Message, or multiple messages wrapped in an instance
+         of ~uamqp.BatchMessage.
+        :type message: ~uamqp.Message
+        :param target: The target to which to send the message.
+        :type target: str, bytes or ~uamqp.Target
+        :returns: list[~uamqp.Message]
+        :raises: ValueError if no target is given and the client has no router.
+        """
+        if self._pending_count() >= self._max_pending:
+            self.open()
+            while self._pending_count() >= self._max_pending:
+                self.do_work()
+        if target is None:
+            if not self._router:
+                raise ValueError("A target is required when the client has no router.")
+            target = self._router.route_message(messages, available=self._link_available)
+        link = self._get_link(target)
+        queued = []
+        for message in messages.gather():
+            message.idle_time = self._counter.get_current_ms()
+            link.pending.append(message)
+            queued.append(message)
+        return queued
+
+    def send_message(self, messages, target=None, close_on_done=False):
+        """Send a single message or batched message to a target. If no target
+        is given, the target will be chosen by the client router.
+
+        :param messages: A message to send. This can either be a single instance
+         of ~uamqp.Message, or multiple messages wrapped in an instance
+         of ~uamqp.BatchMessage.
+        :type message: ~uamqp.Message
+        :param target: The target to which to send the message.
+        :type target: str, bytes or ~uamqp.Target
+        :param close_on_done: Close the client once the message is sent. Default is `False`.
+        :type close_on_done: bool
+        :raises: ~uamqp.errors.MessageSendFailed if message fails to send after retry policy
+         is exhausted.
+        """
+        pending_batch = self.queue_message(messages, target)
+        self.open()
+        try:
+            while any([m for m in pending_batch if m.state not in constants.DONE_STATES]):
+                self.do_work()
+        except:
+            raise
+        else:
+            failed = [m for m in pending_batch if m.state == constants.MessageState.Failed]
+            if any(failed):
+                raise errors.MessageSendFailed("Failed to send message.")
+        finally:
+            if close_on_done:
+                self.close()
+
+    def messages_pending(self):
+        """Check whether the client is holding any unsent
+        messages in the queue of any target.
+        :returns: bool
+        """
+        return self._pending_count() > 0
+
+    def wait(self):
+        """Run the client until all pending message in the queues
+        of all targets have been processed.
+        """
+        while self.messages_pending():
+            self.do_work()
+
+    def send_all_messages(self, close_on_done=True):
+        """Send all pending messages in the queues of all targets. This will
+        return a list of the send result of all the pending messages so it can be
+        determined if any messages failed to send.
+        This function will open the client if it is not already open.
+
+        :param close_on_done: Close the client once the messages are sent.
+         Default is `True`.
+        :type close_on_done: bool
+        :returns: list[~uamqp.constants.MessageState]
+        """
+        self.open()
+        try:
+            messages = [m for link in self._links.values() for m in link.pending]
+            self.wait()
+        except:
+            raise
+        else:
+            results = [m.state for m in messages]
+            return results
+        finally:
+            if close_on_done:
+                self.close()
+
 
 class ReceiveClient(AMQPClient):
     """An AMQP client for receiving messages.
@@ -545,6 +1301,35 @@ class ReceiveClient(AMQPClient):
      messages the Link will attempt to handle per connection iteration.
      The default is 300.
     :type prefetch: int
+    :param raw_bodies: Whether to receive only the body data of each message. If `True`,
+     the Data sections of each received message will be extracted in C and returned
+     (or passed to the `on_message_received` callback) as bytes, without creating a
+     ~uamqp.Message. Messages with a Sequence or Value body
+     will still be returned as ~uamqp.Message. The default is `False`.
+    :type raw_bodies: bool
+    :param concurrency: The number of threads on which to run the `on_message_received`
+     callback when receiving messages continuously. If set, messages will be handed to
+     the callback without waiting for the previous callback to complete, and completion will
+     be tracked in the order in which the messages were received. Messages are accepted on
+     receipt, so the callback cannot reject them in this mode. The default is `None`, in which case
+     the callback is run inline.
+    :type concurrency: int
+    :param ordering_key: A callable that takes a received message and returns a hashable
+     key. Where `concurrency` is set, messages with the same key will be handled one at a time
+     in the order in which they were received. Messages with different keys may be handled in
+     parallel.
+    :type ordering_key: callable[~uamqp.Message]
+    :param checkpoint_store: A store in which to record the offset and sequence number of
+     the last message handed to the application. When the client is opened, if the store
+     holds a checkpoint for the source, a selector filter will be set on the source so that
+     receiving resumes after that message. See ~uamqp.checkpoint.FileCheckpointStore.
+    :type checkpoint_store: ~uamqp.checkpoint.CheckpointStore
+    :param unpack_batches: Whether to unpack messages received with the batch message
+     format. If `True`, each message encoded within a batched message will be returned
+     (or passed to the `on_message_received` callback) as a ~uamqp.message.EncodedMessage,
+     which is decoded lazily from the received data. The default is `False`, in which case
+     the batched message is returned as a single ~uamqp.Message.
+    :type unpack_batches: bool
     :param max_frame_size: Maximum AMQP frame size. Default is 63488 bytes.
     :type max_frame_size: int
     :param channel_max: Maximum number of Session channels in the Connection.
@@ -564,6 +1349,23 @@ class ReceiveClient(AMQPClient):
     :type outgoing_window: int
     :param handle_max: The maximum number of concurrent link handles.
     :type handle_max: int
+    :param auto_reconnect: Whether to re-establish the Connection, authentication and Links
+     of the client if the Connection is lost or a Link fails. The client waits for an
+     exponential backoff with jitter between attempts. Default is `False`.
+    :type auto_reconnect: bool
+    :param reconnect_backoff: The base delay in seconds between reconnect attempts,
+     which is doubled on each consecutive attempt. Default is 1 second.
+    :type reconnect_backoff: float
+    :param reconnect_backoff_max: The maximum delay in seconds between reconnect
+     attempts. Default is 30 seconds.
+    :type reconnect_backoff_max: float
+    :param max_reconnect_attempts: The number of consecutive reconnect attempts after
+     which the error will be raised. Default is 10.
+    :type max_reconnect_attempts: int
+    :param connection_pool: A pool from which to acquire a shared Connection when the client
+     is opened without an explicit Connection. The Connection will be returned to the pool
+     when the client is closed.
+    :type connection_pool: ~uamqp.connection.ConnectionPool
     :param encoding: The encoding to use for parameters supplied as strings.
      Default is 'UTF-8'
     :type encoding: str
@@ -577,18 +1379,42 @@ class ReceiveClient(AMQPClient):
         self._was_message_received = False
         self._message_received_callback = None
         self._received_messages = None
+        self._last_position = None
 
         # Receiver and Link settings
         self._receive_settle_mode = kwargs.pop('receive_settle_mode', None) or constants.ReceiverSettleMode.PeekLock
         self._max_message_size = kwargs.pop('max_message_size', None) or constants.MAX_MESSAGE_LENGTH_BYTES
         self._prefetch = kwargs.pop('prefetch', None) or 300
         self._link_properties = kwargs.pop('link_properties', None)
+        self._raw_bodies = kwargs.pop('raw_bodies', False)
+        self._concurrency = kwargs.pop('concurrency', None)
+        self._ordering_key = kwargs.pop('ordering_key', None)
+        self._handler_pool = None
+        self._checkpoint_store = kwargs.pop('checkpoint_store', None)
+        if self._checkpoint_store and self._raw_bodies:
+            raise ValueError("Checkpointing requires message annotations and cannot be used with raw_bodies.")
+        self._unpack_batches = kwargs.pop('unpack_batches', False)
 
         # AMQP object settings
         self.receiver_type = receiver.MessageReceiver
 
         super(ReceiveClient, self).__init__(source, auth=auth, client_name=client_name, debug=debug, **kwargs)
 
+    def _create_receive_buffer(self):  # pylint: disable=no-self-use
+        """Create the buffer in which received messages will be held
+        until they are returned to the caller. The synchronous client drives
+        the Connection from the calling thread, so no locking is needed.
+        :returns: ~uamqp.client._ReceiveBuffer
+        """
+        return _ReceiveBuffer()
+
+    def _prepare_warm_up(self):
+        """Create the receive buffer, so that any messages received while the
+        client is warmed up are kept and returned by the next batch.
+        """
+        if self._received_messages is None:
+            self._received_messages = self._create_receive_buffer()
+
     def _client_ready(self):
         """Determine whether the client is ready to start receiving messages.
         To be ready, the connection must be open and authentication complete,
@@ -600,6 +1426,7 @@ class ReceiveClient(AMQPClient):
         """
         # pylint: disable=protected-access
         if not self._message_receiver:
+            self._apply_checkpoint()
             self._message_receiver = self.receiver_type(
                 self._session, self._remote_address, self._name,
                 on_message_received=self,
@@ -609,6 +1436,7 @@ class ReceiveClient(AMQPClient):
                 prefetch=self._prefetch,
                 max_message_size=self._max_message_size,
                 properties=self._link_properties,
+                raw_bodies=self._raw_bodies,
                 encoding=self._encoding)
             self._message_receiver.open()
             return False
@@ -629,6 +1457,8 @@ class ReceiveClient(AMQPClient):
         :returns: bool
         """
         self._connection.work()
+        if self._checkpoint_store:
+            self._checkpoint_store.flush()
         if self._timeout > 0:
             now = self._counter.get_current_ms()
             if self._last_activity_timestamp and not self._was_message_received:
@@ -641,6 +1471,60 @@ class ReceiveClient(AMQPClient):
         self._was_message_received = False
         return True
 
+    def _apply_checkpoint(self):
+        """If a checkpoint has been stored for the source, set a selector
+        filter on the source so that the receiver will resume after the last
+        processed message. If the client is reconnecting, it will instead resume
+        after the last message received on the previous Link.
+        """
+        position = self._last_position
+        if not position and self._checkpoint_store:
+            position = self._checkpoint_store.get(self._remote_address.address)
+        selector = checkpoint.selector_filter(position) if position else None
+        if selector:
+            _logger.debug("Resuming receive from checkpoint: {}".format(selector))
+            self._remote_address.set_filter(selector)
+
+    def _get_position(self, message):
+        """Get the position of a message in the source from its
+        offset and sequence number annotations.
+
+        :param message: The received message.
+        :type message: ~uamqp.Message
+        :returns: dict or None
+        """
+        if not message.annotations:
+            return None
+        offset = message.annotations.get(b'x-opt-offset')
+        sequence_number = message.annotations.get(b'x-opt-sequence-number')
+        if offset is None and sequence_number is None:
+            return None
+        return {
+            'offset': offset.decode(self._encoding) if isinstance(offset, bytes) else offset,
+            'sequence_number': sequence_number}
+
+    def _record_checkpoint(self, message):
+        """Record the position of a message that has been handed to
+        the application.
+
+        :param message: The processed message.
+        :type message: ~uamqp.Message
+        """
+        if not self._checkpoint_store:
+            return
+        position = self._get_position(message)
+        if position:
+            self._checkpoint_store.update(self._remote_address.address, **position)
+
+    def _close_links(self):
+        """Destroy the MessageReceiver ahead of reconnecting. Messages that have
+        been received but not yet returned are kept, and the new Link will resume
+        after the last message received.
+        """
+        if self._message_receiver:
+            self._message_receiver.destroy()
+            self._message_receiver = None
+
     def _message_generator(self):
         """Iterate over processed messages in the receive queue.
         :returns: generator[~uamqp.Message]
@@ -649,11 +1533,10 @@ class ReceiveClient(AMQPClient):
         receiving = True
         try:
             while receiving:
-                while receiving and self._received_messages.empty():
+                while receiving and not self._received_messages:
                     receiving = self.do_work()
-                while not self._received_messages.empty():
-                    message = self._received_messages.get()
-                    self._received_messages.task_done()
+                for message in self._received_messages.drain():
+                    self._record_checkpoint(message)
                     yield message
         except:
             raise
@@ -669,10 +1552,46 @@ class ReceiveClient(AMQPClient):
         """
         self._was_message_received = True
         wrapped_message = uamqp.Message(message=message, encoding=self._encoding)
+        if self._auto_reconnect:
+            self._last_position = self._get_position(wrapped_message) or self._last_position
+        if self._unpack_batches:
+            for inner_message in wrapped_message.iter_batch():
+                self._handle_message(inner_message)
+        else:
+            self._handle_message(wrapped_message)
+
+    def _handle_message(self, message):
+        """Hand a received message to the user-defined callback and
+        internal queue.
+        :param message: ~uamqp.Message or ~uamqp.message.EncodedMessage
+        """
+        if self._handler_pool is not None:
+            self._handler_pool.submit(message)
+            return
         if self._message_received_callback:
-            wrapped_message = self._message_received_callback(wrapped_message) or wrapped_message
-        if self._received_messages:
-            self._received_messages.put(wrapped_message)
+            message = self._message_received_callback(message) or message
+        if self._received_messages is not None:
+            self._received_messages.put(message)
+        else:
+            self._record_checkpoint(message)
+
+    def _raw_message_received(self, body):
+        """Callback run on receipt of every message when the client is
+        receiving raw message bodies. If there is a user-defined callback,
+        this will be called with the body bytes.
+        Additionally if the client is retrieving messages for a batch
+        or iterator, the body will be added to an internal queue.
+        :param body: The concatenated Data sections of the message.
+        :type body: bytes
+        """
+        self._was_message_received = True
+        if self._handler_pool is not None:
+            self._handler_pool.submit(body)
+            return
+        if self._message_received_callback:
+            body = self._message_received_callback(body) or body
+        if self._received_messages is not None:
+            self._received_messages.put(body)
 
     def receive_message_batch(self, max_batch_size=None, on_message_received=None, timeout=0):
         """Receive a batch of messages. Messages returned in the batch have already been
@@ -705,33 +1624,57 @@ class ReceiveClient(AMQPClient):
                 'connection prefetch: {}'.format(self._prefetch))
         timeout = self._counter.get_current_ms() + timeout if timeout else 0
         expired = False
-        self._received_messages = self._received_messages or queue.Queue()
+        if self._received_messages is None:
+            self._received_messages = self._create_receive_buffer()
         self.open()
         receiving = True
-        batch = []
-        while not self._received_messages.empty() and len(batch) < max_batch_size:
-            batch.append(self._received_messages.get())
-            self._received_messages.task_done()
+        batch = self._received_messages.drain(max_batch_size)
         if len(batch) >= max_batch_size:
+            self._record_checkpoint(batch[-1])
             return batch
 
         while receiving and not expired and len(batch) < max_batch_size:
-            while receiving and self._received_messages.qsize() < max_batch_size:
+            while receiving and len(self._received_messages) < max_batch_size:
                 if timeout > 0 and self._counter.get_current_ms() > timeout:
                     expired = True
                     break
-                before = self._received_messages.qsize()
+                before = len(self._received_messages)
                 receiving = self.do_work()
-                received = self._received_messages.qsize() - before
-                if self._received_messages.qsize() > 0 and received == 0:
+                received = len(self._received_messages) - before
+                if self._received_messages and received == 0:
                     # No new messages arrived, but we have some - so return what we have.
                     expired = True
                     break
-            while not self._received_messages.empty() and len(batch) < max_batch_size:
-                batch.append(self._received_messages.get())
-                self._received_messages.task_done()
+            batch.extend(self._received_messages.drain(max_batch_size - len(batch)))
+        if batch:
+            self._record_checkpoint(batch[-1])
         return batch
 
+    def receive_columnar_batch(self, max_batch_size=None, annotations=None, timeout=0):
+        """Receive a batch of messages in columnar form. The bodies of the messages will
+        be returned in a single contiguous buffer with an array of offsets, and the requested
+        message annotations will be returned as typed arrays. Messages returned in the batch
+        have already been accepted. This method will return as soon as some messages are
+        available rather than waiting to achieve a specific batch size.
+
+        :param max_batch_size: The maximum number of messages that can be returned in
+         one call. This value cannot be larger than the prefetch value, and if not specified,
+         the prefetch value will be used.
+        :type max_batch_size: int
+        :param annotations: The message annotations to extract, mapped to the `array` type
+         code in which they will be stored. The default extracts `x-opt-sequence-number`,
+         `x-opt-offset` and `x-opt-enqueued-time` as signed 64-bit integers.
+        :type annotations: dict[bytes, str]
+        :param timeout: A timeout in milliseconds for which to wait to receive any messages.
+         If no messages are received in this time, an empty batch will be returned. If set to
+         0, the client will continue to wait until at least one message is received. The
+         default is 0.
+        :type timeout: int
+        :returns: ~uamqp.message.ColumnarBatch
+        """
+        batch = self.receive_message_batch(max_batch_size=max_batch_size, timeout=timeout)
+        return uamqp.message.ColumnarBatch.from_messages(batch, annotations=annotations, encoding=self._encoding)
+
     def receive_messages(self, on_message_received):
         """Receive messages. This function will run indefinitely, until the client
         closes either via timeout, error or forced interruption (e.g. keyboard interrupt).
@@ -742,17 +1685,51 @@ class ReceiveClient(AMQPClient):
         """
         self.open()
         self._message_received_callback = on_message_received
+        if self._concurrency:
+            self._handler_pool = _HandlerPool(
+                on_message_received, self._concurrency, self._prefetch, ordering_key=self._ordering_key)
         receiving = True
         try:
             while receiving:
                 receiving = self.do_work()
+                if self._handler_pool is not None:
+                    self._handler_pool_completed(self._handler_pool.collect())
         except:
             receiving = False
             raise
         finally:
+            self._close_handler_pool(raise_errors=receiving)
             if not receiving:
                 self.close()
 
+    def _handler_pool_completed(self, messages):
+        """Record the position of the last of a set of messages whose handlers
+        have completed in delivery order.
+
+        :param messages: The completed messages.
+        :type messages: list[~uamqp.Message]
+        """
+        if messages:
+            self._record_checkpoint(messages[-1])
+
+    def _close_handler_pool(self, raise_errors=True):
+        """Wait for any in-flight message handlers to complete and shut down
+        the handler pool.
+
+        :param raise_errors: Whether to raise any error from the remaining handlers.
+        :type raise_errors: bool
+        """
+        if self._handler_pool is None:
+            return
+        handler_pool, self._handler_pool = self._handler_pool, None
+        handler_pool.close()
+        try:
+            self._handler_pool_completed(handler_pool.collect())
+        except Exception:  # pylint: disable=broad-except
+            if raise_errors:
+                raise
+            _logger.warning("Message handler failed during shutdown.", exc_info=True)
+
     def receive_messages_iter(self, on_message_received=None):
         """Receive messages by generator. Messages returned in the generator have already been
         accepted - if you wish to add logic to accept or reject messages based on custom
@@ -766,14 +1743,313 @@ class ReceiveClient(AMQPClient):
         :type on_message_received: callable[~uamqp.Message]
         """
         self._message_received_callback = on_message_received
-        self._received_messages = queue.Queue()
+        if self._received_messages is None:
+            self._received_messages = self._create_receive_buffer()
         return self._message_generator()
 
     def close(self):
         if self._message_receiver:
             self._message_receiver.destroy()
             self._message_receiver = None
+        if self._checkpoint_store:
+            self._checkpoint_store.flush(force=True)
         super(ReceiveClient, self).close()
         self._shutdown = False
         self._last_activity_timestamp = None
         self._was_message_received = False
+        self._last_position = None
+
+
+class _CachedClient:
+    """An open client held by a ~uamqp.client.ClientCache while it is not in use."""
+
+    def __init__(self, key, client):
+        self.key = key
+        self.client = client
+        self.last_used = time.monotonic()
+
+
+class ClientCache:
+    """A cache of open send and receive clients, so that repeated sends to the same
+    target or receives from the same source reuse an open Link rather than each
+    opening a new Connection. Clients are keyed by endpoint, authentication identity
+    and client settings, and share Connections to the same host through a
+    ~uamqp.connection.ConnectionPool. A client is only used by one caller at a time, and
+    clients that have not been used for longer than the idle timeout are closed.
+    A cache can be passed to the module-level helpers, such as ~uamqp.send_message,
+    with the `client_cache` keyword argument.
+
+    Messages are accepted as they are received, so any messages prefetched by a
+    ReceiveClient and not yet returned when it is closed would be lost. ReceiveClients
+    are therefore only cached when they receive one message at a time, with a
+    `prefetch` (or `max_batch_size`) of 1. Receives with other settings use a new client
+    that is closed once the batch has been received.
+
+    :param idle_timeout: The time in seconds after which a client that has not
+     been used will be closed. The default is 60 seconds.
+    :type idle_timeout: float
+    """
+
+    def __init__(self, idle_timeout=60):
+        self.idle_timeout = idle_timeout
+        self.connection_pool = ConnectionPool(idle_timeout=0)
+        self._idle = collections.defaultdict(list)
+        self._lock = threading.Lock()
+
+        # AMQP object settings
+        self.send_client_type = SendClient
+        self.receive_client_type = ReceiveClient
+
+    def __enter__(self):
+        """Use the cache in a context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Close all cached clients when exiting a context manager."""
+        self.close()
+
+    def __len__(self):
+        return sum(len(c) for c in self._idle.values())
+
+    @staticmethod
+    def _get_key(client_type, endpoint, auth, debug, kwargs):
+        """The identity of a cached client, or None if the client settings
+        cannot be compared and the client should not be cached.
+
+        :returns: tuple or None
+        """
+        if issubclass(client_type, ReceiveClient) and kwargs.get('prefetch') != 1:
+            return None
+        auth_key = ConnectionPool._get_key(b'', auth) if auth else None  # pylint: disable=protected-access
+        key = (client_type, endpoint, auth_key, debug, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _is_healthy(self, client):
+        """Whether a cached client can be used again.
+
+        :param client: The cached client.
+        :type client: ~uamqp.client.AMQPClient
+        :returns: bool
+        """
+        # pylint: disable=protected-access
+        if client._shutdown or not client._session:
+            return False
+        if not self.connection_pool._is_healthy(client._connection):
+            return False
+        link = getattr(client, '_message_sender', None) or getattr(client, '_message_receiver', None)
+        return not link or link._state not in (
+            constants.MessageSenderState.Error, constants.MessageReceiverState.Error)
+
+    def _checkout(self, client_type, endpoint, auth, debug, kwargs):
+        """Take an idle client from the cache, or create a new one.
+
+        :returns: ~uamqp.client._CachedClient
+        """
+        key = self._get_key(client_type, endpoint, auth, debug, kwargs)
+        with self._lock:
+            self._evict_idle()
+            idle = self._idle.get(key) if key else None
+            while idle:
+                cached = idle.pop()
+                if self._is_healthy(cached.client):
+                    return cached
+                _logger.debug("Closing unhealthy cached client.")
+                cached.client.close()
+        client = client_type(endpoint, auth=auth, debug=debug, connection_pool=self.connection_pool, **kwargs)
+        return _CachedClient(key, client)
+
+    def _checkin(self, cached, error=False):
+        """Return a client to the cache once it is no longer in use. If the client
+        failed, or cannot be reused, it will be closed.
+
+        :param cached: The cached client.
+        :type cached: ~uamqp.client._CachedClient
+        :param error: Whether the client raised an error while in use.
+        :type error: bool
+        """
+        if error or not cached.key or not self._is_healthy(cached.client):
+            cached.client.close()
+            self.connection_pool.evict_idle()
+            return
+        cached.last_used = time.monotonic()
+        with self._lock:
+            self._idle[cached.key].append(cached)
+
+    def _run(self, client_type, endpoint, auth, debug, kwargs, operation):
+        """Run an operation with a cached client.
+
+        :returns: The result of the operation.
+        """
+        cached = self._checkout(client_type, endpoint, auth, debug, kwargs)
+        try:
+            result = operation(cached.client)
+        except:
+            self._checkin(cached, error=True)
+            raise
+        self._checkin(cached)
+        return result
+
+    def _warm_up(self, client_type, endpoint, auth, debug, kwargs, count, timeout):
+        """Warm up a number of clients and leave them idle in the cache."""
+        warmed = []
+        try:
+            for _ in range(count):
+                cached = self._checkout(client_type, endpoint, auth, debug, kwargs)
+                try:
+                    cached.client.warm_up(timeout=timeout)
+                except:
+                    self._checkin(cached, error=True)
+                    raise
+                warmed.append(cached)
+        finally:
+            for cached in warmed:
+                self._checkin(cached)
+
+    def _evict_idle(self):
+        """Close cached clients that have not been used for the idle timeout."""
+        now = time.monotonic()
+        for key, idle in list(self._idle.items()):
+            for cached in [c for c in idle if now - c.last_used >= self.idle_timeout]:
+                idle.remove(cached)
+                cached.client.close()
+            if not idle:
+                del self._idle[key]
+        self.connection_pool.evict_idle()
+
+    def evict_idle(self):
+        """Close any cached clients that have not been used for the idle timeout.
+        This also happens whenever a client is taken from the cache.
+        """
+        with self._lock:
+            self._evict_idle()
+
+    def close(self):
+        """Close all cached clients that are not currently in use."""
+        with self._lock:
+            for idle in self._idle.values():
+                for cached in idle:
+                    cached.client.close()
+            self._idle.clear()
+            self.connection_pool.close()
+
+    def send_message(self, target, data, auth=None, debug=False, **kwargs):
+        """Send a single message with a cached SendClient.
+
+        :param target: The target AMQP endpoint.
+        :type target: str, bytes or ~uamqp.Target
+        :param data: The contents of the message to send.
+        :type data: str, bytes or ~uamqp.Message
+        :param auth: The authentication credentials for the endpoint.
+        :type auth: ~uamqp.authentication.AMQPAuth
+        :param debug: Whether to turn on network trace logs. Default is `False`.
+        :type debug: bool
+        :param kwargs: Any additional keyword arguments for the ~uamqp.SendClient.
+        :returns: list[~uamqp.constants.MessageState]
+        """
+        message = data if isinstance(data, uamqp.Message) else uamqp.Message(body=data)
+
+        def _send(client):
+            client.queue_message(message)
+            return client.send_all_messages(close_on_done=False)
+        return self._run(self.send_client_type, target, auth, debug, kwargs, _send)
+
+    def send_messages(self, target, messages, auth=None, debug=False, max_pending=300, **kwargs):
+        """Send the messages from an iterable over the Link of a cached SendClient.
+
+        :param target: The target AMQP endpoint.
+        :type target: str, bytes or ~uamqp.Target
+        :param messages: The messages to send. Each item can be a ~uamqp.Message,
+         a ~uamqp.BatchMessage, or the body data of a new message.
+        :type messages: iterable
+        :param auth: The authentication credentials for the endpoint.
+        :type auth: ~uamqp.authentication.AMQPAuth
+        :param debug: Whether to turn on network trace logs. Default is `False`.
+        :type debug: bool
+        :param max_pending: The maximum number of messages waiting to be sent or
+         acknowledged at once. Default is 300.
+        :type max_pending: int
+        :param kwargs: Any additional keyword arguments for the ~uamqp.SendClient.
+        :returns: list[~uamqp.constants.MessageState]
+        """
+        def _send(client):
+            return client.stream_messages(messages, max_pending=max_pending, close_on_done=False)
+        return self._run(self.send_client_type, target, auth, debug, kwargs, _send)
+
+    def receive_messages(self, source, auth=None, max_batch_size=None, timeout=0, debug=False, **kwargs):
+        """Receive a batch of messages with a cached ReceiveClient.
+
+        :param source: The AMQP source endpoint to receive from.
+        :type source: str, bytes or ~uamqp.Source
+        :param auth: The authentication credentials for the endpoint.
+        :type auth: ~uamqp.authentication.AMQPAuth
+        :param max_batch_size: The maximum number of messages to return in a batch.
+        :type max_batch_size: int
+        :param timeout: The timeout after which to return if no messages are retrieved.
+         If set to `0` (the default), the receiver will wait for messages until interrupted.
+        :param debug: Whether to turn on network trace logs. Default is `False`.
+        :type debug: bool
+        :param kwargs: Any additional keyword arguments for the ~uamqp.ReceiveClient.
+        :returns: list[~uamqp.Message]
+        """
+        if max_batch_size:
+            kwargs['prefetch'] = max_batch_size
+
+        def _receive(client):
+            return client.receive_message_batch(
+                max_batch_size=max_batch_size or client._prefetch, timeout=timeout)  # pylint: disable=protected-access
+        return self._run(self.receive_client_type, source, auth, debug, kwargs, _receive)
+
+    def warm_up_senders(self, target, auth=None, debug=False, count=1, timeout=0, **kwargs):
+        """Open cached SendClients for a target ahead of use, so that sends with the
+        same settings do not wait for the Connection, CBS authentication or Link attach.
+        The clients will still be closed if they are not used within the idle timeout.
+
+        :param target: The target AMQP endpoint.
+        :type target: str, bytes or ~uamqp.Target
+        :param auth: The authentication credentials for the endpoint.
+        :type auth: ~uamqp.authentication.AMQPAuth
+        :param debug: Whether to turn on network trace logs. Default is `False`.
+        :type debug: bool
+        :param count: The number of clients to have ready for concurrent use. Default is 1.
+        :type count: int
+        :param timeout: A timeout in milliseconds within which each client must be ready.
+         If set to 0, there is no timeout. The default is 0.
+        :type timeout: int
+        :param kwargs: Any additional keyword arguments for the ~uamqp.SendClient.
+        :raises: TimeoutError if a client is not ready within the timeout.
+        """
+        self._warm_up(self.send_client_type, target, auth, debug, kwargs, count, timeout)
+
+    def warm_up_receivers(self, source, auth=None, max_batch_size=None, debug=False, count=1, timeout=0, **kwargs):
+        """Open cached ReceiveClients for a source ahead of use, so that receives with
+        the same settings do not wait for the Connection, CBS authentication or Link attach.
+        Messages that arrive before the clients are used are held and returned by the
+        next receive.
+
+        :param source: The AMQP source endpoint to receive from.
+        :type source: str, bytes or ~uamqp.Source
+        :param auth: The authentication credentials for the endpoint.
+        :type auth: ~uamqp.authentication.AMQPAuth
+        :param max_batch_size: The maximum batch size that will be used to receive
+         from the clients. Only receivers with a batch size of 1 can be cached.
+        :type max_batch_size: int
+        :param debug: Whether to turn on network trace logs. Default is `False`.
+        :type debug: bool
+        :param count: The number of clients to have ready for concurrent use. Default is 1.
+        :type count: int
+        :param timeout: A timeout in milliseconds within which each client must be ready.
+         If set to 0, there is no timeout. The default is 0.
+        :type timeout: int
+        :param kwargs: Any additional keyword arguments for the ~uamqp.ReceiveClient.
+        :raises: TimeoutError if a client is not ready within the timeout, or ValueError
+         if the batch size is not 1.
+        """
+        if max_batch_size:
+            kwargs['prefetch'] = max_batch_size
+        if self._get_key(self.receive_client_type, source, auth, debug, kwargs) is None:
+            raise ValueError("ReceiveClients can only be cached with a max_batch_size of 1.")
+        self._warm_up(self.receive_client_type, source, auth, debug, kwargs, count, timeout)
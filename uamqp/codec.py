@@ -0,0 +1,571 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import datetime
+import struct
+import uuid
+
+from uamqp import c_uamqp
+from uamqp import types
+
+
+_UBYTE = struct.Struct('>B')
+_USHORT = struct.Struct('>H')
+_UINT = struct.Struct('>I')
+_ULONG = struct.Struct('>Q')
+_BYTE = struct.Struct('>b')
+_SHORT = struct.Struct('>h')
+_INT = struct.Struct('>i')
+_LONG = struct.Struct('>q')
+_FLOAT = struct.Struct('>f')
+_DOUBLE = struct.Struct('>d')
+_COMPOUND8 = struct.Struct('>BBB')
+_COMPOUND32 = struct.Struct('>BII')
+
+_DATA_SECTION = b'\x00\x53\x75'
+_AMQP_SEQUENCE_SECTION = b'\x00\x53\x76'
+_AMQP_VALUE_SECTION = b'\x00\x53\x77'
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _encode_null(value, out, encoding):  # pylint: disable=unused-argument
+    out.append(0x40)
+
+
+def _encode_bool(value, out, encoding):  # pylint: disable=unused-argument
+    out.append(0x41 if value else 0x42)
+
+
+def _encode_int(value, out, encoding):  # pylint: disable=unused-argument
+    if -128 <= value <= 127:
+        out.append(0x54)
+        out += _BYTE.pack(value)
+    elif -2147483648 <= value <= 2147483647:
+        out.append(0x71)
+        out += _INT.pack(value)
+    elif -9223372036854775808 <= value <= 9223372036854775807:
+        out.append(0x81)
+        out += _LONG.pack(value)
+    elif 0 <= value <= 18446744073709551615:
+        out.append(0x80)
+        out += _ULONG.pack(value)
+    else:
+        raise OverflowError("Value {} is too large to be encoded as an AMQP integer.".format(value))
+
+
+def _encode_long(value, out, encoding):  # pylint: disable=unused-argument
+    if -128 <= value <= 127:
+        out.append(0x55)
+        out += _BYTE.pack(value)
+    else:
+        out.append(0x81)
+        out += _LONG.pack(value)
+
+
+def _encode_ulong(value, out, encoding):  # pylint: disable=unused-argument
+    if value == 0:
+        out.append(0x44)
+    elif value <= 255:
+        out.append(0x53)
+        out.append(value)
+    else:
+        out.append(0x80)
+        out += _ULONG.pack(value)
+
+
+def _encode_uint(value, out, encoding):  # pylint: disable=unused-argument
+    if value == 0:
+        out.append(0x43)
+    elif value <= 255:
+        out.append(0x52)
+        out.append(value)
+    else:
+        out.append(0x70)
+        out += _UINT.pack(value)
+
+
+def _encode_double(value, out, encoding):  # pylint: disable=unused-argument
+    out.append(0x82)
+    out += _DOUBLE.pack(value)
+
+
+def _encode_variable(value, out, small_code, large_code):
+    length = len(value)
+    if length <= 255:
+        out.append(small_code)
+        out.append(length)
+    else:
+        out.append(large_code)
+        out += _UINT.pack(length)
+    out += value
+
+
+def _encode_str(value, out, encoding):
+    if len(value) == 1:
+        out.append(0x73)
+        out += _UINT.pack(ord(value))
+    else:
+        _encode_variable(value.encode(encoding), out, 0xa1, 0xb1)
+
+
+def _encode_string_bytes(value, out, encoding):  # pylint: disable=unused-argument
+    _encode_variable(value, out, 0xa1, 0xb1)
+
+
+def _encode_binary(value, out, encoding):  # pylint: disable=unused-argument
+    _encode_variable(value, out, 0xa0, 0xb0)
+
+
+def _encode_symbol(value, out, encoding):
+    if isinstance(value, str):
+        value = value.encode(encoding)
+    _encode_variable(value, out, 0xa3, 0xb3)
+
+
+def _encode_uuid(value, out, encoding):  # pylint: disable=unused-argument
+    out.append(0x98)
+    out += value.bytes
+
+
+def _encode_timestamp(value, out, encoding):  # pylint: disable=unused-argument
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        delta = value - _EPOCH
+        value = (delta.days * 86400 + delta.seconds) * 1000 + delta.microseconds // 1000
+    out.append(0x83)
+    out += _LONG.pack(value)
+
+
+def _encode_compound(items, count, out, encoding, small_code, large_code):
+    start = len(out)
+    out += _COMPOUND32.pack(large_code, 0, 0)
+    for item in items:
+        _encode_value(item, out, encoding)
+    length = len(out) - start - 9
+    if length + 1 <= 255 and count <= 255:
+        out[start:start + 9] = _COMPOUND8.pack(small_code, length + 1, count)
+    else:
+        out[start:start + 9] = _COMPOUND32.pack(large_code, length + 4, count)
+
+
+def _encode_list(value, out, encoding):
+    if not value:
+        out.append(0x45)
+        return
+    _encode_compound(value, len(value), out, encoding, 0xc0, 0xd0)
+
+
+def _encode_map(value, out, encoding):
+    items = (i for pair in value.items() for i in pair)
+    _encode_compound(items, len(value) * 2, out, encoding, 0xc1, 0xd1)
+
+
+# Array elements share a single constructor, so each type is always
+# written in its widest form.
+_ARRAY_ELEMENTS = {
+    c_uamqp.AMQPType.BoolValue: (0x56, lambda v, e: b'\x01' if v else b'\x00'),
+    c_uamqp.AMQPType.UByteValue: (0x50, lambda v, e: _UBYTE.pack(v)),
+    c_uamqp.AMQPType.UShortValue: (0x60, lambda v, e: _USHORT.pack(v)),
+    c_uamqp.AMQPType.UIntValue: (0x70, lambda v, e: _UINT.pack(v)),
+    c_uamqp.AMQPType.ULongValue: (0x80, lambda v, e: _ULONG.pack(v)),
+    c_uamqp.AMQPType.ByteValue: (0x51, lambda v, e: _BYTE.pack(v)),
+    c_uamqp.AMQPType.ShortValue: (0x61, lambda v, e: _SHORT.pack(v)),
+    c_uamqp.AMQPType.IntValue: (0x71, lambda v, e: _INT.pack(v)),
+    c_uamqp.AMQPType.LongValue: (0x81, lambda v, e: _LONG.pack(v)),
+    c_uamqp.AMQPType.FloatValue: (0x72, lambda v, e: _FLOAT.pack(v)),
+    c_uamqp.AMQPType.DoubleValue: (0x82, lambda v, e: _DOUBLE.pack(v)),
+    c_uamqp.AMQPType.TimestampValue: (0x83, lambda v, e: _LONG.pack(v)),
+    c_uamqp.AMQPType.UUIDValue: (0x98, lambda v, e: v.bytes),
+    c_uamqp.AMQPType.BinaryValue: (0xb0, lambda v, e: _UINT.pack(len(v)) + v),
+    c_uamqp.AMQPType.StringValue: (0xb1, lambda v, e: _UINT.pack(len(v)) + v),
+    c_uamqp.AMQPType.SymbolValue: (0xb3, lambda v, e: _UINT.pack(len(v)) + v),
+}
+
+
+def _encode_array(values, element_type, out, encoding):
+    try:
+        constructor, encode_element = _ARRAY_ELEMENTS[element_type]
+    except KeyError:
+        raise TypeError("Unable to encode an AMQP array of {}.".format(element_type))
+    start = len(out)
+    out += _COMPOUND32.pack(0xf0, 0, 0)
+    out.append(constructor)
+    for value in values:
+        out += encode_element(value, encoding)
+    length = len(out) - start - 9
+    count = len(values)
+    if length + 1 <= 255 and count <= 255:
+        out[start:start + 9] = _COMPOUND8.pack(0xe0, length + 1, count)
+    else:
+        out[start:start + 9] = _COMPOUND32.pack(0xf0, length + 4, count)
+
+
+_C_SCALAR_ENCODERS = {
+    c_uamqp.AMQPType.NullValue: _encode_null,
+    c_uamqp.AMQPType.BoolValue: _encode_bool,
+    c_uamqp.AMQPType.UByteValue: lambda v, o, e: o.extend((0x50, v)),
+    c_uamqp.AMQPType.UShortValue: lambda v, o, e: o.extend(b'\x60' + _USHORT.pack(v)),
+    c_uamqp.AMQPType.UIntValue: _encode_uint,
+    c_uamqp.AMQPType.ULongValue: _encode_ulong,
+    c_uamqp.AMQPType.ByteValue: lambda v, o, e: o.extend(b'\x51' + _BYTE.pack(v)),
+    c_uamqp.AMQPType.ShortValue: lambda v, o, e: o.extend(b'\x61' + _SHORT.pack(v)),
+    c_uamqp.AMQPType.IntValue: _encode_int,
+    c_uamqp.AMQPType.LongValue: _encode_long,
+    c_uamqp.AMQPType.FloatValue: lambda v, o, e: o.extend(b'\x72' + _FLOAT.pack(v)),
+    c_uamqp.AMQPType.DoubleValue: _encode_double,
+    c_uamqp.AMQPType.CharValue: lambda v, o, e: o.extend(b'\x73' + _UINT.pack(ord(v))),
+    c_uamqp.AMQPType.TimestampValue: _encode_timestamp,
+    c_uamqp.AMQPType.UUIDValue: _encode_uuid,
+    c_uamqp.AMQPType.BinaryValue: _encode_binary,
+    c_uamqp.AMQPType.StringValue: _encode_string_bytes,
+    c_uamqp.AMQPType.SymbolValue: _encode_symbol,
+}
+
+
+def _encode_c_value(value, out, encoding):
+    value_type = value.type
+    if value_type == c_uamqp.AMQPType.ArrayValue and len(value):
+        _encode_array([v.value for v in value], value[0].type, out, encoding)
+    elif value_type in _C_SCALAR_ENCODERS:
+        _C_SCALAR_ENCODERS[value_type](value.value, out, encoding)
+    else:
+        # Compound and described C values are encoded by the C library.
+        encoded = []
+        c_uamqp.enocde_batch_value(value, encoded)
+        out += b"".join(encoded)
+
+
+_ENCODERS = {
+    type(None): _encode_null,
+    bool: _encode_bool,
+    int: _encode_int,
+    float: _encode_double,
+    str: _encode_str,
+    bytes: _encode_string_bytes,
+    bytearray: _encode_binary,
+    memoryview: _encode_binary,
+    uuid.UUID: _encode_uuid,
+    datetime.datetime: _encode_timestamp,
+    list: _encode_list,
+    tuple: _encode_list,
+    set: _encode_list,
+    dict: _encode_map,
+}
+
+
+def _encode_value(value, out, encoding):
+    try:
+        encoder = _ENCODERS[type(value)]
+    except KeyError:
+        if isinstance(value, types.AMQPType):
+            _encode_c_value(value.c_data, out, encoding)
+            return
+        elif isinstance(value, c_uamqp.AMQPValue):
+            _encode_c_value(value, out, encoding)
+            return
+        for value_type, encoder in _ENCODERS.items():
+            if value_type is not type(None) and isinstance(value, value_type):
+                break
+        else:
+            raise TypeError("Unable to encode value of type {} as AMQP.".format(type(value)))
+    encoder(value, out, encoding)
+
+
+def encode(value, out=None, encoding='UTF-8'):
+    """Encode a Python value into AMQP 1.0 wire format, writing directly
+    into a buffer without building a C AMQP value.
+    - None => null
+    - bool => boolean
+    - int => the smallest of int, long or ulong that will hold the value
+    - float => double
+    - str => string
+    - bytes/bytearray/memoryview => binary
+    - uuid.UUID => uuid
+    - datetime.datetime => timestamp (naive datetimes are assumed to be UTC)
+    - list/set/tuple => list
+    - dict => map
+    - ~uamqp.types.AMQPType and ~uamqp.c_uamqp.AMQPValue => the wrapped AMQP type
+
+    :param value: The value to encode.
+    :param out: The buffer to write to. If not supplied, a new buffer will be created.
+    :type out: bytearray
+    :param encoding: The encoding to use for str values. Default is 'UTF-8'.
+    :type encoding: str
+    :returns: bytearray
+    :raises: TypeError if the value cannot be encoded.
+    """
+    if out is None:
+        out = bytearray()
+    _encode_value(value, out, encoding)
+    return out
+
+
+def encode_data_section(data, out=None):
+    """Encode binary data as an AMQP Data message section.
+
+    :param data: The section data.
+    :type data: bytes
+    :param out: The buffer to write to. If not supplied, a new buffer will be created.
+    :type out: bytearray
+    :returns: bytearray
+    """
+    if out is None:
+        out = bytearray()
+    out += _DATA_SECTION
+    _encode_binary(data, out, None)
+    return out
+
+
+def encode_sequence_section(sequence, out=None, encoding='UTF-8'):
+    """Encode a list as an AMQP Sequence message section.
+
+    :param sequence: The section values.
+    :type sequence: list
+    :param out: The buffer to write to. If not supplied, a new buffer will be created.
+    :type out: bytearray
+    :param encoding: The encoding to use for str values. Default is 'UTF-8'.
+    :type encoding: str
+    :returns: bytearray
+    """
+    if out is None:
+        out = bytearray()
+    out += _AMQP_SEQUENCE_SECTION
+    _encode_list(list(sequence), out, encoding)
+    return out
+
+
+def encode_value_section(value, out=None, encoding='UTF-8'):
+    """Encode a value as an AMQP Value message section.
+
+    :param value: The section value.
+    :param out: The buffer to write to. If not supplied, a new buffer will be created.
+    :type out: bytearray
+    :param encoding: The encoding to use for str values. Default is 'UTF-8'.
+    :type encoding: str
+    :returns: bytearray
+    """
+    if out is None:
+        out = bytearray()
+    out += _AMQP_VALUE_SECTION
+    _encode_value(value, out, encoding)
+    return out
+
+
+def _variable_size(length):
+    return length + (2 if length <= 255 else 5)
+
+
+def _compound_size(length, count):
+    # Mirrors _encode_compound, where the small form counts the count byte in its size.
+    return length + (3 if length + 1 <= 255 and count <= 255 else 9)
+
+
+def _size_int(value, encoding):  # pylint: disable=unused-argument
+    if -128 <= value <= 127:
+        return 2
+    elif -2147483648 <= value <= 2147483647:
+        return 5
+    elif -9223372036854775808 <= value <= 18446744073709551615:
+        return 9
+    raise OverflowError("Value {} is too large to be encoded as an AMQP integer.".format(value))
+
+
+def _size_list(value, encoding):
+    if not value:
+        return 1
+    return _compound_size(sum(_size_value(v, encoding) for v in value), len(value))
+
+
+def _size_map(value, encoding):
+    length = sum(_size_value(k, encoding) + _size_value(v, encoding) for k, v in value.items())
+    return _compound_size(length, len(value) * 2)
+
+
+_ARRAY_ELEMENT_SIZES = {
+    c_uamqp.AMQPType.BoolValue: 1,
+    c_uamqp.AMQPType.UByteValue: 1,
+    c_uamqp.AMQPType.UShortValue: 2,
+    c_uamqp.AMQPType.UIntValue: 4,
+    c_uamqp.AMQPType.ULongValue: 8,
+    c_uamqp.AMQPType.ByteValue: 1,
+    c_uamqp.AMQPType.ShortValue: 2,
+    c_uamqp.AMQPType.IntValue: 4,
+    c_uamqp.AMQPType.LongValue: 8,
+    c_uamqp.AMQPType.FloatValue: 4,
+    c_uamqp.AMQPType.DoubleValue: 8,
+    c_uamqp.AMQPType.TimestampValue: 8,
+    c_uamqp.AMQPType.UUIDValue: 16,
+}
+
+_VARIABLE_ARRAY_ELEMENTS = (
+    c_uamqp.AMQPType.BinaryValue,
+    c_uamqp.AMQPType.StringValue,
+    c_uamqp.AMQPType.SymbolValue,
+)
+
+_C_SCALAR_SIZES = {
+    c_uamqp.AMQPType.NullValue: lambda v: 1,
+    c_uamqp.AMQPType.BoolValue: lambda v: 1,
+    c_uamqp.AMQPType.UByteValue: lambda v: 2,
+    c_uamqp.AMQPType.UShortValue: lambda v: 3,
+    c_uamqp.AMQPType.UIntValue: lambda v: 1 if v == 0 else 2 if v <= 255 else 5,
+    c_uamqp.AMQPType.ULongValue: lambda v: 1 if v == 0 else 2 if v <= 255 else 9,
+    c_uamqp.AMQPType.ByteValue: lambda v: 2,
+    c_uamqp.AMQPType.ShortValue: lambda v: 3,
+    c_uamqp.AMQPType.IntValue: lambda v: 2 if -128 <= v <= 127 else 5,
+    c_uamqp.AMQPType.LongValue: lambda v: 2 if -128 <= v <= 127 else 9,
+    c_uamqp.AMQPType.FloatValue: lambda v: 5,
+    c_uamqp.AMQPType.DoubleValue: lambda v: 9,
+    c_uamqp.AMQPType.CharValue: lambda v: 5,
+    c_uamqp.AMQPType.TimestampValue: lambda v: 9,
+    c_uamqp.AMQPType.UUIDValue: lambda v: 17,
+    c_uamqp.AMQPType.BinaryValue: lambda v: _variable_size(len(v)),
+    c_uamqp.AMQPType.StringValue: lambda v: _variable_size(len(v)),
+    c_uamqp.AMQPType.SymbolValue: lambda v: _variable_size(len(v)),
+}
+
+
+def _size_c_value(value):
+    value_type = value.type
+    if value_type == c_uamqp.AMQPType.ArrayValue and len(value):
+        element_type = value[0].type
+        if element_type in _ARRAY_ELEMENT_SIZES:
+            length = 1 + _ARRAY_ELEMENT_SIZES[element_type] * len(value)
+        elif element_type in _VARIABLE_ARRAY_ELEMENTS:
+            length = 1 + sum(4 + len(v.value) for v in value)
+        else:
+            raise TypeError("Unable to encode an AMQP array of {}.".format(element_type))
+        return _compound_size(length, len(value))
+    elif value_type in _C_SCALAR_SIZES:
+        return _C_SCALAR_SIZES[value_type](value.value)
+    # Compound and described C values are encoded by the C library.
+    return value.get_encoded_size()
+
+
+_SIZES = {
+    type(None): lambda v, e: 1,
+    bool: lambda v, e: 1,
+    int: _size_int,
+    float: lambda v, e: 9,
+    str: lambda v, e: 5 if len(v) == 1 else _variable_size(len(v.encode(e))),
+    bytes: lambda v, e: _variable_size(len(v)),
+    bytearray: lambda v, e: _variable_size(len(v)),
+    memoryview: lambda v, e: _variable_size(len(v)),
+    uuid.UUID: lambda v, e: 17,
+    datetime.datetime: lambda v, e: 9,
+    list: _size_list,
+    tuple: _size_list,
+    set: _size_list,
+    dict: _size_map,
+}
+
+
+def _size_value(value, encoding):
+    try:
+        size = _SIZES[type(value)]
+    except KeyError:
+        if isinstance(value, types.AMQPType):
+            return _size_c_value(value.c_data)
+        elif isinstance(value, c_uamqp.AMQPValue):
+            return _size_c_value(value)
+        for value_type, size in _SIZES.items():
+            if value_type is not type(None) and isinstance(value, value_type):
+                break
+        else:
+            raise TypeError("Unable to encode value of type {} as AMQP.".format(type(value)))
+    return size(value, encoding)
+
+
+def encoded_size(value, encoding='UTF-8'):
+    """Calculate the exact size in bytes of a Python value once encoded into
+    AMQP 1.0 wire format, without encoding it or building a C AMQP value.
+    The size matches the output of `encode` for the same value, and can be used
+    to decide whether a value will fit in a message before converting it.
+
+    :param value: The value to measure.
+    :param encoding: The encoding to use for str values. Default is 'UTF-8'.
+    :type encoding: str
+    :returns: int
+    :raises: TypeError if the value cannot be encoded.
+    """
+    return _size_value(value, encoding)
+
+
+# Message section descriptor codes.
+HEADER = 0x70
+DELIVERY_ANNOTATIONS = 0x71
+MESSAGE_ANNOTATIONS = 0x72
+PROPERTIES = 0x73
+APPLICATION_PROPERTIES = 0x74
+DATA = 0x75
+AMQP_SEQUENCE = 0x76
+AMQP_VALUE = 0x77
+FOOTER = 0x78
+
+_SECTION_SYMBOLS = {
+    b"amqp:header:list": HEADER,
+    b"amqp:delivery-annotations:map": DELIVERY_ANNOTATIONS,
+    b"amqp:message-annotations:map": MESSAGE_ANNOTATIONS,
+    b"amqp:properties:list": PROPERTIES,
+    b"amqp:application-properties:map": APPLICATION_PROPERTIES,
+    b"amqp:data:binary": DATA,
+    b"amqp:amqp-sequence:list": AMQP_SEQUENCE,
+    b"amqp:amqp-value:*": AMQP_VALUE,
+    b"amqp:footer:map": FOOTER,
+}
+
+
+def decode(data, offset=0, native=True, encoding='UTF-8'):
+    """Decode an AMQP encoded value directly into Python objects in a single
+    pass in C. Described values are decoded to the value without the descriptor.
+    - null => None
+    - boolean => bool
+    - integer types => int
+    - float/double => float
+    - char => str
+    - string => str (or bytes if `native` is `False`)
+    - binary/symbol => bytes
+    - timestamp => datetime.datetime in UTC (or int milliseconds if `native` is `False`)
+    - uuid => uuid.UUID
+    - list/array => list
+    - map => dict
+
+    :param data: The encoded data.
+    :type data: bytes, bytearray or memoryview
+    :param offset: The position in the data at which the value starts.
+    :type offset: int
+    :param native: Whether to decode strings and timestamps to str and datetime.
+     If `False`, values will match the `value` of the equivalent ~uamqp.c_uamqp.AMQPValue.
+     Default is `True`.
+    :type native: bool
+    :param encoding: The encoding used to decode strings. Default is 'UTF-8'.
+    :type encoding: str
+    :returns: The decoded value.
+    """
+    return c_uamqp.decode_value(data, offset, native, encoding)[0]
+
+
+def iter_sections(data):
+    """Iterate over the sections of an encoded message without decoding them.
+    Each section is returned as its descriptor code along with the start and end
+    positions of the section value in the data, so that individual sections can
+    be decoded on demand with `decode(data, offset=start)`.
+
+    :param data: The encoded message.
+    :type data: bytes, bytearray or memoryview
+    :returns: generator[tuple[int, int, int]]
+    :raises: ValueError if the data is not a sequence of message sections.
+    """
+    offset = 0
+    length = len(data)
+    while offset < length:
+        if data[offset] != 0x00:
+            raise ValueError("Encoded data at position {} is not a message section.".format(offset))
+        descriptor, start = c_uamqp.decode_value(data, offset + 1, False)
+        end = c_uamqp.skip_value(data, start)
+        yield _SECTION_SYMBOLS.get(descriptor, descriptor), start, end
+        offset = end
@@ -7,6 +7,7 @@
 import logging
 import uuid
 import threading
+import time
 
 import uamqp
 from uamqp import c_uamqp
@@ -15,6 +16,26 @@ from uamqp import utils
 
 _logger = logging.getLogger(__name__)
 
+# Trace logs of C struct lifetimes are a process-wide setting, so they are
+# enabled for as long as at least one debug Connection is open.
+_trace_lock = threading.Lock()
+_trace_connections = 0
+
+
+def _acquire_trace():
+    global _trace_connections  # pylint: disable=global-statement
+    with _trace_lock:
+        _trace_connections += 1
+        c_uamqp.set_trace_enabled(True)
+
+
+def _release_trace():
+    global _trace_connections  # pylint: disable=global-statement
+    with _trace_lock:
+        _trace_connections -= 1
+        if not _trace_connections:
+            c_uamqp.set_trace_enabled(False)
+
 
 class Connection:
     """An AMQP Connection. A single Connection can have multiple Sessions, and
@@ -53,7 +74,8 @@ class Connection:
      0.0 and 1.0 inclusive. Default is 0.5.
     :type remote_idle_timeout_empty_frame_send_ratio: float
     :param debug: Whether to turn on network trace logs. If `True`, trace logs
-     will be logged at INFO level. Default is `False`.
+     will be logged at INFO level. This will also enable debug logs of C struct
+     lifetimes for the process until the Connection is destroyed. Default is `False`.
     :type debug: bool
     :param encoding: The encoding to use for parameters supplied as strings.
      Default is 'UTF-8'
@@ -70,16 +92,21 @@ class Connection:
                  debug=False,
                  encoding='UTF-8'):
         uamqp._Platform.initialize()  # pylint: disable=protected-access
+        c_uamqp.update_log_level()
         self.container_id = container_id if container_id else str(uuid.uuid4())
         self.hostname = hostname
         self.auth = sasl
         self.cbs = None
+        self._sasl_client = sasl._take_layers()  # pylint: disable=protected-access
         self._conn = c_uamqp.create_connection(
-            sasl.sasl_client.get_client(),
+            self._sasl_client.get_client(),
             hostname.encode(encoding) if isinstance(hostname, str) else hostname,
             self.container_id.encode(encoding) if isinstance(self.container_id, str) else self.container_id,
             self)
         self._conn.set_trace(debug)
+        self._trace = debug
+        if debug:
+            _acquire_trace()
         self._sessions = []
         self._lock = threading.Lock()
         self._state = c_uamqp.ConnectionState.UNKNOWN
@@ -131,8 +158,14 @@ class Connection:
         if self.cbs:
             self.auth.close_authenticator()
         self._conn.destroy()
-        self.auth.close()
-        uamqp._Platform.deinitialize()  # pylint: disable=protected-access
+        self._sasl_client.close()
+        self._stop_trace()
+
+    def _stop_trace(self):
+        """Release this Connection's hold on the process-wide trace logs."""
+        if self._trace:
+            self._trace = False
+            _release_trace()
 
     def work(self):
         """Perform a single Connection iteration."""
@@ -177,3 +210,191 @@ class Connection:
     @property
     def remote_max_frame_size(self):
         return self._conn.remote_max_frame_size
+
+
+class _PooledConnection:
+    """A Connection held by a ~uamqp.connection.ConnectionPool, along with the
+    number of clients currently using it.
+    """
+
+    def __init__(self, key, connection):
+        self.key = key
+        self.connection = connection
+        self.references = 0
+        self.idle_since = time.monotonic()
+        self.detached = False
+
+
+class ConnectionPool:
+    """A pool of Connections that are shared between clients. Connections are
+    keyed by hostname, port and authentication identity, so that clients
+    connecting to the same endpoint with the same credentials will share a single
+    Connection and CBS authentication Session rather than each performing their own
+    TLS and SASL handshakes. Connections are reference-counted, and once no longer
+    in use are kept open until they have been idle for longer than the idle timeout.
+    A pool can be passed to a client with the `connection_pool` keyword argument.
+
+    :param idle_timeout: The time in seconds after which a Connection that is not
+     in use by any client will be closed. The default is 60 seconds.
+    :type idle_timeout: float
+    """
+
+    _unhealthy_states = (
+        c_uamqp.ConnectionState.CLOSE_PIPE,
+        c_uamqp.ConnectionState.CLOSE_RCVD,
+        c_uamqp.ConnectionState.CLOSE_SENT,
+        c_uamqp.ConnectionState.DISCARDING,
+        c_uamqp.ConnectionState.END,
+        c_uamqp.ConnectionState.ERROR)
+    _unhealthy_auth_status = (
+        c_uamqp.AUTH_STATUS_TIMEOUT,
+        c_uamqp.AUTH_STATUS_ERROR,
+        c_uamqp.AUTH_STATUS_FAILURE)
+
+    def __init__(self, idle_timeout=60):
+        self.idle_timeout = idle_timeout
+        self._pooled = {}
+        self._in_use = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        """Use the pool in a context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Close all pooled Connections when exiting a context manager."""
+        self.close()
+
+    def __len__(self):
+        return len(self._pooled)
+
+    @staticmethod
+    def _get_key(hostname, auth):
+        """The identity of a Connection, such that any client with the same
+        key can safely share the Connection and its authentication.
+
+        :param hostname: The hostname of the AMQP service.
+        :type hostname: str or bytes
+        :param auth: The authentication for the Connection.
+        :type auth: ~uamqp.authentication.AMQPAuth
+        :returns: tuple
+        """
+        hostname = hostname.encode('UTF-8') if isinstance(hostname, str) else hostname
+        username = getattr(auth, 'username', None)
+        password = getattr(auth, 'password', None)
+        token = None
+        if not (username and password):
+            # Without a key to refresh it from, a CBS token is itself the credential.
+            token = getattr(auth, 'token', None)
+        return (
+            hostname,
+            getattr(auth, 'port', None),
+            type(auth),
+            username,
+            password,
+            getattr(auth, 'audience', None),
+            getattr(auth, 'token_type', None),
+            token,
+            getattr(auth, 'get_token', None),
+            getattr(auth, 'cert_file', None))
+
+    def _is_healthy(self, connection):
+        """Whether a pooled Connection can be handed out to another client.
+
+        :param connection: The pooled Connection.
+        :type connection: ~uamqp.Connection
+        :returns: bool
+        """
+        if connection._state in self._unhealthy_states:  # pylint: disable=protected-access
+            return False
+        if connection.cbs and connection.cbs.get_status() in self._unhealthy_auth_status:
+            return False
+        return True
+
+    def _discard(self, pooled):
+        """Remove a Connection from the pool, closing it if no client is using it.
+
+        :param pooled: The pooled Connection.
+        :type pooled: ~uamqp.connection._PooledConnection
+        """
+        if not pooled.detached:
+            pooled.detached = True
+            del self._pooled[pooled.key]
+        if pooled.references == 0:
+            _logger.debug("Closing pooled connection to {}.".format(pooled.key[0]))
+            del self._in_use[id(pooled.connection)]
+            pooled.connection.destroy()
+
+    def acquire(self, hostname, auth, connection_type=None, **kwargs):
+        """Get a Connection for the given endpoint and credentials. An open, healthy
+        Connection will be returned from the pool if there is one, otherwise a new
+        Connection will be created and added to the pool. Every acquired Connection
+        must be returned with `release`.
+
+        :param hostname: The hostname of the AMQP service.
+        :type hostname: str or bytes
+        :param auth: The authentication for the Connection. If a pooled Connection is
+         returned, it will have the authentication with which it was first created.
+        :type auth: ~uamqp.authentication.AMQPAuth
+        :param connection_type: The type of Connection to create. Default is ~uamqp.Connection.
+        :type connection_type: type
+        :param kwargs: Any additional keyword arguments with which to create a new Connection.
+        :returns: ~uamqp.Connection
+        """
+        key = self._get_key(hostname, auth)
+        with self._lock:
+            self._evict_idle()
+            pooled = self._pooled.get(key)
+            if pooled and not self._is_healthy(pooled.connection):
+                _logger.debug("Discarding unhealthy pooled connection to {}.".format(pooled.key[0]))
+                self._discard(pooled)
+                pooled = None
+            if not pooled:
+                connection = (connection_type or Connection)(hostname, auth, **kwargs)
+                pooled = _PooledConnection(key, connection)
+                self._pooled[key] = pooled
+                self._in_use[id(connection)] = pooled
+            pooled.references += 1
+            return pooled.connection
+
+    def release(self, connection):
+        """Return a Connection that was acquired from the pool. Once it is no longer in
+        use by any client, the Connection will be kept open until the idle timeout.
+
+        :param connection: The Connection to release.
+        :type connection: ~uamqp.Connection
+        :raises: ValueError if the Connection was not acquired from this pool.
+        """
+        with self._lock:
+            try:
+                pooled = self._in_use[id(connection)]
+            except KeyError:
+                raise ValueError("Connection was not acquired from this pool.")
+            pooled.references -= 1
+            if pooled.references > 0:
+                return
+            pooled.idle_since = time.monotonic()
+            if pooled.detached or not self._is_healthy(connection):
+                self._discard(pooled)
+
+    def _evict_idle(self):
+        """Close pooled Connections that have not been used for the idle timeout."""
+        now = time.monotonic()
+        for pooled in list(self._pooled.values()):
+            if pooled.references == 0 and now - pooled.idle_since >= self.idle_timeout:
+                self._discard(pooled)
+
+    def evict_idle(self):
+        """Close any pooled Connections that have not been used for the idle timeout.
+        This also happens whenever a Connection is acquired.
+        """
+        with self._lock:
+            self._evict_idle()
+
+    def close(self):
+        """Close all pooled Connections that are not in use. Connections that are
+        still in use will be closed when they are released.
+        """
+        with self._lock:
+            for pooled in list(self._pooled.values()):
+                self._discard(pooled)
@@ -18,6 +18,10 @@ OPERATION = b"operation"
 READ_OPERATION = b"READ"
 MGMT_TARGET = b"$management"
 MESSAGE_SEND_RETRIES = 3
+COLUMNAR_ANNOTATIONS = {
+    b"x-opt-sequence-number": 'q',
+    b"x-opt-offset": 'q',
+    b"x-opt-enqueued-time": 'q'}
 
 
 BATCH_MESSAGE_FORMAT = c_uamqp.AMQP_BATCH_MESSAGE_FORMAT
@@ -4,9 +4,11 @@
 # license information.
 #--------------------------------------------------------------------------
 
+import array
 import logging
 
 from uamqp import c_uamqp
+from uamqp import codec
 from uamqp import utils
 from uamqp import constants
 
@@ -65,6 +67,7 @@ class Message:
         self.state = constants.MessageState.WaitingToBeSent
         self.idle_time = 0
         self._retries = 0
+        self._link_detaching = False
         self._encoding = encoding
         self.on_send_complete = None
         self.properties = None
@@ -150,6 +153,9 @@ class Message:
         :type error: ~Exception
         """
         result = constants.MessageSendResult(result)
+        if self._link_detaching:
+            _logger.debug("Ignoring send result from a detaching Link: {}, {}".format(result, error))
+            return
         if not error and result == constants.MessageSendResult.Error and self._retries < constants.MESSAGE_SEND_RETRIES:
             self._retries += 1
             _logger.debug("Message error, retrying. Attempts: {}".format(self._retries))
@@ -190,6 +196,23 @@ class Message:
         """
         return [self]
 
+    def iter_batch(self):
+        """Iterate over the messages contained in a batched message. If this
+        message has the batch message format, each Data section of the body is an
+        encoded message, and these will be returned as ~uamqp.message.EncodedMessage
+        objects that are decoded lazily from the original body data. If this message
+        is not a batched message, only the message itself will be returned.
+
+        :returns: generator[~uamqp.Message or ~uamqp.message.EncodedMessage]
+        """
+        if not self._message or self._message.message_format != constants.BATCH_MESSAGE_FORMAT:
+            yield self
+            return
+        if not isinstance(self._body, DataBody):
+            raise ValueError("Batched message body must contain Data sections.")
+        for data in self._body.data:
+            yield EncodedMessage(data, encoding=self._encoding)
+
     def get_message(self):
         """Get the underlying C message from this object.
         :returns: ~uamqp.c_uamqp.cMessage
@@ -312,12 +335,9 @@ class BatchMessage(Message):
             body_size = 0
             try:
                 for data in self._body_gen:
-                    message_segment = []
                     if isinstance(data, str):
                         data = data.encode(self._encoding)
-                    batch_data = c_uamqp.create_data(data)
-                    c_uamqp.enocde_batch_value(batch_data, message_segment)
-                    combined = b"".join(message_segment)
+                    combined = bytes(codec.encode_data_section(data))
                     body_size += len(combined)
                     if (body_size + message_size) > self.max_message_length:
                         new_message.on_send_complete = self.on_send_complete
@@ -349,12 +369,9 @@ class BatchMessage(Message):
         body_size = 0
 
         for data in self._body_gen:
-            message_segment = []
             if isinstance(data, str):
                 data = data.encode(self._encoding)
-            batch_data = c_uamqp.create_data(data)
-            c_uamqp.enocde_batch_value(batch_data, message_segment)
-            combined = b"".join(message_segment)
+            combined = bytes(codec.encode_data_section(data))
             body_size += len(combined)
             if (body_size + message_size) > self.max_message_length:
                 raise ValueError(
@@ -365,6 +382,228 @@ class BatchMessage(Message):
         return [new_message]
 
 
+class EncodedMessage:
+    """A message held in its AMQP encoded form, such as one of the messages
+    unpacked from a received batched message. The message sections are located
+    on first access and each section is only decoded when it is requested. Body
+    data is returned as views of the encoded data rather than copies.
+
+    :ivar message_format: The message format. Messages within a batch are
+     always standard AMQP messages.
+    :vartype message_format: int
+
+    :param data: The encoded message sections.
+    :type data: bytes or memoryview
+    :param encoding: The encoding to use for parameters supplied as strings.
+     Default is 'UTF-8'
+    :type encoding: str
+    """
+
+    message_format = 0
+
+    def __init__(self, data, encoding='UTF-8'):
+        self._data = memoryview(data)
+        self._encoding = encoding
+        self._sections = None
+        self._body_sections = None
+        self._decoded = {}
+
+    def __str__(self):
+        return str(self.get_data())
+
+    def _locate_sections(self):
+        if self._sections is not None:
+            return
+        self._sections = {}
+        self._body_sections = []
+        for section, start, end in codec.iter_sections(self._data):
+            if section in (codec.DATA, codec.AMQP_SEQUENCE, codec.AMQP_VALUE):
+                self._body_sections.append((section, start, end))
+            else:
+                self._sections[section] = start
+
+    def _decode_section(self, section):
+        if section not in self._decoded:
+            self._locate_sections()
+            start = self._sections.get(section)
+            self._decoded[section] = None if start is None else codec.decode(
+                self._data, offset=start, native=False, encoding=self._encoding)
+        return self._decoded[section]
+
+    @property
+    def header(self):
+        """The message header fields as a list."""
+        return self._decode_section(codec.HEADER)
+
+    @property
+    def delivery_annotations(self):
+        return self._decode_section(codec.DELIVERY_ANNOTATIONS)
+
+    @property
+    def annotations(self):
+        return self._decode_section(codec.MESSAGE_ANNOTATIONS)
+
+    @property
+    def properties(self):
+        """The message properties fields as a list."""
+        return self._decode_section(codec.PROPERTIES)
+
+    @property
+    def application_properties(self):
+        return self._decode_section(codec.APPLICATION_PROPERTIES)
+
+    @property
+    def footer(self):
+        return self._decode_section(codec.FOOTER)
+
+    @property
+    def body_type(self):
+        """The type of the message body.
+
+        :rtype: ~uamqp.c_uamqp.MessageBodyType
+        """
+        self._locate_sections()
+        if not self._body_sections:
+            return c_uamqp.MessageBodyType.NoneType
+        return _BODY_TYPES[self._body_sections[0][0]]
+
+    def _iter_body(self):
+        for section, start, _ in self._body_sections:
+            if section == codec.DATA:
+                # Skip the binary constructor and its 1 or 4 byte length.
+                size = 1 if self._data[start] == 0xa0 else 4
+                length = int.from_bytes(self._data[start + 1:start + 1 + size], 'big')
+                yield self._data[start + 1 + size:start + 1 + size + length]
+            else:
+                yield codec.decode(self._data, offset=start, native=False, encoding=self._encoding)
+
+    def get_data(self):
+        """Get the body data of the message. For a Data body this will be a generator of
+        memoryviews over the encoded data, for a Sequence body a generator of lists, and
+        for a Value body the decoded value.
+
+        :returns: generator or value
+        """
+        self._locate_sections()
+        if self._body_sections and self._body_sections[0][0] == codec.AMQP_VALUE:
+            return next(self._iter_body())
+        return self._iter_body()
+
+
+_BODY_TYPES = {
+    codec.DATA: c_uamqp.MessageBodyType.DataType,
+    codec.AMQP_SEQUENCE: c_uamqp.MessageBodyType.SequenceType,
+    codec.AMQP_VALUE: c_uamqp.MessageBodyType.ValueType,
+}
+
+
+class ColumnarBatch:
+    """A batch of received messages stored by column rather than by message.
+    The bodies of all the messages are held in a single contiguous buffer,
+    and the body of message `i` is found between `offsets[i]` and `offsets[i + 1]`.
+    Selected message annotations are held in typed arrays, with one entry per
+    message, so that the batch can be processed with vectorized operations.
+
+    :ivar body: The concatenated body data of all the messages in the batch.
+    :vartype body: memoryview
+    :ivar offsets: The start position of each message body in the body buffer,
+     followed by the total length of the buffer.
+    :vartype offsets: array.array
+    :ivar annotations: The extracted annotation values, keyed by annotation name.
+     Where a message does not have a given annotation, the value will be recorded
+     as -1 for signed arrays, 0 for unsigned arrays and NaN for floating point arrays.
+    :vartype annotations: dict[bytes, array.array]
+
+    :param body: The concatenated body data.
+    :type body: bytearray
+    :param offsets: The body offsets.
+    :type offsets: array.array
+    :param annotations: The annotation columns.
+    :type annotations: dict[bytes, array.array]
+    """
+
+    def __init__(self, body, offsets, annotations):
+        self.body = memoryview(body)
+        self.offsets = offsets
+        self.annotations = annotations
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("Index is out of range.")
+        return self.body[self.offsets[index]:self.offsets[index + 1]]
+
+    @classmethod
+    def from_messages(cls, messages, annotations=None, encoding='UTF-8'):
+        """Create a columnar batch from a list of received messages. Only messages
+        with a Data body or a bytes/str Value body can be stored in a columnar batch.
+        Raw message bodies (as returned by a client receiving with `raw_bodies=True`)
+        can also be included, although they will have no annotation values.
+
+        :param messages: The received messages.
+        :type messages: list[~uamqp.Message, ~uamqp.message.EncodedMessage or bytes]
+        :param annotations: The message annotations to extract, mapped to the
+         `array` type code in which they will be stored. The default extracts
+         `x-opt-sequence-number`, `x-opt-offset` and `x-opt-enqueued-time` as
+         signed 64-bit integers.
+        :type annotations: dict[bytes, str]
+        :param encoding: The encoding to use for str body values. Default is 'UTF-8'.
+        :type encoding: str
+        :returns: ~uamqp.message.ColumnarBatch
+        :raises: TypeError if a message body cannot be stored as bytes.
+        """
+        annotations = annotations or constants.COLUMNAR_ANNOTATIONS
+        body = bytearray()
+        offsets = array.array('Q', [0])
+        columns = {key: array.array(code) for key, code in annotations.items()}
+        for message in messages:
+            if isinstance(message, bytes):
+                body += message
+                offsets.append(len(body))
+                for column in columns.values():
+                    column.append(cls._missing_value(column))
+                continue
+            data = message.get_data()
+            if isinstance(message, EncodedMessage):
+                body_type = message.body_type
+            else:
+                body_type = message._body.type if data is not None else None  # pylint: disable=protected-access
+            if data is None or body_type == c_uamqp.MessageBodyType.NoneType:
+                pass
+            elif body_type == c_uamqp.MessageBodyType.DataType:
+                for section in data:
+                    body += section
+            elif isinstance(data, bytes):
+                body += data
+            elif isinstance(data, str):
+                body += data.encode(encoding)
+            else:
+                raise TypeError("Message body of type {} cannot be stored in a columnar batch.".format(type(data)))
+            offsets.append(len(body))
+            message_annotations = message.annotations or {}
+            for key, column in columns.items():
+                value = message_annotations.get(key)
+                if value is None:
+                    column.append(cls._missing_value(column))
+                elif column.typecode in 'fd':
+                    column.append(float(value))
+                else:
+                    column.append(int(value))
+        return cls(body, offsets, columns)
+
+    @staticmethod
+    def _missing_value(column):
+        if column.typecode in 'fd':
+            return float('nan')
+        return -1 if column.typecode.islower() else 0
+
+
 class MessageProperties:
     """Message properties.
     The properties that are actually used will depend on the service implementation.
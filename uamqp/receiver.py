@@ -56,6 +56,12 @@ class MessageReceiver():
     :param encoding: The encoding to use for parameters supplied as strings.
      Default is 'UTF-8'
     :type encoding: str
+    :param raw_bodies: Whether to deliver only the body bytes of received messages
+     rather than a full message. If `True`, the data sections of each message will
+     be extracted in C and passed to `on_message_received._raw_message_received` as bytes.
+     Messages with a Sequence or Value body will still be delivered as messages. Default
+     is `False`.
+    :type raw_bodies: bool
     """
 
     def __init__(self, session, source, target,
@@ -66,7 +72,8 @@ class MessageReceiver():
                  prefetch=None,
                  properties=None,
                  debug=False,
-                 encoding='UTF-8'):
+                 encoding='UTF-8',
+                 raw_bodies=False):
         # pylint: disable=protected-access
         if name:
             self.name = name.encode(encoding) if isinstance(name, str) else name
@@ -78,6 +85,7 @@ class MessageReceiver():
         self.source = source._address.value
         self.target = c_uamqp.Messaging.create_target(target)
         self.on_message_received = on_message_received
+        self.raw_bodies = raw_bodies
         self._conn = session._conn
         self._session = session
         self._link = c_uamqp.create_link(session._session, self.name, role.value, self.source, self.target)
@@ -117,7 +125,7 @@ class MessageReceiver():
          or the credentials are rejected.
         """
         try:
-            self._receiver.open(self.on_message_received)
+            self._receiver.open(self.on_message_received, self.raw_bodies)
         except ValueError:
             raise errors.AMQPConnectionError(
                 "Failed to open Message Receiver. "
@@ -0,0 +1,190 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import bisect
+import itertools
+import logging
+import zlib
+
+
+_logger = logging.getLogger(__name__)
+
+
+def _hash(data):
+    """A stable 32-bit hash of bytes. This is the CRC32 of the data followed
+    by the MurmurHash3 finalizer, so that similar keys are spread evenly around
+    the ring. Unlike the builtin `hash`, it is the same in every process.
+
+    :param data: The data to hash.
+    :type data: bytes
+    :returns: int
+    """
+    value = zlib.crc32(data)
+    value ^= value >> 16
+    value = (value * 0x85ebca6b) & 0xffffffff
+    value ^= value >> 13
+    value = (value * 0xc2b2ae35) & 0xffffffff
+    value ^= value >> 16
+    return value
+
+
+class PartitionRouter:
+    """Maps message keys to one of a set of targets using consistent hashing,
+    so that messages with the same key are always sent to the same target, and
+    adding or removing a target only moves the keys of that target. Each target
+    is placed on a hash ring a number of times in proportion to its weight, so
+    the weight of a target that receives hot keys can be lowered to move some of
+    its keys to other targets.
+
+    When a target is unavailable, for example because its Link is throttled or
+    reconnecting, its keys are routed to the next available target on the ring
+    until it is available again. Messages without a key are spread across the
+    available targets in turn.
+
+    The key of a message is taken from the `key_annotation` message annotation,
+    or can be extracted with a custom callable.
+
+    :param targets: The targets to route to.
+    :type targets: list[str or bytes or ~uamqp.Target]
+    :param weights: The relative weight of each target. The default weight is 1.
+    :type weights: dict
+    :param replicas: The number of points on the hash ring for a target of weight 1.
+     The default is 100.
+    :type replicas: int
+    :param key: A callable that returns the partition key of a message, or None.
+     By default the `key_annotation` annotation of the message is used.
+    :type key: callable[~uamqp.Message]
+    :param key_annotation: The message annotation that holds the partition key.
+     The default is `x-opt-partition-key`.
+    :type key_annotation: bytes
+    :param encoding: The encoding to use for keys and targets supplied as strings.
+     Default is 'UTF-8'
+    :type encoding: str
+    """
+
+    def __init__(self, targets, weights=None, replicas=100, key=None,
+                 key_annotation=b'x-opt-partition-key', encoding='UTF-8'):
+        if not targets:
+            raise ValueError("At least one target is required.")
+        self.replicas = replicas
+        self._targets = list(targets)
+        self._weights = dict(weights or {})
+        self._key = key
+        self._key_annotations = (key_annotation, key_annotation.decode(encoding))
+        self._encoding = encoding
+        self._next = itertools.count()
+        self._points = []
+        self._ring = []
+        self._build_ring()
+
+    @property
+    def targets(self):
+        return list(self._targets)
+
+    def _encode(self, value):
+        if isinstance(value, bytes):
+            return value
+        if isinstance(value, str):
+            return value.encode(self._encoding)
+        return str(value).encode(self._encoding)
+
+    def _build_ring(self):
+        """Place each target on the hash ring in proportion to its weight."""
+        ring = []
+        for target in self._targets:
+            name = self._encode(target)
+            count = int(round(self.replicas * self._weights.get(target, 1)))
+            ring.extend((_hash(name + b'#' + str(i).encode('ascii')), target) for i in range(count))
+        if not ring:
+            raise ValueError("At least one target must have a weight greater than 0.")
+        ring.sort(key=lambda p: p[0])
+        self._points = [p[0] for p in ring]
+        self._ring = [p[1] for p in ring]
+
+    def set_weight(self, target, weight):
+        """Change the weight of a target. Only keys routed to or from the target
+        will move.
+
+        :param target: The target.
+        :type target: str or bytes or ~uamqp.Target
+        :param weight: The new relative weight. A weight of 0 removes the target from the ring.
+        :type weight: float
+        """
+        if target not in self._targets:
+            raise ValueError("Unknown target: {}".format(target))
+        self._weights[target] = weight
+        self._build_ring()
+
+    def get_key(self, message):
+        """Get the partition key of a message.
+
+        :param message: The message.
+        :type message: ~uamqp.Message
+        :returns: The key, or None if the message has no partition key.
+        """
+        if self._key:
+            return self._key(message)
+        annotations = message.annotations
+        if not annotations:
+            return None
+        for annotation in self._key_annotations:
+            value = annotations.get(annotation)
+            if value is not None:
+                return value
+        return None
+
+    def route(self, key, available=None):
+        """Get the target for a partition key.
+
+        :param key: The partition key. If None, the next available target in turn
+         will be returned.
+        :type key: str or bytes or int
+        :param available: A callable that returns whether a target can currently
+         be sent to. If the target of the key is unavailable, the next available
+         target on the ring will be returned. If no target is available, the target
+         of the key will be returned regardless.
+        :type available: callable
+        :returns: The target.
+        """
+        if key is None:
+            count = len(self._targets)
+            start = next(self._next)
+            for i in range(count):
+                target = self._targets[(start + i) % count]
+                if not available or available(target):
+                    return target
+            return self._targets[start % count]
+        ring = self._ring
+        index = bisect.bisect(self._points, _hash(self._encode(key)))
+        if index == len(ring):
+            index = 0
+        target = ring[index]
+        if not available or available(target):
+            return target
+        checked = {target}
+        for i in range(1, len(ring)):
+            candidate = ring[(index + i) % len(ring)]
+            if candidate in checked:
+                continue
+            if available(candidate):
+                _logger.debug("Target {} unavailable, routing key to {}.".format(target, candidate))
+                return candidate
+            checked.add(candidate)
+            if len(checked) == len(self._targets):
+                break
+        return target
+
+    def route_message(self, message, available=None):
+        """Get the target for a message, based on its partition key.
+
+        :param message: The message.
+        :type message: ~uamqp.Message
+        :param available: A callable that returns whether a target can currently
+         be sent to.
+        :type available: callable
+        :returns: The target.
+        """
+        return self.route(self.get_key(message), available=available)
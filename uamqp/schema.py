@@ -0,0 +1,156 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import datetime
+import uuid
+
+from uamqp import c_uamqp
+from uamqp import types
+from uamqp import utils
+from uamqp.message import Message
+
+
+_FIELD_TYPES = {
+    bool: c_uamqp.AMQPType.BoolValue,
+    int: c_uamqp.AMQPType.LongValue,
+    float: c_uamqp.AMQPType.DoubleValue,
+    str: c_uamqp.AMQPType.StringValue,
+    bytes: c_uamqp.AMQPType.BinaryValue,
+    uuid.UUID: c_uamqp.AMQPType.UUIDValue,
+    datetime.datetime: c_uamqp.AMQPType.TimestampValue,
+    types.AMQPSymbol: c_uamqp.AMQPType.SymbolValue,
+    types.AMQPLong: c_uamqp.AMQPType.LongValue,
+    types.AMQPuLong: c_uamqp.AMQPType.ULongValue,
+}
+
+_SCALAR_TYPES = (
+    c_uamqp.AMQPType.BoolValue,
+    c_uamqp.AMQPType.UByteValue,
+    c_uamqp.AMQPType.UShortValue,
+    c_uamqp.AMQPType.UIntValue,
+    c_uamqp.AMQPType.ULongValue,
+    c_uamqp.AMQPType.ByteValue,
+    c_uamqp.AMQPType.ShortValue,
+    c_uamqp.AMQPType.IntValue,
+    c_uamqp.AMQPType.LongValue,
+    c_uamqp.AMQPType.FloatValue,
+    c_uamqp.AMQPType.DoubleValue,
+    c_uamqp.AMQPType.CharValue,
+    c_uamqp.AMQPType.TimestampValue,
+    c_uamqp.AMQPType.UUIDValue,
+    c_uamqp.AMQPType.BinaryValue,
+    c_uamqp.AMQPType.StringValue,
+    c_uamqp.AMQPType.SymbolValue,
+)
+
+
+def _get_field_type(field_type):
+    if field_type in _SCALAR_TYPES:
+        return field_type
+    try:
+        return _FIELD_TYPES[field_type]
+    except (KeyError, TypeError):
+        raise TypeError("Unsupported schema field type: {}".format(field_type))
+
+
+def _get_key_value(key, encoding):
+    if isinstance(key, str):
+        return c_uamqp.string_value(key.encode(encoding))
+    if isinstance(key, bytes):
+        return c_uamqp.string_value(key)
+    return utils.data_factory(key, encoding=encoding)
+
+
+class Schema:
+    """A fixed message shape, declared once as a mapping of field name to AMQP type.
+    The schema is compiled into an encoder that converts each field directly to
+    its declared type, validating the value as it goes, without the per-value type
+    detection of a general body. A matching decoder converts a received value
+    back into a dict of fields.
+
+    Field types can be given as a ~uamqp.c_uamqp.AMQPType, as one of the ~uamqp.types
+    classes (AMQPSymbol, AMQPLong or AMQPuLong), or as a Python type, where
+    int => long, float => double, str => string, bytes => binary,
+    datetime.datetime => timestamp and uuid.UUID => uuid.
+
+    :param fields: The fields of the message, in the order they will be encoded.
+    :type fields: dict or list[tuple]
+    :param descriptor: An optional descriptor, in which case the fields will be
+     encoded as an AMQP described type.
+    :type descriptor: ~uamqp.types.AMQPType or int or str
+    :param as_list: Whether the fields will be encoded positionally as a list rather
+     than as a map keyed by field name. The default is `False`.
+    :type as_list: bool
+    :param encoding: The encoding to use for str values. Default is 'UTF-8'.
+    :type encoding: str
+    :raises: TypeError if a field type is not supported.
+    """
+
+    def __init__(self, fields, descriptor=None, as_list=False, encoding='UTF-8'):
+        fields = list(fields.items()) if isinstance(fields, dict) else list(fields)
+        keys = [key for key, _ in fields]
+        if len(set(keys)) != len(keys):
+            raise ValueError("Schema field names must be unique.")
+        self.fields = [(key, _get_field_type(field_type)) for key, field_type in fields]
+        self.as_list = as_list
+        self._encoding = encoding
+        if descriptor is not None:
+            descriptor = utils.data_factory(descriptor, encoding=encoding)
+        self._descriptor = descriptor
+        self._schema = c_uamqp.create_schema(
+            keys,
+            [_get_key_value(k, encoding) for k in keys],
+            [t.value for _, t in self.fields],
+            as_list,
+            descriptor,
+            encoding)
+
+    def encode(self, value):
+        """Encode a dict of fields as a C AMQP value.
+
+        :param value: The field values.
+        :type value: dict
+        :returns: ~uamqp.c_uamqp.AMQPValue
+        :raises: ValueError if a field is missing, or TypeError/OverflowError if a
+         field value cannot be encoded as its declared type.
+        """
+        return self._schema.encode(value)
+
+    def decode(self, value):
+        """Decode a received message body or C AMQP value into a dict of fields.
+
+        :param value: The message or value to decode.
+        :type value: ~uamqp.message.Message or ~uamqp.c_uamqp.AMQPValue
+        :returns: dict
+        :raises: ValueError if the value does not have the shape of the schema, or
+         TypeError if a field is not of its declared type.
+        """
+        if isinstance(value, Message):
+            c_message = value.get_message()
+            if c_message.body_type == c_uamqp.MessageBodyType.SequenceType:
+                value = c_message.get_body_sequence(0)
+            else:
+                value = c_message.get_body_value()
+        return self._schema.decode(value)
+
+    def message(self, value, sequence=False, **kwargs):
+        """Create a message with the encoded fields as its body.
+
+        :param value: The field values.
+        :type value: dict
+        :param sequence: Whether to send the encoded value as the single section
+         of a Sequence body, rather than as a Value body. This is only supported
+         where the schema is encoded as a list without a descriptor. The default is `False`.
+        :type sequence: bool
+        :param kwargs: Any additional keyword arguments for the ~uamqp.message.Message.
+        :returns: ~uamqp.message.Message
+        :raises: ValueError if a Sequence body is requested for a map or described schema.
+        """
+        if sequence and (not self.as_list or self._descriptor is not None):
+            raise ValueError("Only a schema encoded as a list without a descriptor can be sent as a Sequence body.")
+        kwargs.setdefault('encoding', self._encoding)
+        encoded = self.encode(value)
+        return Message(body=[encoded] if sequence else encoded, **kwargs)
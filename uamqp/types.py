@@ -51,7 +51,7 @@ class AMQPSymbol(AMQPType):
 
     def _c_wrapper(self, value, encoding='UTF-8'):
         value = value.encode(encoding) if isinstance(value, str) else value
-        return c_uamqp.symbol_value(value)
+        return c_uamqp.interned_symbol_value(value)
 
 
 class AMQPLong(AMQPType):
@@ -103,13 +103,28 @@ class AMQPArray(AMQPType):
     :ivar value: The Python values of the AMQP array.
     :vartype value: list
     :ivar c_data: The C AMQP encoded object.
-    :vartype c_data: ~uamqp.c_uamqp.ULongValue
-    :param value: The value to encode as an AMQP symbol.
-    :type value: int
+    :vartype c_data: ~uamqp.c_uamqp.ArrayValue
+    :param value: The values to encode as an AMQP array. An array.array or other
+     buffer of numbers will be converted in a single pass to an array of ints, longs
+     or doubles, depending on the item size and type.
+    :type value: list or array.array
+    :param timestamps: Whether a buffer of integers holds timestamps in milliseconds,
+     in which case it will be encoded as an array of AMQP timestamps.
+    :type timestamps: bool
     :raises: ValueError if all values are not the same type.
     """
 
-    def _c_wrapper(self, value_array):
+    def __init__(self, value, timestamps=False):
+        self._c_type = self._c_wrapper(value, timestamps)
+
+    def _c_wrapper(self, value_array, timestamps=False):
+        if not isinstance(value_array, (list, tuple, bytes, bytearray, str)):
+            try:
+                memoryview(value_array)
+            except TypeError:
+                pass
+            else:
+                return c_uamqp.array_value_from_buffer(value_array, timestamps=timestamps)
         value_type = type(value_array[0])
         if not all(isinstance(x, value_type) for x in value_array):
             raise ValueError("All Array values must be the same type.")
@@ -118,3 +133,11 @@ class AMQPArray(AMQPType):
         for value in value_array:
             c_array.append(utils.data_factory(value))
         return c_array
+
+    def to_array(self):
+        """Get the values of an array of ints, longs, doubles or timestamps
+        as an array.array.
+
+        :returns: array.array
+        """
+        return self._c_type.to_array()
@@ -4,12 +4,10 @@
 # license information.
 #--------------------------------------------------------------------------
 
-import uuid
 from datetime import timedelta
 import time
 import base64
 
-from uamqp import types
 from uamqp import c_uamqp
 
 
@@ -56,48 +54,20 @@ def data_factory(value, encoding='UTF-8'):
     - bool => c_uamqp.BoolValue
     - int => c_uamqp.IntValue
     - str => c_uamqp.StringValue
-    - bytes => c_uamqp.BinaryValue
+    - bytes => c_uamqp.StringValue
+    - bytearray => c_uamqp.BinaryValue
     - str (char) => c_uamqp.CharValue
     - list/set/tuple => c_uamqp.ListValue
     - dict => c_uamqp.DictValue (AMQP map)
     - float => c_uamqp.DoubleValue
     - uuid.UUID => c_uamqp.UUIDValue
 
+    Values are dispatched on their exact type, and nested dicts and lists are
+    built in C in a single pass. Subclasses of the above types, and any object
+    exposing a `c_data` AMQP value, are also supported.
+
     :param value: The value to wrap.
     :returns: c_uamqp.AMQPValue
+    :raises: TypeError if the value cannot be converted.
     """
-    result = None
-    if value is None:
-        result = c_uamqp.null_value()
-    elif isinstance(value, types.AMQPType):
-        result = value.c_data
-    elif isinstance(value, c_uamqp.AMQPValue):
-        result = value
-    elif isinstance(value, bool):
-        result = c_uamqp.bool_value(value)
-    elif isinstance(value, str) and len(value) == 1:
-        result = c_uamqp.char_value(value.encode(encoding))
-    elif isinstance(value, str) and len(value) > 1:
-        result = c_uamqp.string_value(value.encode(encoding))
-    elif isinstance(value, bytes):
-        result = c_uamqp.string_value(value)
-    elif isinstance(value, uuid.UUID):
-        result = c_uamqp.uuid_value(value)
-    elif isinstance(value, bytearray):
-        result = c_uamqp.binary_value(value)
-    elif isinstance(value, float):
-        result = c_uamqp.double_value(value)
-    elif isinstance(value, int):
-        result = c_uamqp.int_value(value)
-    elif isinstance(value, dict):
-        wrapped_dict = c_uamqp.dict_value()
-        for key, item in value.items():
-            wrapped_dict[data_factory(key, encoding=encoding)] = data_factory(item, encoding=encoding)
-        result = wrapped_dict
-    elif isinstance(value, (list, set, tuple)):
-        wrapped_list = c_uamqp.list_value()
-        wrapped_list.size = len(value)
-        for index, item in enumerate(value):
-            wrapped_list[index] = data_factory(item, encoding=encoding)
-        result = wrapped_list
-    return result
+    return c_uamqp.data_factory(value, encoding=encoding)